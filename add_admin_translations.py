@@ -1,4 +1,4 @@
-import json
+from locale_store import LocaleStore
 
 # Additional translations for admin panel
 admin_translations = {
@@ -322,18 +322,10 @@ admin_translations = {
     }
 }
 
-# Update each language file
-for lang in ['uk', 'ru', 'en']:
-    filename = f'client/src/locales/{lang}.json'
-    with open(filename, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Merge new translations
-    data.update(admin_translations[lang])
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    print(f"✅ Updated {filename}")
+# Deep-merge into each language file (keeps existing keys in shared sections)
+store = LocaleStore()
+store.merge(admin_translations, source='add_admin_translations')
+store.report_conflicts()
+store.save()
 
 print("\n✅ All translation files updated with admin panel translations!")
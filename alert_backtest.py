@@ -0,0 +1,864 @@
+"""
+Backtest the alert rules in alerts.yml against recorded metrics.
+
+Evaluates every rule over a whole recorded history, the way Prometheus
+would have evaluated it live (group interval, `for:`, `keep_firing_for:`,
+5m lookback and staleness), and reports the intervals each rule would
+have fired:
+
+    python alert_backtest.py scrapes/                       # one exposition snapshot per file
+    python alert_backtest.py dump.txt                       # `promtool tsdb dump` output
+    python alert_backtest.py range.json --rule HighCPULoad  # /api/v1/query_range matrix
+    python alert_backtest.py metrics.csv --threshold HighMemoryUsage=80,85,90 --for HighMemoryUsage=10m
+
+Inputs:
+  - exposition text, as served by /api/trpc/prometheus.metrics (the tRPC
+    JSON envelope is unwrapped). A file without sample timestamps is one
+    scrape, timed by the epoch or ISO time in its name, else its mtime.
+    Scrapes get the job's target labels from prometheus.yml and an `up`
+    sample (0 for an empty or unreadable file), and series missing from a
+    scrape go stale as they would in Prometheus.
+  - exposition lines with millisecond timestamps (promtool tsdb dump).
+  - query_range JSON (resultType matrix).
+  - CSV, long (timestamp, metric, value[, labels or label columns]) or wide
+    (timestamp, then one column per metric or selector).
+
+Series are held as arrays of times and values. Each expression node is
+evaluated once for all evaluation steps: instant selectors with a merge of
+step times against sample times, range functions with a sliding window
+over prefix sums (counter resets are a prefix sum of their own), so weeks
+of data take seconds. Sub-expressions are cached, so a --threshold or
+--for sweep re-uses the evaluated metric.
+
+Supported PromQL: selectors with =, !=, =~, !~ matchers; rate, increase,
+delta, avg/sum/min/max/count_over_time; + - * / between scalars and
+vectors (vector pairs match on identical labels); comparisons > < >= <=
+== != (filtering). Rules using anything else are reported as skipped.
+
+Results go to alert_backtest.json; --show limits the intervals printed.
+"""
+import argparse
+import array
+import csv
+import datetime
+import json
+import math
+import os
+import re
+import sys
+from collections import deque, namedtuple
+
+DEFAULT_RULES = 'alerts.yml'
+DEFAULT_CONFIG = 'prometheus.yml'
+DEFAULT_JOB = 'pikaleads'
+DEFAULT_OUTPUT = 'alert_backtest.json'
+DEFAULT_INTERVAL = 60.0     # Prometheus global evaluation_interval default
+LOOKBACK = 300.0            # --query.lookback-delta default
+NAN = float('nan')
+
+DURATION = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h|d|w|y)')
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'y': 31536000}
+LABEL_PAIR = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"\s*,?')
+FILE_EPOCH = re.compile(r'(?<!\d)(\d{10}|\d{13})(?!\d)')
+FILE_ISO = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})[T_ ]?(\d{2})[:\-]?(\d{2})[:\-]?(\d{2})')
+
+Rule = namedtuple('Rule', ['name', 'expr', 'hold', 'keep_firing', 'interval', 'labels', 'group'])
+Interval = namedtuple('Interval', ['labels', 'pending', 'start', 'end', 'peak'])
+
+
+class BacktestError(ValueError):
+    pass
+
+
+def parse_duration(text):
+    """Seconds in a Prometheus duration ('5m', '1h30m', 30)"""
+    if isinstance(text, (int, float)):
+        return float(text)
+    text = str(text).strip()
+    parts = DURATION.findall(text)
+    if not parts or ''.join(number + unit for number, unit in parts) != text:
+        raise BacktestError(f"bad duration {text!r}")
+    return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    if seconds == 0:
+        return '0s'
+    out = ''
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60), ('s', 1)):
+        if seconds >= size:
+            out += f"{seconds // size}{unit}"
+            seconds %= size
+    return out
+
+
+def format_time(epoch):
+    return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def parse_time(text):
+    """Epoch seconds from an epoch (s or ms) or ISO 8601 string"""
+    text = str(text).strip()
+    try:
+        value = float(text)
+    except ValueError:
+        moment = datetime.datetime.fromisoformat(text.replace('Z', '+00:00'))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=datetime.timezone.utc)
+        return moment.timestamp()
+    return value / 1000 if value > 1e11 else value
+
+
+def load_yaml(path):
+    try:
+        import yaml
+    except ImportError:
+        raise BacktestError(f"{path}: PyYAML is not installed (pip install pyyaml)")
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+
+# Configuration
+
+def load_rules(path=DEFAULT_RULES, default_interval=DEFAULT_INTERVAL):
+    rules = []
+    for group in load_yaml(path).get('groups') or []:
+        interval = parse_duration(group['interval']) if group.get('interval') else default_interval
+        for rule in group.get('rules') or []:
+            if 'alert' not in rule:
+                continue    # recording rule
+            rules.append(Rule(rule['alert'], str(rule['expr']).strip(), parse_duration(rule.get('for', 0)),
+                              parse_duration(rule.get('keep_firing_for', 0)), interval,
+                              rule.get('labels') or {}, group.get('name')))
+    return rules
+
+
+def load_config(path=DEFAULT_CONFIG, job=DEFAULT_JOB):
+    """(evaluation interval, target labels of `job`) from prometheus.yml"""
+    if not os.path.exists(path):
+        return DEFAULT_INTERVAL, {'job': job}
+    config = load_yaml(path)
+    interval = parse_duration((config.get('global') or {}).get('evaluation_interval', DEFAULT_INTERVAL))
+    labels = {'job': job}
+    for scrape in config.get('scrape_configs') or []:
+        if scrape.get('job_name') != job:
+            continue
+        for static in scrape.get('static_configs') or []:
+            targets = static.get('targets') or []
+            if targets:
+                labels['instance'] = targets[0]
+            labels.update({k: str(v) for k, v in (static.get('labels') or {}).items()})
+            break
+    return interval, labels
+
+
+# Recorded series
+
+class Series:
+    """Samples of one series; NaN values are staleness markers"""
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self.times = array.array('d')
+        self.values = array.array('d')
+
+    def finish(self):
+        times = self.times
+        if any(times[i] < times[i - 1] for i in range(1, len(times))):
+            pairs = sorted(zip(times, self.values), key=lambda pair: pair[0])
+            self.times = array.array('d', (t for t, _ in pairs))
+            self.values = array.array('d', (v for _, v in pairs))
+        # Range functions ignore stale markers
+        keep = [i for i, v in enumerate(self.values) if v == v]
+        self.range_times = array.array('d', (self.times[i] for i in keep))
+        self.range_values = array.array('d', (self.values[i] for i in keep))
+
+
+class SeriesStore:
+    """Recorded series by (name, sorted labels)"""
+
+    def __init__(self, target_labels):
+        self.target_labels = target_labels
+        self.series = {}
+        self.scraped = set()
+
+    def get(self, name, labels):
+        """(key, Series) for a series, created on first use"""
+        for label, label_value in self.target_labels.items():
+            labels.setdefault(label, label_value)
+        key = (name, tuple(sorted(labels.items())))
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = Series(name, dict(labels))
+        return key, series
+
+    def add(self, name, labels, t, value):
+        key, series = self.get(name, labels)
+        series.times.append(t)
+        series.values.append(value)
+        return key
+
+    def add_scrape(self, t, samples):
+        """One scrape at `t`: samples, `up`, and stale markers for series that disappeared"""
+        keys = {self.add('up', {}, t, 1.0 if samples else 0.0)}
+        for name, labels, value in samples:
+            keys.add(self.add(name, labels, t, value))
+        for key in self.scraped - keys:
+            self.series[key].times.append(t)
+            self.series[key].values.append(NAN)
+        self.scraped = keys
+
+    def finish(self):
+        for series in self.series.values():
+            series.finish()
+        return self
+
+    @property
+    def span(self):
+        times = [series.times for series in self.series.values() if series.times]
+        if not times:
+            raise BacktestError("no samples")
+        return min(t[0] for t in times), max(t[-1] for t in times)
+
+    def select(self, name, matchers):
+        found = []
+        for (series_name, _), series in self.series.items():
+            if series_name == name and all(label_matches(series.labels.get(label, ''), op, value)
+                                           for label, op, value in matchers):
+                found.append(series)
+        return found
+
+
+def label_matches(actual, op, value):
+    if op == '=':
+        return actual == value
+    if op == '!=':
+        return actual != value
+    matched = re.fullmatch(value, actual) is not None
+    return matched if op == '=~' else not matched
+
+
+def parse_labels(text):
+    if not text:
+        return {}
+    text = text.strip().strip('{}')
+    labels = {}
+    if '"' in text:
+        for m in LABEL_PAIR.finditer(text):
+            labels[m.group(1)] = m.group(2).encode('utf-8').decode('unicode_escape') if '\\' in m.group(2) \
+                else m.group(2)
+    else:
+        for pair in filter(None, (p.strip() for p in text.split(','))):
+            label, _, value = pair.partition('=')
+            labels[label.strip()] = value.strip()
+    return labels
+
+
+def parse_exposition(text):
+    """[(series text, value, timestamp_ms or None)] from exposition text"""
+    samples = []
+    for line in text.splitlines():
+        if not line or line[0] == '#':
+            continue
+        close = line.rfind('}')
+        if close >= 0:
+            head = line[:close + 1]
+            rest = line[close + 1:].split()
+        else:
+            head, *rest = line.split()
+        try:
+            samples.append((head, float(rest[0]), int(rest[1]) if len(rest) > 1 else None))
+        except (IndexError, ValueError):
+            continue
+    return samples
+
+
+def parse_series(text):
+    """(name, labels) of a series text such as 'up{job="pikaleads"}'"""
+    name, _, labels = text.partition('{')
+    return name.strip(), parse_labels(labels)
+
+
+def unwrap_trpc(data):
+    """Exposition text from a tRPC response ({result: {data: {json: ...}}})"""
+    if isinstance(data, list) and data:
+        data = data[0]
+    while isinstance(data, dict):
+        data = data.get('result', data.get('data', data.get('json')))
+    return data if isinstance(data, str) else None
+
+
+def _file_time(path):
+    name = os.path.basename(path)
+    m = FILE_EPOCH.search(name)
+    if m:
+        return parse_time(m.group(1))
+    m = FILE_ISO.search(name)
+    if m:
+        return datetime.datetime(*map(int, m.groups()), tzinfo=datetime.timezone.utc).timestamp()
+    return os.path.getmtime(path)
+
+
+def load_csv(path, store):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = [column.strip() for column in next(reader, [])]
+        lower = [column.lower() for column in header]
+        time_column = next((i for i, c in enumerate(lower) if c in ('timestamp', 'time', 'ts')), 0)
+        if 'value' in lower and ('metric' in lower or '__name__' in lower):
+            metric = lower.index('metric') if 'metric' in lower else lower.index('__name__')
+            value = lower.index('value')
+            label_columns = [(i, header[i]) for i in range(len(header)) if i not in (time_column, metric, value)]
+            for row in reader:
+                if not row:
+                    continue
+                name, _, selector = row[metric].partition('{')
+                labels = parse_labels(selector) if selector else {}
+                for i, label in label_columns:
+                    if label.lower() == 'labels':
+                        labels.update(parse_labels(row[i]))
+                    elif row[i]:
+                        labels[label] = row[i]
+                store.add(name.strip(), labels, parse_time(row[time_column]), float(row[value] or 'nan'))
+        else:
+            columns = []
+            for i, column in enumerate(header):
+                if i != time_column:
+                    name, _, selector = column.partition('{')
+                    columns.append((i, name.strip(), parse_labels(selector)))
+            for row in reader:
+                if not row:
+                    continue
+                t = parse_time(row[time_column])
+                for i, name, labels in columns:
+                    if i < len(row) and row[i] != '':
+                        store.add(name, dict(labels), t, float(row[i]))
+
+
+def load_matrix(data, store):
+    for result in (data.get('data') or {}).get('result') or []:
+        labels = dict(result.get('metric') or {})
+        name = labels.pop('__name__', '')
+        for t, value in result.get('values') or ([result['value']] if 'value' in result else []):
+            store.add(name, dict(labels), float(t), float(value))
+
+
+def load_metrics(inputs, target_labels):
+    """SeriesStore from files and directories of recorded metrics"""
+    paths = []
+    for source in inputs:
+        if os.path.isdir(source):
+            paths.extend(os.path.join(root, name) for root, _, names in os.walk(source) for name in names)
+        elif os.path.exists(source):
+            paths.append(source)
+        else:
+            raise BacktestError(f"{source}: no such file or directory")
+    store = SeriesStore(target_labels)
+    scrapes = []
+    for path in sorted(paths):
+        if path.endswith('.csv'):
+            load_csv(path, store)
+            continue
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        if text.lstrip().startswith(('{', '[')):
+            try:
+                data = json.loads(text)
+            except ValueError:
+                data = None
+            if isinstance(data, dict) and (data.get('data') or {}).get('resultType') in ('matrix', 'vector'):
+                load_matrix(data, store)
+                continue
+            text = unwrap_trpc(data) or ''
+        samples = parse_exposition(text)
+        if samples and all(ts is not None for *_, ts in samples):
+            found = {}
+            for head, value, ts in samples:
+                series = found.get(head)
+                if series is None:
+                    series = found[head] = store.get(*parse_series(head))[1]
+                series.times.append(ts / 1000)
+                series.values.append(value)
+        else:
+            scrapes.append((_file_time(path), [parse_series(head) + (value,) for head, value, _ in samples]))
+    for t, samples in sorted(scrapes, key=lambda scrape: scrape[0]):
+        store.add_scrape(t, samples)
+    return store.finish()
+
+
+# Expressions
+
+TOKEN = re.compile(r'''\s*(?:
+    (?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)(?![a-zA-Z_])
+  | (?P<duration>\[[^\]]+\])
+  | (?P<matchers>\{[^}]*\})
+  | (?P<op>==|!=|>=|<=|>|<|\+|-|\*|/|\(|\))
+  | (?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)
+)''', re.VERBOSE)
+MATCHER = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*(=~|!~|!=|=)\s*"((?:[^"\\]|\\.)*)"\s*,?')
+COMPARISONS = ('==', '!=', '>=', '<=', '>', '<')
+RANGE_FUNCTIONS = ('rate', 'increase', 'delta', 'avg_over_time', 'sum_over_time', 'min_over_time',
+                   'max_over_time', 'count_over_time')
+
+
+def tokenize(expr):
+    tokens = []
+    pos = 0
+    expr = expr.strip()
+    while pos < len(expr):
+        m = TOKEN.match(expr, pos)
+        if not m or m.end() == pos:
+            raise BacktestError(f"cannot parse {expr[pos:]!r}")
+        kind = m.lastgroup
+        tokens.append((kind, m.group(kind)))
+        pos = m.end()
+    return tokens
+
+
+def parse_expr(expr):
+    """AST of nested tuples: ('num', v), ('sel', name, matchers), ('call', fn, sel, seconds), ('bin', op, l, r)"""
+    tokens = tokenize(expr)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else (None, None)
+
+    def take():
+        nonlocal pos
+        pos += 1
+        return tokens[pos - 1]
+
+    def binary(levels):
+        if not levels:
+            return unary()
+        node = binary(levels[1:])
+        while peek()[0] == 'op' and peek()[1] in levels[0]:
+            op = take()[1]
+            if peek() == ('name', 'bool'):
+                raise BacktestError("the bool modifier is not supported")
+            node = ('bin', op, node, binary(levels[1:]))
+        return node
+
+    def unary():
+        if peek() == ('op', '-'):
+            take()
+            return ('bin', '*', ('num', -1.0), unary())
+        return primary()
+
+    def primary():
+        kind, text = take() if pos < len(tokens) else (None, None)
+        if kind == 'number':
+            return ('num', float(text))
+        if kind == 'op' and text == '(':
+            node = binary(PRECEDENCE)
+            if take() != ('op', ')'):
+                raise BacktestError("missing )")
+            return node
+        if kind == 'name' and peek() == ('op', '('):
+            if text not in RANGE_FUNCTIONS:
+                raise BacktestError(f"function {text}() is not supported")
+            take()
+            selector = primary()
+            duration = take() if peek()[0] == 'duration' else (None, None)
+            if selector[0] != 'sel' or duration[0] != 'duration' or take() != ('op', ')'):
+                raise BacktestError(f"{text}() needs a range selector")
+            return ('call', text, selector, parse_duration(duration[1][1:-1]))
+        if kind == 'name' or kind == 'matchers':
+            name = text if kind == 'name' else ''
+            matchers = []
+            if kind == 'matchers' or peek()[0] == 'matchers':
+                body = (text if kind == 'matchers' else take()[1])[1:-1]
+                for m in MATCHER.finditer(body):
+                    if m.group(1) == '__name__' and m.group(2) == '=':
+                        name = m.group(3)
+                    else:
+                        matchers.append((m.group(1), m.group(2), m.group(3)))
+            if not name:
+                raise BacktestError("selectors need a metric name")
+            if peek()[0] == 'duration' and not (pos + 1 < len(tokens) and tokens[pos + 1] == ('op', ')')):
+                raise BacktestError("range selectors are only supported inside functions")
+            return ('sel', name, tuple(matchers))
+        raise BacktestError(f"unexpected {text!r}")
+
+    node = binary(PRECEDENCE)
+    if pos != len(tokens):
+        raise BacktestError(f"unexpected {tokens[pos][1]!r}")
+    return node
+
+
+PRECEDENCE = [COMPARISONS, ('+', '-'), ('*', '/')]
+
+
+def with_threshold(node, value):
+    """Same expression with the scalar of its top-level comparison replaced"""
+    if node[0] == 'bin' and node[1] in COMPARISONS:
+        if node[3][0] == 'num':
+            return ('bin', node[1], node[2], ('num', value))
+        if node[2][0] == 'num':
+            return ('bin', node[1], ('num', value), node[3])
+    raise BacktestError("the expression has no `<expr> <op> <number>` threshold")
+
+
+def unparse(node):
+    kind = node[0]
+    if kind == 'num':
+        return f"{node[1]:g}"
+    if kind == 'sel':
+        matchers = ','.join(f'{label}{op}"{value}"' for label, op, value in node[2])
+        return node[1] + (f"{{{matchers}}}" if matchers else '')
+    if kind == 'call':
+        return f"{node[1]}({unparse(node[2])}[{format_duration(node[3])}])"
+    level = next(i for i, ops in enumerate(PRECEDENCE) if node[1] in ops)
+
+    def operand(child, right):
+        text = unparse(child)
+        if child[0] == 'bin':
+            child_level = next(i for i, ops in enumerate(PRECEDENCE) if child[1] in ops)
+            if child_level < level or (right and child_level == level):
+                return f"({text})"
+        return text
+
+    return f"{operand(node[2], False)} {node[1]} {operand(node[3], True)}"
+
+
+# Evaluation
+
+def _label_key(labels, keep_name=None):
+    items = sorted(labels.items())
+    return (keep_name, tuple(items))
+
+
+def instant(series, steps):
+    """Value of `series` at every step: latest sample within the lookback, NaN if none or stale"""
+    times, values = series.times, series.values
+    out = array.array('d', bytes(8 * len(steps)))
+    j = -1
+    n = len(times)
+    for i, t in enumerate(steps):
+        while j + 1 < n and times[j + 1] <= t:
+            j += 1
+        out[i] = values[j] if j >= 0 and t - times[j] <= LOOKBACK else NAN
+    return out
+
+
+def over_window(series, steps, seconds, fn):
+    """`fn` over the samples in (t - seconds, t] at every step"""
+    times, values = series.range_times, series.range_values
+    n = len(times)
+    out = array.array('d', bytes(8 * len(steps)))
+    lo = hi = 0
+    if fn in ('rate', 'increase', 'delta'):
+        # Counter resets: the value before each drop is added back
+        resets = array.array('d', [0.0])
+        for k in range(1, n):
+            resets.append(resets[-1] + (values[k - 1] if values[k] < values[k - 1] else 0.0))
+    elif fn in ('avg_over_time', 'sum_over_time'):
+        prefix = array.array('d', [0.0])
+        for v in values:
+            prefix.append(prefix[-1] + v)
+    else:
+        window = deque()    # indices, monotonic for min/max
+        sign = 1 if fn == 'max_over_time' else -1
+    for i, t in enumerate(steps):
+        while hi < n and times[hi] <= t:
+            if fn in ('min_over_time', 'max_over_time'):
+                while window and sign * values[window[-1]] <= sign * values[hi]:
+                    window.pop()
+                window.append(hi)
+            hi += 1
+        while lo < hi and times[lo] <= t - seconds:
+            lo += 1
+        if fn in ('min_over_time', 'max_over_time'):
+            while window and window[0] < lo:
+                window.popleft()
+        count = hi - lo
+        if count == 0:
+            out[i] = NAN
+        elif fn == 'count_over_time':
+            out[i] = count
+        elif fn == 'sum_over_time':
+            out[i] = prefix[hi] - prefix[lo]
+        elif fn == 'avg_over_time':
+            out[i] = (prefix[hi] - prefix[lo]) / count
+        elif fn in ('min_over_time', 'max_over_time'):
+            out[i] = values[window[0]]
+        elif count < 2:
+            out[i] = NAN
+        else:
+            out[i] = _extrapolated(fn, times, values, resets, lo, hi - 1, t, seconds)
+    return out
+
+
+def _extrapolated(fn, times, values, resets, first, last, t, seconds):
+    """Prometheus extrapolatedRate() over samples first..last"""
+    counter = fn != 'delta'
+    result = values[last] - values[first]
+    if counter:
+        result += resets[last] - resets[first]
+    sampled = times[last] - times[first]
+    average = sampled / (last - first)
+    to_start = times[first] - (t - seconds)
+    to_end = t - times[last]
+    if counter and result > 0 and values[first] >= 0:
+        to_start = min(to_start, sampled * (values[first] / result))
+    threshold = average * 1.1
+    interval = sampled + (to_start if to_start < threshold else average / 2) \
+        + (to_end if to_end < threshold else average / 2)
+    result *= interval / sampled
+    return result / seconds if fn == 'rate' else result
+
+
+def _apply(op, a, b):
+    if op == '+':
+        return a + b
+    if op == '-':
+        return a - b
+    if op == '*':
+        return a * b
+    if op == '/':
+        return a / b if b else (NAN if a == 0 or a != a else math.copysign(math.inf, a) * math.copysign(1, b))
+    if op == '==':
+        return a == b
+    if op == '!=':
+        return a != b
+    if op == '>':
+        return a > b
+    if op == '<':
+        return a < b
+    if op == '>=':
+        return a >= b
+    return a <= b
+
+
+class Evaluator:
+    """Evaluates AST nodes over all steps; vectors are {label key: array of values (NaN = absent)}"""
+
+    def __init__(self, store, steps):
+        self.store = store
+        self.steps = steps
+        self.cache = {}
+
+    def __call__(self, node):
+        if node not in self.cache:
+            self.cache[node] = self._eval(node)
+        return self.cache[node]
+
+    def _eval(self, node):
+        kind = node[0]
+        if kind == 'num':
+            return node[1]
+        if kind == 'sel':
+            return {_label_key(s.labels, s.name): instant(s, self.steps)
+                    for s in self.store.select(node[1], node[2])}
+        if kind == 'call':
+            _, fn, (_, name, matchers), seconds = node
+            return {_label_key(s.labels): over_window(s, self.steps, seconds, fn)
+                    for s in self.store.select(name, matchers)}
+        _, op, left, right = node
+        a, b = self(left), self(right)
+        comparison = op in COMPARISONS
+        if not isinstance(a, dict) and not isinstance(b, dict):
+            if comparison:
+                raise BacktestError("scalar comparisons need the bool modifier, which is not supported")
+            return _apply(op, a, b)
+        if comparison:
+            # Filter: keep the vector side's value where the comparison holds
+            if isinstance(a, dict) and isinstance(b, dict):
+                pairs = self._match(a, b)
+                return {key: array.array('d', (x if x == x and y == y and _apply(op, x, y) else NAN
+                                               for x, y in zip(xs, ys))) for key, xs, ys in pairs}
+            if isinstance(a, dict):
+                return {key: array.array('d', (x if x == x and _apply(op, x, b) else NAN for x in xs))
+                        for key, xs in a.items()}
+            return {key: array.array('d', (y if y == y and _apply(op, a, y) else NAN for y in ys))
+                    for key, ys in b.items()}
+        if isinstance(a, dict) and isinstance(b, dict):
+            return {(None, key[1]): array.array('d', map(lambda x, y: _apply(op, x, y), xs, ys))
+                    for key, xs, ys in self._match(a, b)}
+        if isinstance(a, dict):
+            return {(None, key[1]): array.array('d', (_apply(op, x, b) for x in xs)) for key, xs in a.items()}
+        return {(None, key[1]): array.array('d', (_apply(op, a, y) for y in ys)) for key, ys in b.items()}
+
+    @staticmethod
+    def _match(a, b):
+        """One-to-one matching on labels (metric name ignored)"""
+        right = {key[1]: values for key, values in b.items()}
+        return [(key, values, right[key[1]]) for key, values in a.items() if key[1] in right]
+
+
+def firing_intervals(vector, steps, hold, keep_firing=0.0):
+    """Intervals per series where the alert would have been firing"""
+    intervals = []
+    for (_, labels), values in vector.items():
+        pending = start = last_true = None
+        peak = NAN
+        for t, v in zip(steps, values):
+            if v == v:
+                if pending is None:
+                    pending = t
+                    peak = v
+                last_true = t
+                peak = max(peak, v)
+                if start is None and t - pending >= hold:
+                    start = t
+                continue
+            if pending is None:
+                continue
+            if start is not None:
+                if t - last_true < keep_firing:
+                    continue
+                intervals.append(Interval(dict(labels), pending, start, t, peak))
+            pending = start = None
+        if start is not None:
+            intervals.append(Interval(dict(labels), pending, start, None, peak))
+    intervals.sort(key=lambda interval: (interval.start, sorted(interval.labels.items())))
+    return intervals
+
+
+def evaluation_steps(start, end, interval):
+    first = math.ceil(start / interval) * interval
+    count = int((end - first) // interval) + 1 if end >= first else 0
+    return array.array('d', (first + i * interval for i in range(count)))
+
+
+def backtest(rules, store, start=None, end=None, thresholds=None, holds=None):
+    """One result per rule and threshold/for variant"""
+    span = store.span
+    start = span[0] if start is None else start
+    end = span[1] if end is None else end
+    evaluators = {}
+    results = []
+    for rule in rules:
+        steps_key = rule.interval
+        if steps_key not in evaluators:
+            evaluators[steps_key] = Evaluator(store, evaluation_steps(start, end, rule.interval))
+        evaluate = evaluators[steps_key]
+        try:
+            base = parse_expr(rule.expr)
+            variants = [(None, base)]
+            if thresholds and rule.name in thresholds:
+                variants = [(value, with_threshold(base, value)) for value in thresholds[rule.name]]
+            holds_for = (holds or {}).get(rule.name) or [rule.hold]
+            for threshold, node in variants:
+                vector = evaluate(node)
+                if not isinstance(vector, dict):
+                    raise BacktestError("expression is not a vector")
+                for hold in holds_for:
+                    intervals = firing_intervals(vector, evaluate.steps, hold, rule.keep_firing)
+                    results.append(_result(rule, node, threshold, hold, intervals, evaluate.steps, len(vector)))
+        except BacktestError as e:
+            results.append({'alert': rule.name, 'expr': rule.expr, 'skipped': str(e)})
+    return results
+
+
+def _result(rule, node, threshold, hold, intervals, steps, series):
+    end = steps[-1] if steps else 0.0
+    firing = sum((interval.end if interval.end is not None else end) - interval.start for interval in intervals)
+    return {
+        'alert': rule.name,
+        'expr': unparse(node),
+        'threshold': threshold,
+        'for': hold,
+        'keepFiringFor': rule.keep_firing,
+        'interval': rule.interval,
+        'severity': rule.labels.get('severity'),
+        'evaluations': len(steps),
+        'series': series,
+        'firings': len(intervals),
+        'firingSeconds': firing,
+        'firingRatio': firing / (steps[-1] - steps[0]) if len(steps) > 1 else 0.0,
+        'intervals': [{
+            'labels': interval.labels,
+            'pendingAt': format_time(interval.pending),
+            'firingAt': format_time(interval.start),
+            'resolvedAt': format_time(interval.end) if interval.end is not None else None,
+            'seconds': (interval.end if interval.end is not None else end) - interval.start,
+            'peak': interval.peak,
+        } for interval in intervals],
+    }
+
+
+def _variants(values, parse):
+    found = {}
+    for value in values or []:
+        name, sep, options = value.partition('=')
+        if not sep:
+            raise BacktestError(f"expected RULE=VALUE[,VALUE...], got {value!r}")
+        found.setdefault(name, []).extend(parse(option) for option in options.split(','))
+    return found
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Backtest alerts.yml rules against recorded metrics")
+    parser.add_argument('inputs', nargs='+', help='exposition snapshots, tsdb dumps, query_range JSON or CSV')
+    parser.add_argument('--rules', default=DEFAULT_RULES)
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help='prometheus.yml (evaluation interval, target labels)')
+    parser.add_argument('--job', default=DEFAULT_JOB, help='scrape job the snapshots come from')
+    parser.add_argument('--rule', action='append', help='only this alert (repeatable)')
+    parser.add_argument('--threshold', action='append', metavar='RULE=V[,V...]',
+                        help="replace the rule's comparison threshold; several values are compared side by side")
+    parser.add_argument('--for', dest='hold', action='append', metavar='RULE=DUR[,DUR...]',
+                        help="replace the rule's for: duration")
+    parser.add_argument('--start', help='first evaluation (ISO or epoch; default: first sample)')
+    parser.add_argument('--end', help='last evaluation (default: last sample)')
+    parser.add_argument('--show', type=int, default=10, help='intervals printed per rule')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    try:
+        interval, target_labels = load_config(args.config, args.job)
+        rules = load_rules(args.rules, interval)
+        if args.rule:
+            unknown = set(args.rule) - {rule.name for rule in rules}
+            if unknown:
+                raise BacktestError(f"unknown alert(s): {', '.join(sorted(unknown))}")
+            rules = [rule for rule in rules if rule.name in args.rule]
+        thresholds = _variants(args.threshold, float)
+        holds = _variants(args.hold, parse_duration)
+        store = load_metrics(args.inputs, target_labels)
+        start = parse_time(args.start) if args.start else None
+        end = parse_time(args.end) if args.end else None
+        results = backtest(rules, store, start, end, thresholds, holds)
+    except (BacktestError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    first, last = store.span
+    samples = sum(len(series.times) for series in store.series.values())
+    print(f"📦 {len(store.series)} series, {samples} samples, {format_time(first)} → {format_time(last)} "
+          f"({format_duration(last - first)})")
+
+    for result in results:
+        if 'skipped' in result:
+            print(f"⚠️  {result['alert']}: skipped ({result['skipped']})")
+            continue
+        label = result['alert'] + (f" [{result['threshold']:g}]" if result['threshold'] is not None else '')
+        summary = (f"{result['expr']}, for {format_duration(result['for'])}: {result['firings']} firings, "
+                   f"{format_duration(result['firingSeconds'])} firing ({result['firingRatio'] * 100:.1f}%)")
+        if not result['series']:
+            print(f"⚠️  {label}: no matching series ({result['expr']})")
+        elif result['firings']:
+            print(f"🔥 {label}: {summary}")
+        else:
+            print(f"✅ {label}: {summary}")
+        for interval in result['intervals'][:args.show]:
+            labels = ', '.join(f"{k}={v}" for k, v in sorted(interval['labels'].items())
+                               if k not in target_labels or k == 'job')
+            print(f"     {interval['firingAt']} → {interval['resolvedAt'] or 'still firing'} "
+                  f"({format_duration(interval['seconds'])}, peak {interval['peak']:g})"
+                  + (f" {{{labels}}}" if labels else ''))
+        if len(result['intervals']) > args.show:
+            print(f"     ... {len(result['intervals']) - args.show} more")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'rules': args.rules,
+            'from': format_time(first),
+            'to': format_time(last),
+            'results': results,
+        }, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    print(f"\n📝 {len(results)} results in {args.output}")
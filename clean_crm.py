@@ -1,13 +1,10 @@
-# Read CRM.tsx
-with open('client/src/pages/CRM.tsx', 'r', encoding='utf-8') as f:
-    lines = f.readlines()
+from tsx_anchors import edit_file
 
-# Remove lines 170-320 (all bulk operations code)
-# Keep everything before line 170 and after line 320
-cleaned_lines = lines[:169] + lines[320:]
+# Remove all bulk operations code: from the bulk mutations through executeBulkAction
+batch = edit_file('client/src/pages/CRM.tsx', lambda batch: batch.delete_between(
+    'decl:CRM.bulkAssignMutation', 'decl:CRM.executeBulkAction'))
 
-# Write back
-with open('client/src/pages/CRM.tsx', 'w', encoding='utf-8') as f:
-    f.writelines(cleaned_lines)
-
-print("✅ Removed all bulk operations code from CRM.tsx")
+if batch.edits:
+    print("✅ Removed all bulk operations code from CRM.tsx")
+else:
+    print("⏭️  No bulk operations code found in CRM.tsx")
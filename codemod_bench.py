@@ -0,0 +1,361 @@
+"""
+Benchmark suite for the codemod scripts and locale tooling.
+
+Generates a synthetic workspace (a CRM-style page of 10k and 100k lines, a
+tree of 1,000 components and locale files with 50k nested keys), runs every
+codemod and locale operation against it, and records wall time, peak RSS
+and throughput per case into a JSON results file.
+
+    python codemod_bench.py                               # full scale
+    python codemod_bench.py --scale 0.1 --only rewrite    # quick subset
+    python codemod_bench.py --baseline old.json --threshold 0.25
+
+With --baseline, exits 1 if any case got slower than the baseline by more
+than the threshold. Each case runs in a forked process (Linux) so its peak
+RSS is measured in isolation; for script cases it's the script's own
+process, not its worker pool.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS_PATH = 'codemod_bench_results.json'
+
+PAGE_LINES = [10_000, 100_000]
+TREE_COMPONENTS = 1_000
+LOCALE_KEYS = 50_000
+REWRITE_RULES = 5_000
+
+# One legacy t('uk', 'ru', 'en') call per this many generated lines
+LEGACY_CALL_EVERY = 200
+
+WORDS = ['lead', 'quiz', 'status', 'manager', 'campaign', 'source', 'filter',
+         'message', 'score', 'phone', 'email', 'service', 'sale', 'report']
+
+
+# Synthetic inputs
+
+def page_block(i, rng):
+    """~20 lines of CRM-like JSX: labels, inputs, selects and translatable strings"""
+    word = rng.choice(WORDS)
+    legacy = (f"{{t('Поле {i}', 'Поле {i}', 'Field {i}')}}"
+              if i % (LEGACY_CALL_EVERY // 20) == 0 else f'{{t("gen.{word}{i}")}}')
+    return f'''        <div className="space-y-2">
+          <Label htmlFor="{word}{i}">{legacy}</Label>
+          <Input
+            id="{word}{i}"
+            value={{form.{word}{i}}}
+            onChange={{(e) => setForm({{ ...form, {word}{i}: e.target.value }})}}
+            placeholder="Leads"
+          />
+          <Textarea value={{notes}} onChange={{(e) => e.length > 0 && setNotes(e.target.value)}} />
+          <Select value={{filter{i}}} onValueChange={{setFilter{i}}}>
+            <Select.Trigger className="w-full">
+              <SelectValue placeholder="Status" />
+            </Select.Trigger>
+          </Select>
+          {{items.filter((x) => x.score > {i % 100}).map((x) => (
+            <p key={{x.id}} className="text-sm">Don't miss {{x.name}} — "Score" `${{x.id}}`</p>
+          ))}}
+        </div>
+'''
+
+
+def make_page(lines, rng):
+    """A CRM.tsx-shaped component of roughly `lines` lines"""
+    head = '''import { useState } from "react";
+import { trpc } from "@/lib/trpc";
+
+export default function CRM() {
+  const [notes, setNotes] = useState("");
+  const [form, setForm] = useState<Record<string, string>>({});
+  const sendMessageMutation = trpc.crm.sendMessage.useMutation({
+    onSuccess: () => {
+      setNotes("");
+    },
+  });
+
+  return (
+    <CRMLayout>
+      <div className="grid gap-4">
+        {/* Date Range Filter */}
+        <div>
+          <Popover>
+            <PopoverTrigger asChild>
+              <Button variant="outline">"Filters"</Button>
+            </PopoverTrigger>
+          </Popover>
+        </div>
+'''
+    tail = '''      </div>
+    </CRMLayout>
+  );
+}
+'''
+    blocks = [page_block(i, rng) for i in range(max(1, lines // 20))]
+    return head + ''.join(blocks) + tail
+
+
+def make_component(i, rng):
+    return f'''import {{ Label }} from "@/components/ui/label";
+import {{ Input }} from "@/components/ui/input";
+import {{ useTranslation }} from "react-i18next";
+
+export function Generated{i}() {{
+  const {{ t }} = useTranslation();
+  const [notes, setNotes] = useState("");
+  const [form, setForm] = useState<Record<string, string>>({{}});
+  return (
+    <div>
+{''.join(page_block(i * 5 + j, rng) for j in range(5))}    </div>
+  );
+}}
+'''
+
+
+def make_locale_tree(n_keys, lang):
+    sections = max(1, n_keys // 100)
+    tree = {}
+    for s in range(sections):
+        section = tree.setdefault(f"section{s}", {})
+        for k in range(n_keys // sections):
+            group = section.setdefault(f"group{k % 10}", {})
+            group[f"key{k}"] = f"{lang} text {s}.{k}"
+    return tree
+
+
+def make_workspace(root, scale, rng):
+    """Write the synthetic client tree under `root`; returns input sizes"""
+    pages = os.path.join(root, 'client', 'src', 'pages')
+    components = os.path.join(root, 'client', 'src', 'components', 'gen')
+    locales = os.path.join(root, 'client', 'src', 'locales')
+    for path in (pages, components, locales):
+        os.makedirs(path, exist_ok=True)
+
+    sizes = {}
+    for lines in PAGE_LINES:
+        n = int(lines * scale)
+        path = os.path.join(root, f'page_{lines}.tsx')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(make_page(n, rng))
+        sizes[f'page_{lines}'] = os.path.getsize(path)
+
+    total = 0
+    for i in range(int(TREE_COMPONENTS * scale)):
+        path = os.path.join(components, f'Generated{i}.tsx')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(make_component(i, rng))
+        total += os.path.getsize(path)
+    sizes['tree'] = total
+
+    total = 0
+    for lang in ('uk', 'ru', 'en'):
+        path = os.path.join(locales, f'{lang}.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(make_locale_tree(int(LOCALE_KEYS * scale), lang), f, ensure_ascii=False, indent=2)
+        total += os.path.getsize(path)
+    sizes['locales'] = total
+    return sizes
+
+
+def install_page(root, lines):
+    """Make page_<lines>.tsx the CRM.tsx (and AdminSettings.tsx) the scripts edit"""
+    pages = os.path.join(root, 'client', 'src', 'pages')
+    for name in ('CRM.tsx', 'AdminSettings.tsx'):
+        shutil.copyfile(os.path.join(root, f'page_{lines}.tsx'), os.path.join(pages, name))
+    for name in ('.codemod-manifest.json', '.translation-usage-index.json'):
+        path = os.path.join(root, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# Measurement
+
+def measure_in_fork(fn):
+    """Run fn() in a forked child; returns (wall_s, peak_rss_mb, extra, error)"""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            start = time.perf_counter()
+            extra = fn() or {}
+            payload = {'wall_s': time.perf_counter() - start, 'extra': extra}
+        except Exception as e:
+            payload = {'error': f"{type(e).__name__}: {e}"}
+        with os.fdopen(write_fd, 'w') as f:
+            json.dump(payload, f)
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, 'r') as f:
+        data = f.read()
+    _, _, usage = os.wait4(pid, 0)
+    payload = json.loads(data) if data else {'error': 'child exited without a result'}
+    return payload.get('wall_s'), usage.ru_maxrss / 1024, payload.get('extra', {}), payload.get('error')
+
+
+def measure_script(root, args):
+    """Run one of the repo scripts with `root` as working directory"""
+    # stderr goes to a file: a pipe nobody reads fills up and blocks the child
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable] + args, cwd=root, stdout=subprocess.DEVNULL, stderr=stderr)
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        error = None
+        if proc.returncode:
+            stderr.seek(0)
+            lines = stderr.read().decode('utf-8', 'replace').strip().splitlines()
+            error = lines[-1] if lines else f"exit code {proc.returncode}"
+    return wall, usage.ru_maxrss / 1024, {}, error
+
+
+# Cases
+
+def build_cases(root, sizes, jobs):
+    sys.path.insert(0, REPO_DIR)
+    from fix_all_inputs import fix_inputs
+    from locale_index import LocaleIndex
+    from rewrite_engine import RewriteEngine
+    import locale_json
+
+    def script(name, *args):
+        return lambda: measure_script(root, [os.path.join(REPO_DIR, name), *args])
+
+    def in_fork(fn):
+        return lambda: measure_in_fork(fn)
+
+    def read(name):
+        with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def rewrite_rules(page):
+        def run():
+            rules = {f'"Label {i}"': f't("gen.label{i}")' for i in range(REWRITE_RULES)}
+            rules.update({'"Leads"': 't("crm.leads")', '"Status"': 't("table.status")'})
+            engine = RewriteEngine(rules)
+            engine.rewrite(read(page))
+            return {'rules': len(rules)}
+        return run
+
+    def lex_inputs(page):
+        return lambda: fix_inputs(read(page)) and None
+
+    locales_dir = os.path.join(root, 'client', 'src', 'locales')
+
+    def load_locales():
+        for lang in ('uk', 'ru', 'en'):
+            locale_json.load(os.path.join(locales_dir, f'{lang}.json'))
+
+    def index_locales():
+        trees = {lang: locale_json.load(os.path.join(locales_dir, f'{lang}.json'))[0]
+                 for lang in ('uk', 'ru', 'en')}
+        LocaleIndex(trees)
+
+    cases = []
+    for lines in PAGE_LINES:
+        page = f'page_{lines}.tsx'
+        size = sizes[f'page_{lines}']
+        setup = (lambda lines=lines: install_page(root, lines))
+        cases += [
+            (f'rewrite_engine/{lines}', size, None, in_fork(rewrite_rules(page))),
+            (f'fix_inputs/{lines}', size, None, in_fork(lex_inputs(page))),
+            (f'translate_crm/{lines}', size, setup, script('translate_crm.py')),
+            (f'replace_translations/{lines}', size, setup, script('replace_translations.py')),
+            (f'merge_filters/{lines}', size, setup, script('merge_filters.py')),
+            (f'fix_all_inputs/{lines}', size, setup,
+             script('fix_all_inputs.py', '--force', 'client/src/pages/CRM.tsx')),
+        ]
+    cases += [
+        ('fix_all_inputs/tree', sizes['tree'], lambda: install_page(root, PAGE_LINES[0]),
+         script('fix_all_inputs.py', '--force', '-j', str(jobs), 'client/src/components/**/*.tsx')),
+        ('locale_json/load', sizes['locales'], None, in_fork(load_locales)),
+        ('locale_index/build', sizes['locales'], None, in_fork(index_locales)),
+        ('translation_usage/scan', sizes['tree'], None, script('translation_usage.py', '--json')),
+    ]
+    return cases
+
+
+def run_benchmarks(scale, only=None, jobs=None):
+    rng = random.Random(42)
+    root = tempfile.mkdtemp(prefix='codemod-bench-')
+    try:
+        sizes = make_workspace(root, scale, rng)
+        results = {}
+        for name, input_bytes, setup, run in build_cases(root, sizes, jobs or os.cpu_count() or 1):
+            if only and not any(part in name for part in only):
+                continue
+            if setup:
+                setup()
+            wall, rss, extra, error = run()
+            result = {'peak_rss_mb': round(rss, 1), 'input_mb': round(input_bytes / 1e6, 3)}
+            if error:
+                result['error'] = error
+                print(f"❌ {name}: {error}")
+            else:
+                result['wall_s'] = round(wall, 4)
+                result['mb_per_s'] = round(input_bytes / 1e6 / wall, 2) if wall else None
+                if 'rules' in extra:
+                    result['rules'] = extra['rules']
+                    result['rules_per_s'] = round(extra['rules'] / wall) if wall else None
+                print(f"✅ {name}: {wall:.3f}s, {rss:.0f} MB peak, {result['mb_per_s']} MB/s")
+            results[name] = result
+        return results
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def compare(results, baseline, threshold):
+    """Names of cases slower than baseline by more than `threshold` (fraction)"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get('cases', {}).get(name, {})
+        if 'wall_s' not in result or not base.get('wall_s'):
+            continue
+        ratio = result['wall_s'] / base['wall_s']
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            print(f"⚠️  {name}: {base['wall_s']:.3f}s -> {result['wall_s']:.3f}s ({ratio:.2f}x)")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark codemods on synthetic inputs")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiply all input sizes (e.g. 0.1 for a quick run)')
+    parser.add_argument('--only', nargs='*', help='run only cases whose name contains one of these')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='workers for the tree sweep')
+    parser.add_argument('--output', default=DEFAULT_RESULTS_PATH, help='results JSON file')
+    parser.add_argument('--baseline', help='earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown vs baseline before failing (default 0.25 = 25%%)')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.scale, args.only, args.jobs)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': 1,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'scale': args.scale,
+            'cases': results,
+        }, f, indent=2)
+        f.write('\n')
+    print(f"\n📝 Results written to {args.output}")
+
+    failed = [name for name, result in results.items() if 'error' in result]
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            failed += compare(results, json.load(f), args.threshold)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,122 @@
+"""
+Parallel multi-file driver for the codemod scripts.
+
+A codemod is a module-level function `transform(content)` returning
+`(new_content, {rule_name: match_count})`. The driver expands glob
+patterns such as `client/src/**/*.tsx`, fans the files out over a process
+pool (`--jobs N`) and collects a FileResult per file in the parent.
+When the script passes a rule-set hash, files already processed by the
+same rules are skipped via the content-hash manifest (`--force` disables).
+"""
+import argparse
+import glob
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from codemod_manifest import Manifest, content_digest
+
+FileResult = namedtuple('FileResult', 'path changed matches elapsed error digest')
+
+
+def expand_globs(patterns):
+    """Expand glob patterns (with `**` support) into a sorted, de-duplicated file list"""
+    files = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True)
+        if not matches and os.path.exists(pattern):
+            matches = [pattern]
+        files.update(m for m in matches if os.path.isfile(m))
+    return sorted(files)
+
+
+def process_file(transform, file_path, dry_run=False):
+    """Run one transform over one file; executed inside a worker process"""
+    start = time.perf_counter()
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        content = raw.decode('utf-8')
+
+        new_content, matches = transform(content)
+        changed = new_content != content
+        if changed:
+            raw = new_content.encode('utf-8')
+            if not dry_run:
+                with open(file_path, 'wb') as f:
+                    f.write(raw)
+
+        return FileResult(file_path, changed, matches, time.perf_counter() - start, None,
+                          content_digest(raw))
+    except (OSError, UnicodeDecodeError) as e:
+        return FileResult(file_path, False, {}, time.perf_counter() - start, str(e), None)
+
+
+def run(transform, files, jobs=None, dry_run=False):
+    """Apply `transform` to every file, in parallel when jobs > 1; returns FileResults"""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(files) <= 1:
+        return [process_file(transform, path, dry_run) for path in files]
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(process_file, transform, path, dry_run) for path in files]
+        return [future.result() for future in futures]
+
+
+def report(results, elapsed):
+    """Print per-file results followed by a summary line"""
+    for result in results:
+        total = sum(result.matches.values())
+        if result.error:
+            print(f"❌ {result.path}: {result.error}")
+        elif result.changed:
+            print(f"✅ Fixed {result.path} ({total} matches, {result.elapsed * 1000:.1f} ms)")
+        else:
+            print(f"⏭️  No changes needed in {result.path}")
+
+    changed = sum(1 for r in results if r.changed)
+    errors = sum(1 for r in results if r.error)
+    print(f"\n✅ {changed}/{len(results)} files changed, {errors} errors in {elapsed:.2f}s")
+
+
+def main(transform, default_files, description=None, rules=None, argv=None):
+    """Command-line entry point shared by the codemod scripts
+
+    `rules` is the codemod's rule-set hash (see codemod_manifest.rules_hash);
+    without it every file is processed on every run.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('paths', nargs='*',
+                        help='files or glob patterns, e.g. "client/src/**/*.tsx"')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='worker processes (default: all cores)')
+    parser.add_argument('-n', '--dry-run', action='store_true',
+                        help='report changes without writing files')
+    parser.add_argument('--force', action='store_true',
+                        help='ignore the manifest and process every file')
+    args = parser.parse_args(argv)
+
+    patterns = args.paths or default_files
+    for pattern in patterns:
+        if not glob.has_magic(pattern) and not os.path.exists(pattern):
+            print(f"⚠️  File not found: {pattern}")
+    files = expand_globs(patterns)
+
+    manifest = Manifest() if rules else None
+    if manifest and not args.force:
+        fresh = {path for path in files if manifest.is_fresh(path, rules)}
+        if fresh:
+            print(f"⏭️  {len(fresh)} files unchanged since last run")
+        files = [path for path in files if path not in fresh]
+
+    start = time.perf_counter()
+    results = run(transform, files, jobs=args.jobs, dry_run=args.dry_run)
+    report(results, time.perf_counter() - start)
+
+    if manifest and not args.dry_run:
+        for result in results:
+            if not result.error:
+                manifest.record(result.path, rules, result.digest)
+        manifest.save()
+    return results
@@ -0,0 +1,116 @@
+"""
+On-disk content-hash manifest so codemods skip files they've already processed.
+
+For every file the manifest records its size, mtime and SHA-256 together
+with the hashes of the rule sets that have already run over exactly that
+content. A file is skipped when the rule set is listed and either the stat
+signature still matches (no read at all) or the content hash does.
+
+A rule set hash covers the source of the functions and modules passed to
+rules_hash, so codemods pass the shared modules their rules run on (the
+lexer, the rewrite engine) and a fix there invalidates earlier runs.
+"""
+import hashlib
+import inspect
+import json
+import os
+import re
+import types
+
+DEFAULT_MANIFEST_PATH = '.codemod-manifest.json'
+
+# Rule sets remembered per content version (several codemods share files)
+MAX_RULE_SETS = 16
+
+
+def content_digest(data):
+    """SHA-256 hex digest of file content (str is hashed as UTF-8)"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(file_path):
+    with open(file_path, 'rb') as f:
+        return content_digest(f.read())
+
+
+def rules_hash(*parts):
+    """Stable hash of a rule set: dicts, strings, compiled regexes, functions or modules"""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, re.Pattern):
+            part = [part.pattern, part.flags]
+        elif callable(part) or isinstance(part, types.ModuleType):
+            part = inspect.getsource(part)
+        h.update(json.dumps(part, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()[:16]
+
+
+class Manifest:
+    """Per-file record of content hash and the rule sets already applied"""
+
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('files', {})
+            except (OSError, ValueError):
+                # A corrupt manifest only costs one full re-run
+                self.entries = {}
+
+    def is_fresh(self, file_path, rules):
+        """True if `rules` already ran over the file's current content"""
+        entry = self.entries.get(os.path.normpath(file_path))
+        if not entry or rules not in entry['rules']:
+            return False
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False
+        if st.st_size != entry['size']:
+            return False
+        if st.st_mtime_ns == entry['mtime_ns']:
+            return True
+
+        # Touched but maybe not modified: fall back to the content hash
+        if file_digest(file_path) != entry['sha256']:
+            return False
+        entry['mtime_ns'] = st.st_mtime_ns
+        self.dirty = True
+        return True
+
+    def record(self, file_path, rules, digest=None):
+        """Remember that `rules` ran over the file as it is now on disk"""
+        key = os.path.normpath(file_path)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            self.entries.pop(key, None)
+            return
+        if digest is None:
+            digest = file_digest(file_path)
+
+        entry = self.entries.get(key)
+        if entry and entry['sha256'] == digest:
+            known = [r for r in entry['rules'] if r != rules]
+            entry['rules'] = (known + [rules])[-MAX_RULE_SETS:]
+        else:
+            entry = {'sha256': digest, 'rules': [rules]}
+            self.entries[key] = entry
+        entry['size'] = st.st_size
+        entry['mtime_ns'] = st.st_mtime_ns
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'files': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
@@ -0,0 +1,298 @@
+"""
+Parser for drizzle/schema.ts.
+
+Reads the mysqlTable() definitions into plain Python objects so offline
+tools can use the same schema as the server without a TypeScript toolchain:
+
+    from drizzle_schema import load_schema
+
+    schema = load_schema()
+    leads = schema.tables['leads']
+    leads.column('createdAt').sql_type      # 'timestamp'
+    schema.foreign_keys()                   # [(table, column, ref_table, ref_column, on_delete)]
+
+Only the column builders used in this repo are understood (int, varchar,
+text, timestamp, boolean, decimal, json, mysqlEnum) together with their
+.notNull()/.default()/.references() chains.
+"""
+import json
+import re
+from collections import namedtuple
+
+from sql_dump import Column as DumpColumn, TableSchema
+
+DEFAULT_SCHEMA_PATH = 'drizzle/schema.ts'
+
+TABLE = re.compile(r'^export const (\w+) = mysqlTable\(\s*"([^"]+)"\s*,\s*\{', re.MULTILINE)
+COLUMN = re.compile(r'^(\w+)\s*:\s*(\w+)\(\s*"([^"]+)"\s*(?:,\s*)?')
+CHAIN = re.compile(r'\.(\w+)\(')
+REFERENCE = re.compile(r'\(\)\s*=>\s*(\w+)\.(\w+)(?:\s*,\s*\{\s*onDelete:\s*["\'](\w[\w ]*)["\'])?')
+
+# drizzle builder -> MySQL column type
+SQL_TYPES = {
+    'int': 'int',
+    'varchar': 'varchar',
+    'text': 'text',
+    'timestamp': 'timestamp',
+    'boolean': 'boolean',
+    'decimal': 'decimal',
+    'json': 'json',
+    'mysqlEnum': 'enum',
+}
+
+Column = namedtuple('Column', [
+    'prop',            # TypeScript property name
+    'name',            # SQL column name
+    'kind',            # drizzle builder: int, varchar, mysqlEnum, ...
+    'length',          # varchar length
+    'precision',
+    'scale',
+    'values',          # enum values
+    'not_null',
+    'primary_key',
+    'autoincrement',
+    'unique',
+    'default',         # Python value, or None
+    'default_now',
+    'on_update_now',
+    'references',      # (table_var, column_prop, on_delete) or None
+])
+
+
+class Table:
+    """One mysqlTable() definition"""
+
+    def __init__(self, var, name, columns):
+        self.var = var
+        self.name = name
+        self.columns = columns
+        self.by_name = {column.name: column for column in columns}
+        self.by_prop = {column.prop: column for column in columns}
+
+    def column(self, name):
+        """Column by SQL name or property name; KeyError if unknown"""
+        if name in self.by_name:
+            return self.by_name[name]
+        return self.by_prop[name]
+
+    @property
+    def primary_key(self):
+        return [column.name for column in self.columns if column.primary_key]
+
+    def __repr__(self):
+        return f"Table({self.name!r}, {len(self.columns)} columns)"
+
+
+class Schema:
+    """All tables of schema.ts, by SQL name and by exported variable"""
+
+    def __init__(self, tables):
+        self.tables = {table.name: table for table in tables}
+        self.by_var = {table.var: table for table in tables}
+
+    def foreign_keys(self):
+        """(table, column, ref_table, ref_column, on_delete) for every .references()"""
+        keys = []
+        for table in self.tables.values():
+            for column in table.columns:
+                if not column.references:
+                    continue
+                ref_var, ref_prop, on_delete = column.references
+                ref_table = self.by_var.get(ref_var)
+                if ref_table is None:
+                    continue
+                ref_column = ref_table.by_prop.get(ref_prop)
+                keys.append((table.name, column.name, ref_table.name,
+                             ref_column.name if ref_column else ref_prop, on_delete))
+        return keys
+
+    def table_schemas(self):
+        """sql_dump.TableSchema per table, for typed decoding of data-only dumps"""
+        return {name: TableSchema(name, [dump_column(column) for column in table.columns])
+                for name, table in self.tables.items()}
+
+
+def sql_type(column):
+    """MySQL type declaration, e.g. varchar(255) or decimal(10,2)"""
+    base = SQL_TYPES.get(column.kind, column.kind)
+    if column.kind == 'varchar':
+        return f"varchar({column.length})"
+    if column.kind == 'decimal':
+        return f"decimal({column.precision},{column.scale})"
+    if column.kind == 'mysqlEnum':
+        return 'enum(' + ','.join("'" + value.replace("'", "''") + "'" for value in column.values) + ')'
+    return base
+
+
+def dump_column(column):
+    """sql_dump.Column equivalent of a drizzle column"""
+    if column.kind == 'boolean':
+        return DumpColumn(column.name, 'tinyint', '1', False, not column.not_null)
+    size = None
+    if column.kind == 'varchar':
+        size = str(column.length)
+    elif column.kind == 'decimal':
+        size = f"{column.precision},{column.scale}"
+    return DumpColumn(column.name, SQL_TYPES.get(column.kind, column.kind), size, False,
+                      not column.not_null)
+
+
+# Parsing
+
+def _strip_comments(text):
+    """Remove // and /* */ comments outside of string literals"""
+    out = []
+    i = 0
+    n = len(text)
+    while i < n:
+        ch = text[i]
+        if ch in '"\'`':
+            end = i + 1
+            while end < n and text[end] != ch:
+                end += 2 if text[end] == '\\' else 1
+            out.append(text[i:end + 1])
+            i = end + 1
+        elif text.startswith('//', i):
+            end = text.find('\n', i)
+            i = n if end < 0 else end
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+        else:
+            out.append(ch)
+            i += 1
+    return ''.join(out)
+
+
+def _split_top_level(body, sep=','):
+    """Split on `sep` outside of (), [], {} and strings"""
+    parts = []
+    depth = 0
+    start = 0
+    quote = None
+    for i, ch in enumerate(body):
+        if quote:
+            if ch == quote and body[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'`':
+            quote = ch
+        elif ch in '([{':
+            depth += 1
+        elif ch in ')]}':
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(body[start:i])
+            start = i + 1
+    parts.append(body[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _matching(text, i, open_ch, close_ch):
+    """Offset of the bracket closing the one at `i`"""
+    depth = 0
+    quote = None
+    for j in range(i, len(text)):
+        ch = text[j]
+        if quote:
+            if ch == quote and text[j - 1] != '\\':
+                quote = None
+        elif ch in '"\'`':
+            quote = ch
+        elif ch == open_ch:
+            depth += 1
+        elif ch == close_ch:
+            depth -= 1
+            if depth == 0:
+                return j
+    raise ValueError(f"Unbalanced {open_ch!r} at offset {i}")
+
+
+def _literal(text):
+    """Python value of a simple TS literal: number, string, boolean, null, array"""
+    text = text.strip()
+    if text in ('true', 'false'):
+        return text == 'true'
+    if text in ('null', 'undefined'):
+        return None
+    if text[:1] in '"\'' and text[-1:] == text[:1]:
+        return text[1:-1].replace('\\' + text[0], text[0])
+    if text.startswith('['):
+        return [_literal(part) for part in _split_top_level(text[1:-1])]
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _options(text):
+    """{ length: 255, precision: 10 } -> dict"""
+    options = {}
+    for part in _split_top_level(text.strip()[1:-1]):
+        key, _, value = part.partition(':')
+        options[key.strip()] = _literal(value)
+    return options
+
+
+def parse_column(entry):
+    """Column from one `prop: builder("name", ...).chain()` entry, or None"""
+    m = COLUMN.match(entry)
+    if not m:
+        return None
+    prop, kind, name = m.groups()
+    args_end = _matching(entry, m.start(2) + len(kind), '(', ')')
+    extra = entry[m.end():args_end].strip()
+    length = precision = scale = None
+    values = None
+    if extra.startswith('{'):
+        options = _options(extra)
+        length = options.get('length')
+        precision = options.get('precision')
+        scale = options.get('scale')
+    elif extra.startswith('['):
+        values = _literal(extra)
+
+    info = dict(not_null=False, primary_key=False, autoincrement=False, unique=False,
+                default=None, default_now=False, on_update_now=False, references=None)
+    rest = entry[args_end + 1:]
+    for call in CHAIN.finditer(rest):
+        method = call.group(1)
+        close = _matching(rest, call.end() - 1, '(', ')')
+        args = rest[call.end():close]
+        if method == 'notNull':
+            info['not_null'] = True
+        elif method == 'primaryKey':
+            info['primary_key'] = info['not_null'] = True
+        elif method == 'autoincrement':
+            info['autoincrement'] = True
+        elif method == 'unique':
+            info['unique'] = True
+        elif method == 'default':
+            info['default'] = _literal(args)
+        elif method == 'defaultNow':
+            info['default_now'] = True
+        elif method == 'onUpdateNow':
+            info['on_update_now'] = True
+        elif method == 'references':
+            ref = REFERENCE.search(args)
+            if ref:
+                info['references'] = (ref.group(1), ref.group(2), ref.group(3))
+    return Column(prop, name, kind, length, precision, scale, values, **info)
+
+
+def parse_schema(source):
+    """Schema from the text of a drizzle schema file"""
+    text = _strip_comments(source)
+    tables = []
+    for m in TABLE.finditer(text):
+        body_start = m.end() - 1
+        body_end = _matching(text, body_start, '{', '}')
+        columns = [column for column in
+                   (parse_column(entry) for entry in _split_top_level(text[body_start + 1:body_end]))
+                   if column]
+        tables.append(Table(m.group(1), m.group(2), columns))
+    return Schema(tables)
+
+
+def load_schema(path=DEFAULT_SCHEMA_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_schema(f.read())
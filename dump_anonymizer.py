@@ -0,0 +1,403 @@
+"""
+Streaming PII anonymizer for mysqldump files.
+
+Rewrites a dump so it can be handed to developers: emails, phones,
+Telegram handles, names, free-text messages, IPs and password hashes are
+replaced by deterministic, format-preserving pseudonyms keyed by a salt:
+
+    python dump_anonymizer.py database_COMPLETE_WITH_ALL_DATA.sql -o anonymized.sql --salt "$ANONYMIZE_SALT"
+    python dump_anonymizer.py big_dump.sql -o big_anon.sql --jobs 8 --chunk-mb 64
+    python dump_anonymizer.py --rules                        # which columns get which rule
+    python dump_anonymizer.py dump.sql -o out.sql --column leads.answers=json --keep users.name
+
+Which columns are rewritten is decided from the column names in
+drizzle/schema.ts (see NAME_RULES): email/phone/handle/secret/ip columns
+in every table; name/text columns only in the person tables (PERSON_TABLES)
+so quiz, status and service names stay readable.
+
+Pseudonyms come from SHAKE-256 keyed by the salt over (kind, normalized
+value), mapped character by character within the same class (a-z, A-Z, 0-9, Cyrillic), so lengths,
+case, punctuation and structure survive. The same input gives the same
+output everywhere: a lead's email matches the same user's email, and
+duplicate detection (lower-cased emails, phone digits) finds the same
+duplicates. Free-mail domains (gmail.com, ukr.net, ...), phone operator
+prefixes and bcrypt `$2b$10$` headers are kept.
+
+The dump is cut into byte ranges at statement ends (`;\\n`). Each worker of
+a process pool reads its own range from disk and rewrites only the INSERTs
+of tables that have rules; everything else is copied verbatim, except `--`
+comment lines, which are dropped (this dump's header lists real accounts).
+At most 2 x jobs ranges are in flight, so memory stays at about
+2 x jobs x chunk size whatever the dump size. Ranges are split on `;\\n`,
+which assumes mysqldump output, where string literals never contain a
+raw newline.
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import secrets
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import getitem
+
+from drizzle_schema import load_schema
+from restore_planner import sql_literal
+from sql_dump import DumpReader, parse_create_table
+
+DEFAULT_CHUNK_MB = 64
+
+PERSON_TABLES = {
+    'users', 'leads', 'messages', 'contact_messages', 'incomplete_quiz_sessions',
+    'inbound_messages', 'interaction_history', 'scheduled_messages', 'call_logs',
+}
+
+# (column name pattern, kind, person tables only)
+NAME_RULES = [
+    (re.compile(r'e-?mail$', re.IGNORECASE), 'email', False),
+    (re.compile(r'phone(Number)?$', re.IGNORECASE), 'phone', False),
+    (re.compile(r'^telegram(ChatId)?$', re.IGNORECASE), 'handle', False),
+    (re.compile(r'password|secret|^token$', re.IGNORECASE), 'secret', False),
+    (re.compile(r'^(client)?ip(_?address)?$', re.IGNORECASE), 'ip', False),
+    (re.compile(r'^(name|fullName|firstName|lastName|senderName)$', re.IGNORECASE), 'name', True),
+    (re.compile(r'^(message|content|notes)$', re.IGNORECASE), 'text', True),
+]
+TEXT_KINDS = {'varchar', 'text', 'json'}
+KINDS = ['email', 'phone', 'handle', 'secret', 'ip', 'name', 'text', 'json']
+
+PUBLIC_DOMAINS = {
+    'gmail.com', 'googlemail.com', 'ukr.net', 'i.ua', 'meta.ua', 'outlook.com', 'hotmail.com',
+    'live.com', 'yahoo.com', 'icloud.com', 'me.com', 'proton.me', 'protonmail.com',
+    'mail.ru', 'yandex.ru', 'yandex.ua', 'bigmir.net', 'gmx.de', 'aol.com',
+}
+
+ALPHABETS = [
+    'abcdefghijklmnopqrstuvwxyz',
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+    '0123456789',
+    'абвгґдеєжзиіїйклмнопрстуфхцчшщьюя',
+    'АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ',
+    'ёыэъ',
+    'ЁЫЭЪ',
+]
+
+DIGITS = '0123456789'
+BCRYPT_HEADER = re.compile(r'^\$\w+\$\d+\$')
+IPV4 = re.compile(r'^(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})$')
+HANDLE_PREFIX = re.compile(r'^(@|https?://t\.me/|t\.me/)', re.IGNORECASE)
+COMMENT_LINE = re.compile(rb'^--[^\n]*\n', re.MULTILINE)
+VALUES_PREFIX = re.compile(rb'^INSERT\s+INTO\s+`?(\w+)`?[^;]*?\bVALUES\s*', re.IGNORECASE)
+CREATE_TABLE = re.compile(rb'^CREATE TABLE\b', re.MULTILINE | re.IGNORECASE)
+
+
+# Pseudonyms
+
+class _Replacements(dict):
+    """char -> 256 replacement chars (by stream byte); characters outside ALPHABETS map to themselves"""
+
+    def __missing__(self, ch):
+        table = (ch,) * 256
+        self[ch] = table
+        return table
+
+
+REPLACEMENTS = _Replacements(
+    (ch, tuple(alphabet[byte % len(alphabet)] for byte in range(256)))
+    for alphabet in ALPHABETS for ch in alphabet)
+
+
+class Pseudonymizer:
+    """Deterministic, format-preserving replacements keyed by a salt"""
+
+    def __init__(self, salt):
+        key = salt.encode('utf-8') if isinstance(salt, str) else salt
+        self._keyed = hashlib.shake_256(len(key).to_bytes(4, 'big') + key)
+        self.apply = lru_cache(maxsize=1 << 16)(self._apply)
+
+    def _stream(self, kind, value, n):
+        """n pseudo-random bytes derived from (salt, kind, value)"""
+        h = self._keyed.copy()
+        h.update(kind.encode() + b'\0' + value.encode('utf-8', 'surrogateescape'))
+        return h.digest(n)
+
+    def scramble(self, text, kind, key=None):
+        """Replace each letter/digit by one of the same class; other characters stay"""
+        stream = self._stream(kind, key if key is not None else text, len(text))
+        return ''.join(map(getitem, map(REPLACEMENTS.__getitem__, text), stream))
+
+    def _scramble_ci(self, text, kind):
+        """Case-insensitive key, case of the input kept"""
+        lowered = self.scramble(text.lower(), kind)
+        return ''.join(new.upper() if old.isupper() else new for old, new in zip(text, lowered))
+
+    def email(self, value):
+        local, at, domain = value.rpartition('@')
+        if not at:
+            return self._scramble_ci(value, 'email')
+        local = self._scramble_ci(local, 'email')
+        if domain.lower() not in PUBLIC_DOMAINS:
+            name, dot, tld = domain.rpartition('.')
+            domain = self._scramble_ci(name, 'domain') + dot + tld if dot else self._scramble_ci(domain, 'domain')
+        return local + '@' + domain
+
+    def phone(self, value):
+        digits = ''.join(filter(str.isdigit, value))
+        if len(digits) < 7:
+            return self.scramble(value, 'phone')
+        # Same subscriber number -> same pseudonym, whatever the prefix and formatting
+        stream = self._stream('phone', digits[-9:], 7)
+        digits = digits[:-7] + ''.join([DIGITS[byte % 10] for byte in stream])
+        if value.isdigit() or (value[:1] == '+' and value[1:].isdigit()):
+            return '+' + digits if value[:1] == '+' else digits
+        replace = iter(digits)
+        return ''.join(next(replace) if ch.isdigit() else ch for ch in value)
+
+    def handle(self, value):
+        m = HANDLE_PREFIX.match(value)
+        prefix = m.group(0) if m else ''
+        return prefix + self._scramble_ci(value[len(prefix):], 'handle')
+
+    def secret(self, value):
+        m = BCRYPT_HEADER.match(value)
+        header = m.group(0) if m else ''
+        return header + self.scramble(value[len(header):], 'secret', key=value)
+
+    def ip(self, value):
+        m = IPV4.match(value)
+        if not m:
+            return self.scramble(value, 'ip')
+        stream = self._stream('ip', value, 3)
+        # Keep the first octet so private/public ranges stay recognisable
+        return '.'.join([m.group(1)] + [str(byte) for byte in stream])
+
+    def json(self, value):
+        try:
+            data = json.loads(value)
+        except ValueError:
+            return self.scramble(value, 'text')
+
+        def walk(node):
+            if isinstance(node, str):
+                return self.scramble(node, 'text')
+            if isinstance(node, list):
+                return [walk(item) for item in node]
+            if isinstance(node, dict):
+                return {key: walk(item) for key, item in node.items()}
+            return node
+
+        return json.dumps(walk(data), ensure_ascii=False, separators=(',', ':'))
+
+    def _apply(self, kind, value):
+        if kind in ('name', 'text'):
+            return self.scramble(value, kind)
+        return getattr(self, kind)(value)
+
+
+# Column rules
+
+def column_rules(schema, overrides=(), keep=()):
+    """{table: {column: kind}} from drizzle/schema.ts column names plus overrides"""
+    rules = {}
+    for table in schema.tables.values():
+        for column in table.columns:
+            if column.kind not in TEXT_KINDS:
+                continue
+            for pattern, kind, person_only in NAME_RULES:
+                if pattern.search(column.name) and (not person_only or table.name in PERSON_TABLES):
+                    rules.setdefault(table.name, {})[column.name] = kind
+                    break
+    for spec in overrides:
+        target, _, kind = spec.partition('=')
+        table, _, column = target.partition('.')
+        if kind not in KINDS or not column:
+            raise ValueError(f"Bad --column {spec!r}: expected table.column=<{'|'.join(KINDS)}>")
+        rules.setdefault(table, {})[column] = kind
+    for target in keep:
+        table, _, column = target.partition('.')
+        rules.get(table, {}).pop(column, None)
+    return {table: columns for table, columns in rules.items() if columns}
+
+
+def dump_schemas(path, tables):
+    """TableSchema per CREATE TABLE in the dump (for INSERTs without a column list)"""
+    schemas = {}
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return schemas
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for m in CREATE_TABLE.finditer(mm):
+                end = mm.find(b';\n', m.start())
+                statement = mm[m.start():end if end >= 0 else len(mm)].decode('utf-8', 'replace')
+                schema = parse_create_table(statement)
+                if schema is not None and schema.name in tables:
+                    schemas[schema.name] = schema
+    return schemas
+
+
+# Chunked rewrite
+
+def chunk_ranges(path, chunk_bytes):
+    """(start, end) byte ranges of about chunk_bytes, each ending at a `;\\n`"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    ranges = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = mm.find(b';\n', min(start + chunk_bytes, size) - 1)
+            end = size if end < 0 else end + 2
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _rewrite_insert(statement, rules, schemas, pseudonyms, stats):
+    """One INSERT statement with the rule columns replaced"""
+    prefix = VALUES_PREFIX.match(statement)
+    reader = DumpReader(statement, schemas=schemas, typed=False)
+    rows = list(reader)
+    if not prefix or not rows:
+        return statement
+    table = rows[0][0]
+    names = reader.columns[table]
+    columns = rules.get(table, {})
+    targets = [(i, columns[name]) for i, name in enumerate(names) if name in columns]
+    apply = pseudonyms.apply
+    values = []
+    for _, row in rows:
+        row = list(row)
+        for i, kind in targets:
+            value = row[i]
+            if isinstance(value, str) and value:
+                row[i] = apply(kind, value)
+                stats[f"{table}.{names[i]}"] += 1
+        values.append('(' + ','.join(map(sql_literal, row)) + ')')
+    stats[table] += len(rows)
+    return prefix.group(0) + ','.join(values).encode('utf-8') + b';\n'
+
+
+def _passthrough(data, strip_comments):
+    return COMMENT_LINE.sub(b'', data) if strip_comments else data
+
+
+_worker_state = None
+
+
+def _init_worker(rules, schemas, salt):
+    global _worker_state
+    tables = b'|'.join(re.escape(table.encode()) for table in rules) or b'(?!)'
+    insert = re.compile(rb'^INSERT\s+INTO\s+`?(?:' + tables + rb')`?[\s(]', re.MULTILINE | re.IGNORECASE)
+    _worker_state = (rules, schemas, Pseudonymizer(salt), insert)
+
+
+def anonymize_range(path, start, end, strip_comments=True):
+    """Rewritten bytes of dump[start:end] and per-table/column counts; runs in a worker"""
+    rules, schemas, pseudonyms, insert = _worker_state
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    stats = Counter()
+    out = []
+    pos = 0
+    for m in insert.finditer(data):
+        if m.start() < pos:
+            continue
+        stop = data.find(b';\n', m.start())
+        stop = len(data) if stop < 0 else stop + 2
+        out.append(_passthrough(data[pos:m.start()], strip_comments))
+        out.append(_rewrite_insert(data[m.start():stop], rules, schemas, pseudonyms, stats))
+        pos = stop
+    out.append(_passthrough(data[pos:], strip_comments))
+    return b''.join(out), stats
+
+
+def anonymize_dump(path, out_path, rules, salt, jobs=None, chunk_bytes=DEFAULT_CHUNK_MB << 20,
+                   strip_comments=True, schemas=None):
+    """Rewrite `path` into `out_path`; returns (stats Counter, bytes in, bytes out)"""
+    jobs = jobs or os.cpu_count() or 1
+    if schemas is None:
+        schemas = dump_schemas(path, rules)
+        for name, table_schema in load_schema().table_schemas().items():
+            if name in rules:
+                schemas.setdefault(name, table_schema)
+    ranges = chunk_ranges(path, chunk_bytes)
+    stats = Counter()
+    written = 0
+    with open(out_path, 'wb') as out, ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(rules, schemas, salt)) as pool:
+        # Ordered, bounded window of in-flight ranges keeps memory constant
+        pending = deque()
+        for start, end in ranges:
+            pending.append(pool.submit(anonymize_range, path, start, end, strip_comments))
+            if len(pending) >= 2 * jobs:
+                data, counts = pending.popleft().result()
+                out.write(data)
+                written += len(data)
+                stats.update(counts)
+        while pending:
+            data, counts = pending.popleft().result()
+            out.write(data)
+            written += len(data)
+            stats.update(counts)
+    return stats, (ranges[-1][1] if ranges else 0), written
+
+
+def print_rules(rules):
+    print("📝 Column rules (from drizzle/schema.ts):")
+    for table in sorted(rules):
+        print(f"  {table}: " + ', '.join(f"{column}={kind}" for column, kind in sorted(rules[table].items())))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Anonymize PII in a mysqldump file")
+    parser.add_argument('dump', nargs='?', help='mysqldump file')
+    parser.add_argument('-o', '--output', help='anonymized dump to write')
+    parser.add_argument('--salt', default=os.environ.get('ANONYMIZE_SALT'),
+                        help='pseudonym key (default: $ANONYMIZE_SALT; random if unset)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--chunk-mb', type=int, default=DEFAULT_CHUNK_MB, help='bytes per worker task')
+    parser.add_argument('--column', action='append', default=[], metavar='TABLE.COLUMN=KIND',
+                        help=f"add or change a rule ({', '.join(KINDS)})")
+    parser.add_argument('--keep', action='append', default=[], metavar='TABLE.COLUMN',
+                        help='leave a column unchanged')
+    parser.add_argument('--keep-comments', action='store_true', help='copy `--` comment lines')
+    parser.add_argument('--schema', default='drizzle/schema.ts')
+    parser.add_argument('--rules', action='store_true', help='print the column rules and exit')
+    args = parser.parse_args()
+
+    try:
+        rules = column_rules(load_schema(args.schema), args.column, args.keep)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if args.rules:
+        print_rules(rules)
+        sys.exit(0)
+    if not args.dump or not args.output:
+        parser.error('dump and -o/--output are required')
+    if os.path.abspath(args.dump) == os.path.abspath(args.output):
+        parser.error('output must differ from the input dump')
+
+    salt = args.salt
+    if not salt:
+        salt = secrets.token_hex(16)
+        print("⚠️  No --salt or $ANONYMIZE_SALT: using a random salt, pseudonyms won't match other runs")
+
+    started = time.perf_counter()
+    stats, read, written = anonymize_dump(args.dump, args.output, rules, salt, args.jobs,
+                                          args.chunk_mb << 20, not args.keep_comments)
+    elapsed = time.perf_counter() - started
+
+    for table in sorted(rules):
+        if stats[table]:
+            changed = ', '.join(f"{column} {stats[f'{table}.{column}']}" for column in sorted(rules[table])
+                                if stats[f'{table}.{column}'])
+            print(f"📝 {table}: {stats[table]} rows ({changed or 'no values'})")
+    print(f"✅ {read / 1e6:.1f} MB → {args.output} ({written / 1e6:.1f} MB) in {elapsed:.2f}s "
+          f"({read / 1e6 / elapsed if elapsed else 0:.1f} MB/s)")
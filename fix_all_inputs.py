@@ -1,7 +1,9 @@
-import re
-import os
+import codemod_driver
+import jsx_lexer
+from codemod_manifest import rules_hash
+from jsx_lexer import Editor, iter_tags
 
-# Files to fix
+# Files to fix (default when no paths/globs are given on the command line)
 files_to_fix = [
     "client/src/components/EditLeadForm.tsx",
     "client/src/pages/AdminSettings.tsx",
@@ -11,50 +13,42 @@ files_to_fix = [
     "client/src/pages/SalesStatistics.tsx",
 ]
 
-for file_path in files_to_fix:
-    if not os.path.exists(file_path):
-        print(f"Skipping {file_path} - file not found")
-        continue
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    original_content = content
-    
-    # Fix 1: Add mb-2 to all Label elements that don't have it
-    # Pattern: <Label (anything except >) that doesn't contain mb-
-    content = re.sub(
-        r'<Label\s+([^>]*?)(?<!mb-)(\s*className="([^"]*?)")?([^>]*?)>',
-        lambda m: f'<Label {m.group(1)}className="{m.group(3) + " " if m.group(3) else ""}mb-2"{m.group(4)}>',
-        content
-    )
-    
-    # Fix 2: Add bg-zinc-800 border-zinc-700 to all Input elements
-    content = re.sub(
-        r'<Input\s+([^>]*?)(?:className="([^"]*?)")?([^>]*?)/>',
-        lambda m: f'<Input {m.group(1)}className="{m.group(2) + " " if m.group(2) else ""}bg-zinc-800 border-zinc-700"{m.group(3)} />',
-        content
-    )
-    
-    # Fix 3: Add bg-zinc-800 border-zinc-700 to all Textarea elements
-    content = re.sub(
-        r'<Textarea\s+([^>]*?)(?:className="([^"]*?)")?([^>]*?)/>',
-        lambda m: f'<Textarea {m.group(1)}className="{m.group(2) + " " if m.group(2) else ""}bg-zinc-800 border-zinc-700"{m.group(3)} />',
-        content
-    )
-    
-    # Fix 4: Add bg-zinc-800 border-zinc-700 to all Select.Trigger elements
-    content = re.sub(
-        r'<Select\.Trigger\s+([^>]*?)(?:className="([^"]*?)")?([^>]*?)>',
-        lambda m: f'<Select.Trigger {m.group(1)}className="{m.group(2) + " " if m.group(2) else ""}bg-zinc-800 border-zinc-700"{m.group(3)}>',
-        content
-    )
-    
-    if content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✅ Fixed {file_path}")
-    else:
-        print(f"⏭️  No changes needed in {file_path}")
-
-print("\n✅ All input fields fixed!")
+# Fix 1: Add mb-2 to all Label elements that don't have an mb-* class
+LABEL_CLASS = 'mb-2'
+
+# Fix 2-4: Add bg-zinc-800 border-zinc-700 to all Input, Textarea and Select.Trigger elements
+FIELD_TAGS = ['Input', 'Textarea', 'Select.Trigger']
+FIELD_CLASSES = ['bg-zinc-800', 'border-zinc-700']
+
+
+def fix_inputs(content):
+    """Apply all input styling fixes; returns (content, match counts)
+
+    Class edits are set-based, so running this twice is a no-op.
+    """
+    matches = {name: 0 for name in ['Label'] + FIELD_TAGS}
+    editor = Editor(content)
+
+    for tag in iter_tags(content, matches):
+        classes = tag.classes()
+        if classes is None:
+            # className={...} expression; leave it to a human
+            continue
+        if tag.name == 'Label':
+            if any(cls.startswith('mb-') for cls in classes):
+                continue
+            editor.add_classes(tag, [LABEL_CLASS])
+        elif all(cls in classes for cls in FIELD_CLASSES):
+            continue
+        else:
+            editor.add_classes(tag, FIELD_CLASSES)
+        matches[tag.name] += 1
+
+    return editor.apply(), matches
+
+
+if __name__ == '__main__':
+    rules = rules_hash(fix_inputs, jsx_lexer, LABEL_CLASS, FIELD_TAGS, FIELD_CLASSES)
+    codemod_driver.main(fix_inputs, files_to_fix, description="Fix input field styling in TSX files",
+                        rules=rules)
+    print("\n✅ All input fields fixed!")
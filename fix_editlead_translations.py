@@ -1,4 +1,4 @@
-import re
+from rewrite_engine import RewriteEngine
 
 # Read the file
 with open('client/src/components/EditLeadForm.tsx', 'r', encoding='utf-8') as f:
@@ -27,11 +27,10 @@ replacements = {
     "t('Конвертувати в продаж', 'Конвертировать в продажу', 'Convert to Sale')": "t('editLead.convertToSale')",
 }
 
-for old, new in replacements.items():
-    content = content.replace(old, new)
+content, counts = RewriteEngine(replacements).rewrite(content)
 
 # Write back
 with open('client/src/components/EditLeadForm.tsx', 'w', encoding='utf-8') as f:
     f.write(content)
 
-print("✅ Fixed EditLeadForm.tsx translations")
+print(f"✅ Fixed EditLeadForm.tsx translations ({sum(counts.values())} replacements)")
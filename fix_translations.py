@@ -1,7 +1,9 @@
-import os
 import re
 
-# List of files to fix
+import codemod_driver
+from codemod_manifest import rules_hash
+
+# List of files to fix (default when no paths/globs are given on the command line)
 files_to_fix = [
     "client/src/pages/CRM.tsx",
     "client/src/pages/SalesStatistics.tsx",
@@ -34,23 +36,15 @@ old_translation_pattern = re.compile(
     re.MULTILINE
 )
 
-for file_path in files_to_fix:
-    if not os.path.exists(file_path):
-        print(f"⚠️  File not found: {file_path}")
-        continue
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Remove old translation code
-    new_content = old_translation_pattern.sub('', content)
-    
-    # Check if anything changed
-    if new_content != content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        print(f"✅ Fixed: {file_path}")
-    else:
-        print(f"✓  Already clean: {file_path}")
 
-print("\n✅ All files processed!")
+def remove_old_translation_code(content):
+    """Remove the inline localStorage-based t() helper; returns (content, match counts)"""
+    content, count = old_translation_pattern.subn('', content)
+    return content, {'old_translation': count}
+
+
+if __name__ == '__main__':
+    codemod_driver.main(remove_old_translation_code, files_to_fix,
+                        description="Remove legacy inline translation helpers",
+                        rules=rules_hash(remove_old_translation_code, old_translation_pattern))
+    print("\n✅ All files processed!")
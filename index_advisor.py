@@ -0,0 +1,517 @@
+"""
+Missing-index advisor.
+
+Collects the column sets queries filter, join and sort on, checks them
+against the indexes the migrations define, and ranks the composite indexes
+that are missing:
+
+    python index_advisor.py                         # logs + server code
+    python index_advisor.py --dump database_COMPLETE_WITH_ALL_DATA.sql
+    python index_advisor.py --json > index_advice.json
+
+Access patterns come from two places:
+
+    .manus/db/db-query-*.json      WHERE / JOIN ... ON / ORDER BY of logged
+                                   SELECT, UPDATE and DELETE queries
+    server/*.ts, server/routers/*.ts
+                                   drizzle chains: .from(t) / .update(t) /
+                                   .delete(t) with eq()/gte()/inArray()/...
+                                   in .where(), join conditions and .orderBy()
+
+Each pattern is weighted by how often it runs: the number of log records
+with that shape, and --code-weight per call site in the server code. Its
+cost is the estimated number of rows examined with the best existing index
+(table rows from --dump, else --rows; each equality column keeps 1/10 of
+the rows, a range 3/10, a filesort doubles the cost). Candidates are
+ranked by weight x (cost now - cost with the index); a candidate that is a
+leftmost prefix of another on the same table is folded into it.
+"""
+import argparse
+import glob
+import json
+import re
+import sys
+from collections import namedtuple
+
+from drizzle_schema import load_schema
+from migration_schema import compile_migrations, split_top_level
+from query_log import DEFAULT_LOG_DIR, iter_records, normalize
+from sql_dump import DumpReader
+
+SOURCE_GLOBS = ['server/*.ts', 'server/routers/*.ts']
+DEFAULT_ROWS = 10000
+EQ_SELECTIVITY = 0.1
+RANGE_SELECTIVITY = 0.3
+
+AccessPattern = namedtuple('AccessPattern', 'table equality ranges order')
+
+
+# Patterns from logged SQL
+
+SQL_TABLE_REF = re.compile(
+    r'\b(from|join|update)\s+([a-z_][\w$]*)(?:\s+(?:as\s+)?([a-z_][\w$]*))?(?:\s+on\s+)?')
+NOT_ALIASES = {
+    'where', 'on', 'set', 'left', 'right', 'inner', 'outer', 'cross', 'natural', 'join', 'order',
+    'group', 'limit', 'having', 'using', 'union', 'straight_join', 'for', 'lock', 'use', 'force',
+    'ignore', 'partition', 'window',
+}
+CLAUSE_END = re.compile(r'\b(?:group by|order by|limit|having|for update|union|lock in)\b|$')
+CONDITION = re.compile(
+    r'^\(*\s*(?:([\w$]+)\.)?([\w$]+)\s*(<=>|>=|<=|<>|!=|=|>|<|not in\b|in\b|not like\b|like\b|between\b|is not null|is null)\s*(.*)$',
+    re.DOTALL,
+)
+COLUMN_REF = re.compile(r'^\(*\s*(?:([\w$]+)\.)?([\w$]+)\s*\)*$')
+EQUALITY_OPS = {'=', '<=>', 'in', 'is null'}
+RANGE_OPS = {'>', '<', '>=', '<=', 'between', 'like'}
+
+
+def _conjuncts(text):
+    """Top-level AND terms; terms containing a top-level OR are dropped"""
+    terms = []
+    depth = 0
+    start = 0
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif depth == 0 and text.startswith(' and ', i):
+            # BETWEEN x AND y is one term
+            if not re.search(r'\bbetween \S+$', text[start:i]):
+                terms.append(text[start:i])
+                start = i + 5
+                i += 5
+                continue
+        i += 1
+    terms.append(text[start:])
+    return [term.strip() for term in terms if term.strip() and not re.search(r'\bor\b', _top_level(term))]
+
+
+def _top_level(text):
+    """`text` with parenthesized parts removed"""
+    out = []
+    depth = 0
+    for ch in text:
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            out.append(ch)
+    return ''.join(out)
+
+
+class _PatternBuilder:
+    """Equality/range/order columns per table for one query or call site"""
+
+    def __init__(self):
+        self.columns = {}
+
+    def add(self, table, column, kind):
+        entry = self.columns.setdefault(table, {'equality': [], 'ranges': [], 'order': []})
+        if column not in entry[kind]:
+            entry[kind].append(column)
+
+    def patterns(self):
+        result = []
+        for table, entry in self.columns.items():
+            ranges = [c for c in entry['ranges'] if c not in entry['equality']]
+            result.append(AccessPattern(table, tuple(entry['equality']), tuple(ranges),
+                                        tuple(entry['order'])))
+        return result
+
+
+def patterns_from_sql(query, model):
+    """AccessPatterns of one SELECT/UPDATE/DELETE statement"""
+    text = normalize(query)
+    if not re.match(r'(select|update|delete|with)\b', text):
+        return []
+    aliases = {}
+    order = []
+    for m in SQL_TABLE_REF.finditer(text):
+        table = model.table(m.group(2))
+        if table is None:
+            continue
+        alias = m.group(3)
+        aliases[table.name.lower()] = table
+        if alias and alias not in NOT_ALIASES:
+            aliases[alias] = table
+        order.append(table)
+    if not order:
+        return []
+
+    def resolve(qualifier, column):
+        if qualifier:
+            table = aliases.get(qualifier)
+            candidates = [table] if table else []
+        else:
+            candidates = order
+        for table in candidates:
+            name = table.column(column)
+            if name:
+                return table.name, name
+        return None
+
+    builder = _PatternBuilder()
+
+    def add_conditions(clause, joined=None):
+        for term in _conjuncts(clause):
+            m = CONDITION.match(term)
+            if not m:
+                continue
+            qualifier, column, op, rhs = m.groups()
+            left = resolve(qualifier, column)
+            right_ref = COLUMN_REF.match(rhs.strip()) if op == '=' else None
+            right = resolve(*right_ref.groups()) if right_ref and rhs.strip() != '?' else None
+            if right:
+                # Join condition: the lookup happens on the joined side
+                for side in (left, right):
+                    if side and (joined is None or side[0] == joined):
+                        builder.add(side[0], side[1], 'equality')
+                continue
+            if left is None:
+                continue
+            if op in EQUALITY_OPS:
+                builder.add(left[0], left[1], 'equality')
+            elif op in RANGE_OPS:
+                builder.add(left[0], left[1], 'ranges')
+
+    for m in re.finditer(r'\bjoin ([\w$]+)(?: (?:as )?[\w$]+)? on ', text):
+        table = model.table(m.group(1))
+        clause = text[m.end():]
+        end = re.search(r'\b(?:left |right |inner |cross |straight_)?join\b|\bwhere\b', clause)
+        clause = clause[:end.start()] if end else clause
+        clause = clause[:CLAUSE_END.search(clause).start()]
+        add_conditions(clause, table.name if table else None)
+
+    where = re.search(r'\bwhere\b', text)
+    if where:
+        clause = text[where.end():]
+        add_conditions(clause[:CLAUSE_END.search(clause).start()])
+
+    order_by = re.search(r'\border by\b', text)
+    if order_by:
+        clause = text[order_by.end():]
+        clause = clause[:re.search(r'\b(?:limit|for update|lock in)\b|$', clause).start()]
+        for part in split_top_level(clause):
+            ref = COLUMN_REF.match(re.sub(r'\s+(?:asc|desc)$', '', part))
+            resolved = resolve(*ref.groups()) if ref else None
+            if resolved:
+                builder.add(resolved[0], resolved[1], 'order')
+    return builder.patterns()
+
+
+# Patterns from drizzle query builder calls
+
+CHAIN_START = re.compile(r'\.(from|update|delete)\(\s*(?:schema\.)?(\w+)\s*\)')
+COMPARISON = re.compile(
+    r'\b(eq|gt|gte|lt|lte|like|ilike|between|inArray|isNull)\(\s*(?:schema\.)?(\w+)\.(\w+)\s*(?:,\s*(?:schema\.)?(\w+)\.(\w+)\s*\))?')
+SQL_COMPARISON = re.compile(
+    r'\$\{(?:schema\.)?(\w+)\.(\w+)\}\s*(=|>=|<=|>|<|BETWEEN|LIKE|IN|IS NULL)', re.IGNORECASE)
+JOIN_CALL = re.compile(r'\.(?:inner|left|right|full)Join\(\s*(?:schema\.)?(\w+)\s*,')
+ORDER_CALL = re.compile(r'\.orderBy\(')
+WHERE_CALL = re.compile(r'\.where\(')
+ORDER_TERM = re.compile(r'^(?:(?:asc|desc)\()?\s*(?:schema\.)?(\w+)\.(\w+)\s*\)?$')
+COMPARISON_KIND = {'eq': 'equality', 'inArray': 'equality', 'isNull': 'equality', 'between': 'ranges',
+                   'gt': 'ranges', 'gte': 'ranges', 'lt': 'ranges', 'lte': 'ranges',
+                   'like': 'ranges', 'ilike': 'ranges'}
+
+
+def _call_args(text, open_paren):
+    """Text inside the call whose `(` is at `open_paren`"""
+    depth = 0
+    quote = None
+    for i in range(open_paren, len(text)):
+        ch = text[i]
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '\'"`':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                return text[open_paren + 1:i]
+    return text[open_paren + 1:]
+
+
+def _statement_end(text, start):
+    """End of the chained expression starting at `start`: `;` or a closing bracket at depth 0"""
+    depth = 0
+    quote = None
+    for i in range(start, len(text)):
+        ch = text[i]
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '\'"`':
+            quote = ch
+        elif ch in '([{':
+            depth += 1
+        elif ch in ')]}':
+            depth -= 1
+            if depth < 0:
+                return i
+        elif ch == ';' and depth == 0:
+            return i
+    return len(text)
+
+
+class SourceResolver:
+    """drizzle table variable / property -> (SQL table, canonical column) via schema.ts and the model"""
+
+    def __init__(self, schema, model):
+        self.schema = schema
+        self.model = model
+
+    def table(self, var):
+        table = self.schema.by_var.get(var)
+        return table.name if table and self.model.table(table.name) else None
+
+    def column(self, var, prop):
+        table = self.schema.by_var.get(var)
+        if table is None or prop not in table.by_prop:
+            return None
+        model_table = self.model.table(table.name)
+        name = model_table.column(table.by_prop[prop].name) if model_table else None
+        return (model_table.name, name) if name else None
+
+
+def patterns_from_source(text, resolver):
+    """[(line, AccessPattern)] for the drizzle query chains in one TypeScript file"""
+    found = []
+    previous_end = 0
+    for m in CHAIN_START.finditer(text):
+        table = resolver.table(m.group(2))
+        if table is None or m.start() < previous_end:
+            continue
+        end = _statement_end(text, m.end())
+        chain = text[m.start():end]
+        builder = _PatternBuilder()
+        builder.columns[table] = {'equality': [], 'ranges': [], 'order': []}
+
+        def add_comparisons(clause, joined=None):
+            for c in COMPARISON.finditer(clause):
+                left = resolver.column(c.group(2), c.group(3))
+                right = resolver.column(c.group(4), c.group(5)) if c.group(4) else None
+                if right:
+                    for side in (left, right):
+                        if side and side[0] == (joined or table):
+                            builder.add(side[0], side[1], 'equality')
+                elif left:
+                    builder.add(left[0], left[1], COMPARISON_KIND[c.group(1)])
+            for c in SQL_COMPARISON.finditer(clause):
+                left = resolver.column(c.group(1), c.group(2))
+                if left:
+                    op = c.group(3).upper()
+                    builder.add(left[0], left[1],
+                                'equality' if op in ('=', 'IN', 'IS NULL') else 'ranges')
+
+        for join in JOIN_CALL.finditer(chain):
+            joined = resolver.table(join.group(1))
+            if joined:
+                add_comparisons(_call_args(chain, chain.index('(', join.start())), joined)
+        for where in WHERE_CALL.finditer(chain):
+            clause = _call_args(chain, where.end() - 1)
+            if not (COMPARISON.search(clause) or SQL_COMPARISON.search(clause)):
+                # .where(whereClause) / .where(and(...conditions)): conditions built just before
+                clause = text[previous_end:m.start()]
+            add_comparisons(clause)
+        for order in ORDER_CALL.finditer(chain):
+            for part in split_top_level(_call_args(chain, order.end() - 1)):
+                term = ORDER_TERM.match(part.strip())
+                resolved = resolver.column(*term.groups()) if term else None
+                if resolved:
+                    builder.add(resolved[0], resolved[1], 'order')
+
+        line = text.count('\n', 0, m.start()) + 1
+        for pattern in builder.patterns():
+            if pattern.equality or pattern.ranges or pattern.order:
+                found.append((line, pattern))
+        previous_end = end
+    return found
+
+
+# Cost model
+
+def examined_rows(pattern, columns, unique, rows, primary_key=()):
+    """Estimated rows read for `pattern` through an index on `columns` (None: full scan)
+
+    InnoDB secondary indexes end with the primary key columns, so those count
+    for seeks and ordering after `columns`.
+    """
+    examined = float(rows)
+    sorted_by_index = False
+    if columns:
+        key_length = len(columns)
+        columns = tuple(columns) + tuple(c for c in primary_key if c not in columns)
+        matched = 0
+        position = 0
+        for position, column in enumerate(columns):
+            if column in pattern.equality:
+                examined *= EQ_SELECTIVITY
+                matched += 1
+            elif column in pattern.ranges:
+                examined *= RANGE_SELECTIVITY
+                position = len(columns)
+                break
+            else:
+                break
+        else:
+            position = len(columns)
+        if unique and matched >= key_length:
+            return 1.0
+        if pattern.order and matched == len(set(pattern.equality)):
+            rest = tuple(columns[matched:matched + len(pattern.order)])
+            sorted_by_index = rest == pattern.order
+        if not matched and not sorted_by_index and not (pattern.ranges and columns[0] in pattern.ranges):
+            examined = float(rows)
+    examined = max(examined, 1.0)
+    if pattern.order and not sorted_by_index:
+        examined *= 2
+    return examined
+
+
+def candidate_index(pattern):
+    """Equality columns, then either the ORDER BY columns or the first range column"""
+    equality = tuple(pattern.equality)
+    options = []
+    if pattern.order and not set(pattern.order) & set(equality):
+        options.append(equality + tuple(pattern.order))
+    if pattern.ranges:
+        options.append(equality + (pattern.ranges[0],))
+    options.append(equality)
+    return [columns for columns in options if columns]
+
+
+def advise(weighted_patterns, model, table_rows, default_rows=DEFAULT_ROWS):
+    """Ranked recommendations from [(weight, source, AccessPattern)]"""
+    candidates = {}
+    for weight, source, pattern in weighted_patterns:
+        table = model.table(pattern.table)
+        if table is None:
+            continue
+        rows = table_rows.get(table.name, default_rows)
+        primary_key = table.primary_key
+        existing = [(index.columns, index.unique) for index in table.indexes.values()]
+        current = min([examined_rows(pattern, None, False, rows)]
+                      + [examined_rows(pattern, columns, unique, rows, primary_key)
+                         for columns, unique in existing])
+        best = None
+        for columns in candidate_index(pattern):
+            cost = examined_rows(pattern, columns, False, rows, primary_key)
+            # Trailing primary key columns come for free
+            while (len(columns) > 1 and columns[-1] in primary_key
+                   and examined_rows(pattern, columns[:-1], False, rows, primary_key) <= cost):
+                columns = columns[:-1]
+            if best is None or cost < best[1]:
+                best = (columns, cost)
+        if best is None or best[1] >= current:
+            continue
+        columns, cost = best
+        if any(index_columns[:len(columns)] == columns for index_columns, _ in existing):
+            continue
+        entry = candidates.setdefault((table.name, columns), {
+            'table': table.name, 'columns': list(columns), 'rows': rows,
+            'weight': 0, 'benefit': 0.0, 'sources': {},
+        })
+        entry['weight'] += weight
+        entry['benefit'] += weight * (current - cost)
+        entry['sources'][source] = entry['sources'].get(source, 0) + weight
+
+    # An index on (a) is served by one on (a, b)
+    for key in sorted(candidates, key=lambda k: len(k[1])):
+        table, columns = key
+        wider = [other for other in candidates if other != key and other[0] == table
+                 and len(other[1]) > len(columns) and other[1][:len(columns)] == columns]
+        if wider:
+            target = candidates[max(wider, key=lambda k: candidates[k]['benefit'])]
+            entry = candidates.pop(key)
+            target['weight'] += entry['weight']
+            target['benefit'] += entry['benefit']
+            for source, count in entry['sources'].items():
+                target['sources'][source] = target['sources'].get(source, 0) + count
+
+    advice = sorted(candidates.values(), key=lambda entry: -entry['benefit'])
+    for entry in advice:
+        entry['benefit'] = round(entry['benefit'])
+        entry['sources'] = sorted(entry['sources'], key=lambda s: -entry['sources'][s])
+        entry['create'] = create_index_sql(entry['table'], entry['columns'])
+    return advice
+
+
+def create_index_sql(table, columns):
+    name = f"{table}_{'_'.join(columns)}_idx"
+    return f"CREATE INDEX `{name}` ON `{table}` ({', '.join('`' + c + '`' for c in columns)});"
+
+
+# Collection
+
+def collect(model, log_dir=DEFAULT_LOG_DIR, source_globs=SOURCE_GLOBS, code_weight=1, schema=None):
+    """[(weight, source, AccessPattern)] from query logs and server code"""
+    weighted = []
+    for record in iter_records(log_dir):
+        for pattern in patterns_from_sql(record.query, model):
+            weighted.append((1, 'log: ' + normalize(record.query)[:120], pattern))
+    if source_globs and code_weight:
+        resolver = SourceResolver(schema or load_schema(), model)
+        paths = sorted({path for pattern in source_globs for path in glob.glob(pattern)
+                        if not path.endswith('.test.ts')})
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            for line, pattern in patterns_from_source(text, resolver):
+                weighted.append((code_weight, f"{path}:{line}", pattern))
+    return weighted
+
+
+def dump_row_counts(dump_path):
+    reader = DumpReader(dump_path, typed=False)
+    for _ in reader:
+        pass
+    return dict(reader.row_counts)
+
+
+def print_advice(advice):
+    print(f"{'benefit':>10} {'weight':>6} {'rows':>7}  index")
+    for entry in advice:
+        print(f"{entry['benefit']:>10} {entry['weight']:>6} {entry['rows']:>7}  "
+              f"{entry['table']}({', '.join(entry['columns'])})")
+        for source in entry['sources'][:3]:
+            print(f"{'':>27}← {source}")
+        if len(entry['sources']) > 3:
+            print(f"{'':>27}  … {len(entry['sources']) - 3} more")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rank missing composite indexes")
+    parser.add_argument('--logs', default=DEFAULT_LOG_DIR, help='directory of db-query-*.json')
+    parser.add_argument('--source', nargs='*', default=SOURCE_GLOBS, help='TypeScript files/globs to scan')
+    parser.add_argument('--code-weight', type=int, default=1, help='weight of one call site in the code')
+    parser.add_argument('--dump', help='mysqldump to take table row counts from')
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help='row count for tables not in --dump')
+    parser.add_argument('--top', type=int, default=20, help='recommendations to show (0 for all)')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    model = compile_migrations()
+    weighted = collect(model, args.logs, args.source, args.code_weight)
+    table_rows = dump_row_counts(args.dump) if args.dump else {}
+    advice = advise(weighted, model, table_rows, args.rows)
+    if args.top:
+        advice = advice[:args.top]
+
+    if args.json:
+        print(json.dumps(advice, ensure_ascii=False, indent=2))
+        sys.exit(0)
+
+    print(f"📊 {len(weighted)} access patterns over {len(model.tables)} tables "
+          f"({sum(len(t.indexes) for t in model.tables.values())} indexes)\n")
+    print_advice(advice)
+    for entry in advice[:5]:
+        print(f"\n📝 {entry['create']}", end='')
+    print()
@@ -1,8 +1,6 @@
-# Read CRM.tsx
-with open('client/src/pages/CRM.tsx', 'r', encoding='utf-8') as f:
-    lines = f.readlines()
+from tsx_anchors import edit_file
 
-# Find line 169 (after sendMessageMutation closing brace)
+# Inserted after the sendMessageMutation declaration
 handlers = '''
   // Bulk operations mutations
   const bulkAssignMutation = trpc.crm.bulkAssignLeads.useMutation({
@@ -76,11 +74,11 @@ handlers = '''
 
 '''
 
-# Insert after line 169 (index 168)
-lines.insert(169, handlers)
+# Skipped if the handlers are already there, so re-running is safe
+batch = edit_file('client/src/pages/CRM.tsx', lambda batch: batch.insert_after(
+    'decl:CRM.sendMessageMutation', handlers, guard='const bulkAssignMutation'))
 
-# Write back
-with open('client/src/pages/CRM.tsx', 'w', encoding='utf-8') as f:
-    f.writelines(lines)
-
-print("✅ Inserted bulk handlers at line 170")
+if batch.edits:
+    print("✅ Inserted bulk handlers after sendMessageMutation")
+else:
+    print("⏭️  Bulk handlers already present")
@@ -0,0 +1,353 @@
+"""
+Linear-time JSX/TSX tag lexer with attribute-level edits.
+
+One left-to-right pass over a file finds every JSX opening tag together
+with its attributes. The lexer tracks JS strings, template literals
+(including `${...}` nesting), comments, regex literals, `{...}` expressions
+and JSX text, so `>` inside `{() => ...}` or an apostrophe in JSX text
+doesn't derail it.
+
+Edits are collected on an Editor and applied in one offset-sorted pass.
+Class edits are set-based: adding a class that's already present is a
+no-op, so codemods built on this are idempotent.
+"""
+import re
+from collections import namedtuple
+
+# kind: 'string' ("..." / '...'), 'expression' ({...}) or 'bool' (no value)
+Attribute = namedtuple('Attribute', 'name start end kind value value_start value_end')
+
+NAME_START = re.compile(r'[A-Za-z_$]')
+TAG_NAME = re.compile(r'[A-Za-z_$][\w$.:-]*')
+ATTR_NAME = re.compile(r'[A-Za-z_$][\w$:-]*')
+WHITESPACE = re.compile(r'\s*')
+JSX_TEXT = re.compile(r'[^<{]*')
+WORD_BEFORE = re.compile(r'(\w+)\s*$')
+
+# A `<` starts JSX (rather than a comparison or type argument) after these
+PRECEDES_JSX = set('(,=:[!&|?{};>') | {''}
+KEYWORDS_BEFORE_JSX = {'return', 'default', 'case', 'yield', 'await', 'else'}
+# ...unless it opens the type parameters of a generic arrow: `= <K extends X>(` or `<T,>(`
+TYPE_PARAMETERS = re.compile(r'<\s*[A-Za-z_$][\w$]*\s*(?:extends\b|,)')
+
+# A `/` starts a regex literal (rather than division) after these
+PRECEDES_REGEX = set('(,=:[!&|?{};+-*%<>~^') | {''}
+# ...except after a TypeScript non-null assertion (`x! / y`): a `!` that
+# follows an operand, unless that operand is one of these keywords
+KEYWORDS_BEFORE_EXPRESSION = KEYWORDS_BEFORE_JSX | {'typeof', 'void', 'delete', 'in', 'of', 'instanceof',
+                                                    'throw', 'new'}
+
+
+class Tag:
+    """A JSX opening tag: `<Name attr="..." {...spread} />`"""
+
+    def __init__(self, name, start, end, name_end, attributes, self_closing):
+        self.name = name
+        self.start = start            # offset of '<'
+        self.end = end                # offset just past '>'
+        self.name_end = name_end      # offset just past the tag name
+        self.element_end = end        # offset just past the closing tag
+        self.attributes = attributes
+        self.self_closing = self_closing
+
+    def attribute(self, name):
+        for attr in self.attributes:
+            if attr.name == name:
+                return attr
+        return None
+
+    def classes(self):
+        """Classes of a string className, [] if absent, None if it's an expression"""
+        attr = self.attribute('className')
+        if attr is None:
+            return []
+        if attr.kind != 'string':
+            return None
+        return attr.value.split()
+
+    def __repr__(self):
+        return f"Tag({self.name!r}, {self.start}, {self.end})"
+
+
+class JSXLexer:
+    """Recursive-descent scanner over JS code, JSX elements and JSX text"""
+
+    def __init__(self, content):
+        self.content = content
+        self.n = len(content)
+        self.tags = []
+
+    def lex(self):
+        self.scan_js(0, stop_at_brace=False)
+        self.tags.sort(key=lambda tag: tag.start)
+        return self.tags
+
+    def previous_index(self, i):
+        """Offset of the last non-whitespace character before `i` (-1 at start of file)"""
+        j = i - 1
+        while j >= 0 and self.content[j].isspace():
+            j -= 1
+        return j
+
+    def previous_token(self, i):
+        """Last non-whitespace character before `i` ('' at start of file)"""
+        j = self.previous_index(i)
+        return self.content[j] if j >= 0 else ''
+
+    def jsx_can_start(self, i):
+        if i + 1 >= self.n:
+            return False
+        nxt = self.content[i + 1]
+        if not (NAME_START.match(nxt) or nxt == '>'):
+            return False
+        if TYPE_PARAMETERS.match(self.content, i):
+            return False
+        prev = self.previous_token(i)
+        if prev in PRECEDES_JSX:
+            return True
+        m = WORD_BEFORE.search(self.content, max(0, i - 16), i)
+        return bool(m and m.group(1) in KEYWORDS_BEFORE_JSX)
+
+    def regex_can_start(self, i):
+        """Whether the `/` at `i` starts a regex literal rather than a division"""
+        j = self.previous_index(i)
+        prev = self.content[j] if j >= 0 else ''
+        if prev != '!':
+            return prev in PRECEDES_REGEX
+        before = self.previous_token(j)
+        if before in (')', ']'):
+            return False
+        if not before or not (before.isalnum() or before in '_$'):
+            return True
+        m = WORD_BEFORE.search(self.content, max(0, j - 16), j)
+        return bool(m and m.group(1) in KEYWORDS_BEFORE_EXPRESSION)
+
+    def skip_string(self, i):
+        quote = self.content[i]
+        i += 1
+        while i < self.n:
+            ch = self.content[i]
+            if ch == '\\':
+                i += 2
+                continue
+            if ch == quote or ch == '\n':
+                return i + 1
+            i += 1
+        return self.n
+
+    def skip_template(self, i):
+        i += 1
+        while i < self.n:
+            ch = self.content[i]
+            if ch == '\\':
+                i += 2
+            elif ch == '`':
+                return i + 1
+            elif ch == '$' and self.content.startswith('{', i + 1):
+                i = self.scan_js(i + 2, stop_at_brace=True) + 1
+            else:
+                i += 1
+        return self.n
+
+    def skip_regex(self, i):
+        i += 1
+        in_class = False
+        while i < self.n:
+            ch = self.content[i]
+            if ch == '\\':
+                i += 2
+                continue
+            if ch == '\n':
+                return i
+            if in_class:
+                in_class = ch != ']'
+            elif ch == '[':
+                in_class = True
+            elif ch == '/':
+                return i + 1
+            i += 1
+        return self.n
+
+    def scan_js(self, i, stop_at_brace):
+        """Scan JS code; with stop_at_brace, return the offset of the unmatched `}`"""
+        content = self.content
+        depth = 0
+        while i < self.n:
+            ch = content[i]
+            if ch in '"\'':
+                i = self.skip_string(i)
+            elif ch == '`':
+                i = self.skip_template(i)
+            elif ch == '/' and content.startswith('//', i):
+                end = content.find('\n', i)
+                i = self.n if end < 0 else end
+            elif ch == '/' and content.startswith('/*', i):
+                end = content.find('*/', i + 2)
+                i = self.n if end < 0 else end + 2
+            elif ch == '/' and self.regex_can_start(i):
+                i = self.skip_regex(i)
+            elif ch == '{':
+                depth += 1
+                i += 1
+            elif ch == '}':
+                if depth == 0 and stop_at_brace:
+                    return i
+                depth -= 1
+                i += 1
+            elif ch == '<' and self.jsx_can_start(i):
+                i = self.parse_element(i)
+            else:
+                i += 1
+        return self.n
+
+    def parse_element(self, i):
+        """Parse `<Tag ...>children</Tag>` or `<Tag />` starting at `<`; return end"""
+        content = self.content
+        start = i
+        i += 1
+        if content.startswith('>', i):
+            # Fragment <>...</>
+            return self.parse_children(i + 1)
+
+        m = TAG_NAME.match(content, i)
+        name = m.group()
+        name_end = m.end()
+        i = name_end
+        attributes = []
+        while i < self.n:
+            i = WHITESPACE.match(content, i).end()
+            if i >= self.n:
+                break
+            ch = content[i]
+            if content.startswith('/>', i):
+                self.tags.append(Tag(name, start, i + 2, name_end, attributes, True))
+                return i + 2
+            if ch == '>':
+                tag = Tag(name, start, i + 1, name_end, attributes, False)
+                self.tags.append(tag)
+                tag.element_end = self.parse_children(i + 1)
+                return tag.element_end
+            if ch == '{':
+                # {...spread}
+                i = self.scan_js(i + 1, stop_at_brace=True) + 1
+                continue
+            if ch == '<':
+                # TS generic on a component, e.g. <Select<string> ...>
+                i = content.find('>', i) + 1 or self.n
+                continue
+
+            m = ATTR_NAME.match(content, i)
+            if not m:
+                i += 1
+                continue
+            attr_name = m.group()
+            attr_start = i
+            i = WHITESPACE.match(content, m.end()).end()
+            if not content.startswith('=', i):
+                attributes.append(Attribute(attr_name, attr_start, m.end(), 'bool', None, None, None))
+                continue
+            i = WHITESPACE.match(content, i + 1).end()
+            if i < self.n and content[i] in '"\'':
+                end = content.find(content[i], i + 1)
+                end = self.n - 1 if end < 0 else end
+                attributes.append(Attribute(attr_name, attr_start, end + 1, 'string',
+                                            content[i + 1:end], i + 1, end))
+                i = end + 1
+            elif content.startswith('{', i):
+                end = self.scan_js(i + 1, stop_at_brace=True)
+                attributes.append(Attribute(attr_name, attr_start, end + 1, 'expression',
+                                            content[i + 1:end], i + 1, end))
+                i = end + 1
+            elif content.startswith('<', i):
+                # JSX element as attribute value
+                end = self.parse_element(i)
+                attributes.append(Attribute(attr_name, attr_start, end, 'expression',
+                                            content[i:end], i, end))
+                i = end
+        return self.n
+
+    def parse_children(self, i):
+        """Parse JSX children up to and including the matching closing tag"""
+        content = self.content
+        while i < self.n:
+            i = JSX_TEXT.match(content, i).end()
+            if i >= self.n:
+                break
+            if content[i] == '{':
+                i = self.scan_js(i + 1, stop_at_brace=True) + 1
+            elif content.startswith('</', i):
+                end = content.find('>', i)
+                return self.n if end < 0 else end + 1
+            elif i + 1 < self.n and (NAME_START.match(content[i + 1]) or content[i + 1] == '>'):
+                i = self.parse_element(i)
+            else:
+                i += 1
+        return self.n
+
+
+def iter_tags(content, names=None):
+    """All JSX opening tags in `content`, optionally filtered by tag name"""
+    tags = JSXLexer(content).lex()
+    if names is None:
+        return tags
+    names = set(names)
+    return [tag for tag in tags if tag.name in names]
+
+
+class Editor:
+    """Batches attribute edits and applies them in one offset-sorted pass"""
+
+    def __init__(self, content):
+        self.content = content
+        self.edits = []
+
+    def replace(self, start, end, text):
+        self.edits.append((start, end, text))
+
+    def set_attribute(self, tag, name, value):
+        """Set a string attribute, replacing an existing one or adding it after the tag name"""
+        attr = tag.attribute(name)
+        if attr is None:
+            self.replace(tag.name_end, tag.name_end, f' {name}="{value}"')
+        elif attr.kind != 'string' or attr.value != value:
+            self.replace(attr.start, attr.end, f'{name}="{value}"')
+
+    def remove_attribute(self, tag, name):
+        attr = tag.attribute(name)
+        if attr is not None:
+            start = attr.start
+            while start > 0 and self.content[start - 1] in ' \t':
+                start -= 1
+            self.replace(start, attr.end, '')
+
+    def add_classes(self, tag, classes):
+        """Add classes to a string className; returns False if className is an expression"""
+        current = tag.classes()
+        if current is None:
+            return False
+        missing = [cls for cls in classes if cls not in current]
+        if missing:
+            self.set_attribute(tag, 'className', ' '.join(current + missing))
+        return True
+
+    def remove_classes(self, tag, classes):
+        current = tag.classes()
+        if current is None:
+            return False
+        remaining = [cls for cls in current if cls not in set(classes)]
+        if remaining != current:
+            self.set_attribute(tag, 'className', ' '.join(remaining))
+        return True
+
+    def apply(self):
+        """Return the edited content; overlapping edits keep the first one"""
+        parts = []
+        last = 0
+        for start, end, text in sorted(self.edits, key=lambda e: (e[0], e[1])):
+            if start < last:
+                continue
+            parts.append(self.content[last:start])
+            parts.append(text)
+            last = end
+        parts.append(self.content[last:])
+        return ''.join(parts)
@@ -0,0 +1,362 @@
+"""
+Batch re-scoring of the leads table with the rules of server/leadScoring.ts.
+
+calculateLeadScore() scores one lead at a time. This applies the same rules
+column by column over a whole dump or columnar snapshot and writes the
+changed scores as bulk UPDATE statements:
+
+    python lead_rescore.py database_COMPLETE_WITH_ALL_DATA.sql -o rescore.sql
+    python lead_rescore.py snapshot/ -o rescore.sql     # columnar_snapshot directory
+    python lead_rescore.py --synthetic 2000000          # throughput check
+    python lead_rescore.py --parity                     # check against the TS fixtures
+
+Every factor column is dictionary-encoded (codes per row + distinct values),
+so the regex flags, keyword counts and JSON answer counts are computed once
+per distinct value, and the per-row work is table lookups and additions
+over bytearrays. Snapshot varchar columns are already dictionary-encoded;
+dump rows are encoded while they stream.
+
+Parity: server/fixtures/leadScoring.parity.json holds inputs with the
+scores calculateLeadScore() gives them (server/leadScoring.parity.test.ts
+checks and regenerates the expected scores on the TS side). Edge cases
+follow JavaScript: JSON.parse/Object.keys semantics for `answers`, the JS
+\\s class for keyword splitting and ASCII-only case folding for /i.
+"""
+import argparse
+import array
+import json
+import os
+import random
+import re
+import sys
+import time
+from operator import add
+
+from columnar_snapshot import Snapshot
+from sql_dump import DumpReader
+
+DEFAULT_FIXTURES = 'server/fixtures/leadScoring.parity.json'
+TABLE = 'leads'
+FACTORS = ('answers', 'email', 'telegram', 'utmCampaign', 'utmKeyword', 'utmSource')
+UPDATE_BATCH = 10000
+
+# Rules of server/leadScoring.ts
+BASE_POINTS = 20
+EMAIL_POINTS = 15
+TELEGRAM_POINTS = 15
+INVALID_ANSWERS_POINTS = 5
+ANSWER_TIERS = [(5, 30), (3, 20), (1, 10)]          # (min answers, points)
+KEYWORD_TIERS = [(3, 5), (2, 3), (1, 1)]            # (min words, points)
+BRANDED = re.compile(r'brand|trademark|company|official', re.IGNORECASE | re.ASCII)
+PAID = re.compile(r'google|facebook|instagram|linkedin|paid', re.IGNORECASE | re.ASCII)
+# JavaScript's \s (ES2016+): no \x1c-\x1f or \x85, unlike Python's
+JS_WHITESPACE = re.compile('[\t\n\x0b\x0c\r \xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff]+')
+MAX_SCORE = 100
+CAP = bytes(min(i, MAX_SCORE) for i in range(256))
+
+BADGES = [(80, 'green'), (60, 'yellow'), (40, 'orange'), (0, 'red')]
+
+
+# Per-value rules
+
+def _truthy(value):
+    return bool(value)
+
+
+def _reject_constant(name):
+    raise ValueError(f"{name} is not JSON")
+
+
+def answer_count(answers):
+    """Object.keys(JSON.parse(answers)).length; ValueError where JS would throw"""
+    if isinstance(answers, bytes):
+        answers = answers.decode('utf-8', 'surrogatepass')
+    if answers is None:
+        raise ValueError("null answers")
+    parsed = json.loads(str(answers), parse_constant=_reject_constant)
+    if parsed is None:
+        raise ValueError("Object.keys(null)")
+    if isinstance(parsed, (dict, list)):
+        return len(parsed)
+    if isinstance(parsed, str):
+        return len(parsed.encode('utf-16-le', 'surrogatepass')) // 2
+    return 0
+
+
+def answers_points(answers):
+    try:
+        count = answer_count(answers)
+    except ValueError:
+        return INVALID_ANSWERS_POINTS
+    return next((points for minimum, points in ANSWER_TIERS if count >= minimum), 0)
+
+
+def email_points(email):
+    return EMAIL_POINTS if _truthy(email) else 0
+
+
+def telegram_points(telegram):
+    return TELEGRAM_POINTS if _truthy(telegram) else 0
+
+
+def campaign_points(campaign):
+    if not _truthy(campaign):
+        return 0
+    return 10 if BRANDED.search(str(campaign)) else 5
+
+
+def keyword_points(keyword):
+    if not _truthy(keyword):
+        return 0
+    words = len(JS_WHITESPACE.split(str(keyword)))
+    return next(points for minimum, points in KEYWORD_TIERS if words >= minimum)
+
+
+def source_points(source):
+    if not _truthy(source):
+        return 0
+    return 5 if PAID.search(str(source)) else 2
+
+
+FACTOR_POINTS = {
+    'answers': answers_points,
+    'email': email_points,
+    'telegram': telegram_points,
+    'utmCampaign': campaign_points,
+    'utmKeyword': keyword_points,
+    'utmSource': source_points,
+}
+
+
+def score_lead(lead):
+    """calculateLeadScore() for one lead dict"""
+    score = BASE_POINTS + sum(points(lead.get(name)) for name, points in FACTOR_POINTS.items())
+    return min(score, MAX_SCORE)
+
+
+def badge(score):
+    """getScoreBadgeColor()"""
+    return next(color for minimum, color in BADGES if score >= minimum)
+
+
+# Columns
+
+class DictColumn:
+    """Row codes into a list of distinct values; code -1 is NULL"""
+
+    def __init__(self, codes=None, values=None):
+        self.codes = codes if codes is not None else array.array('i')
+        self.values = values if values is not None else []
+        self._index = None
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+            return
+        if self._index is None:
+            self._index = {v: i for i, v in enumerate(self.values)}
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def points(self, rule):
+        """Points per row as a bytearray; the rule runs once per distinct value"""
+        lookup = [rule(value) for value in self.values] + [rule(None)]
+        return bytearray(map(lookup.__getitem__, self.codes))
+
+
+class LeadColumns:
+    """ids, current leadScore and the factor columns of a leads table"""
+
+    def __init__(self, ids, columns, current=None):
+        self.ids = ids
+        self.columns = columns
+        self.current = current      # array of scores, -1 for NULL; None if unknown
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """From dicts with id, leadScore and the factor fields"""
+        ids = array.array('q')
+        current = array.array('h')
+        columns = {name: DictColumn() for name in FACTORS}
+        for row in rows:
+            ids.append(row['id'])
+            score = row.get('leadScore')
+            current.append(-1 if score is None else int(score))
+            for name in FACTORS:
+                columns[name].append(row.get(name))
+        return cls(ids, columns, current)
+
+    @classmethod
+    def from_dump(cls, path, table=TABLE):
+        reader = DumpReader(path, tables=[table], typed=False)
+
+        def rows():
+            for _, row in reader:
+                yield dict(zip(reader.columns[table], row))
+
+        return cls.from_rows(rows())
+
+    @classmethod
+    def from_snapshot(cls, path, table=TABLE):
+        snapshot = Snapshot(path)
+        ids = array.array('q', snapshot.column(table, 'id'))
+        columns = {}
+        for name in FACTORS:
+            info = snapshot.info(table, name)
+            if info['encoding'] == 'dict':
+                columns[name] = DictColumn(array.array('i', snapshot.column(table, name)),
+                                           snapshot.dictionary(table, name))
+            elif info['encoding'] == 'utf8':
+                # Encode the text blob once, keyed by the raw bytes
+                column = DictColumn()
+                offsets = snapshot.column(table, name)
+                valid = snapshot.valid(table, name)
+                with open(os.path.join(path, table, info['files']['data']), 'rb') as f:
+                    data = f.read()
+                for i in range(len(offsets) - 1):
+                    column.append(None if valid is not None and not valid[i]
+                                  else data[offsets[i]:offsets[i + 1]])
+                columns[name] = column
+            else:
+                columns[name] = DictColumn()
+                for value in snapshot.values(table, name):
+                    columns[name].append(value)
+        current = None
+        try:
+            scores = snapshot.column(table, 'leadScore')
+            valid = snapshot.valid(table, 'leadScore')
+            current = array.array('h', (v if valid is None or valid[i] else -1 for i, v in enumerate(scores)))
+        except KeyError:
+            pass
+        snapshot.close()
+        return cls(ids, columns, current)
+
+
+def score_columns(leads):
+    """New scores for every row, as bytes"""
+    total = bytearray([BASE_POINTS]) * len(leads)
+    for name, rule in FACTOR_POINTS.items():
+        total = bytearray(map(add, total, leads.columns[name].points(rule)))
+    return total.translate(CAP)
+
+
+def changed_rows(leads, scores):
+    """Row indexes whose stored leadScore differs from the new score"""
+    if leads.current is None:
+        return range(len(scores))
+    return [i for i, (old, new) in enumerate(zip(leads.current, scores)) if old != new]
+
+
+def write_updates(path, leads, scores, rows, table=TABLE, batch=UPDATE_BATCH):
+    """One UPDATE ... WHERE id IN (...) per score value and batch of ids; returns statements"""
+    by_score = {}
+    for i in rows:
+        by_score.setdefault(scores[i], []).append(leads.ids[i])
+    statements = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"-- lead_rescore.py: {len(rows)} leads re-scored\n")
+        for score in sorted(by_score):
+            ids = sorted(by_score[score])
+            for start in range(0, len(ids), batch):
+                chunk = ids[start:start + batch]
+                f.write(f"UPDATE `{table}` SET `leadScore` = {score} WHERE `id` IN "
+                        f"({','.join(map(str, chunk))});\n")
+                statements += 1
+    return statements
+
+
+# Checks
+
+def check_parity(path=DEFAULT_FIXTURES):
+    """Mismatches between the fixtures' TS scores and both Python paths"""
+    with open(path, 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)
+    leads = LeadColumns.from_rows(dict(fixture['input'], id=i) for i, fixture in enumerate(fixtures))
+    batch = score_columns(leads)
+    mismatches = []
+    for i, fixture in enumerate(fixtures):
+        single = score_lead(fixture['input'])
+        if single != fixture['score'] or batch[i] != fixture['score']:
+            mismatches.append((i, fixture['input'], fixture['score'], single, batch[i]))
+    return fixtures, mismatches
+
+
+def synthetic_leads(n, seed=0):
+    """Leads with the value spread of real traffic: few distinct UTM values, repeated answer sets"""
+    rng = random.Random(seed)
+    campaigns = [None, '', 'brand_search', 'spring_sale', 'Official-store', 'retarget_30d', 'lookalike']
+    keywords = [None, 'quiz', 'online quiz', 'buy quiz funnel builder', 'marketing']
+    sources = [None, 'google', 'facebook', 'instagram', 'tiktok', 'email', 'paid_social']
+    answer_sets = [json.dumps({f"q{j}": f"a{k}" for j in range(count)}) for count in range(8)
+                   for k in range(50)] + ['', 'not json']
+
+    def rows():
+        for i in range(n):
+            yield {
+                'id': i + 1,
+                'leadScore': rng.randrange(0, 101),
+                'answers': rng.choice(answer_sets),
+                'email': f"lead{i}@example.com" if rng.random() < 0.6 else None,
+                'telegram': f"@lead{i}" if rng.random() < 0.4 else None,
+                'utmCampaign': rng.choice(campaigns),
+                'utmKeyword': rng.choice(keywords),
+                'utmSource': rng.choice(sources),
+            }
+
+    return LeadColumns.from_rows(rows())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Re-score leads in bulk with the leadScoring.ts rules")
+    parser.add_argument('source', nargs='?', help='mysqldump file or columnar snapshot directory')
+    parser.add_argument('-o', '--output', help='write UPDATE statements for changed scores here')
+    parser.add_argument('--all', action='store_true', help='update every lead, not only changed scores')
+    parser.add_argument('--table', default=TABLE)
+    parser.add_argument('--parity', nargs='?', const=DEFAULT_FIXTURES, metavar='FIXTURES',
+                        help='check against calculateLeadScore() fixtures')
+    parser.add_argument('--synthetic', type=int, metavar='N', help='score N generated leads')
+    args = parser.parse_args()
+
+    if args.parity:
+        fixtures, mismatches = check_parity(args.parity)
+        for i, lead, expected, single, batch in mismatches[:20]:
+            print(f"❌ case {i}: expected {expected}, score_lead {single}, batch {batch}: "
+                  f"{json.dumps(lead, ensure_ascii=False)}")
+        if mismatches:
+            print(f"❌ {len(mismatches)} of {len(fixtures)} fixtures differ")
+            sys.exit(1)
+        print(f"✅ {len(fixtures)} fixtures match calculateLeadScore()")
+        sys.exit(0)
+
+    if not args.source and not args.synthetic:
+        parser.error('give a dump, a snapshot directory, --synthetic N or --parity')
+
+    started = time.perf_counter()
+    if args.synthetic:
+        leads = synthetic_leads(args.synthetic)
+    elif os.path.isdir(args.source):
+        leads = LeadColumns.from_snapshot(args.source, args.table)
+    else:
+        leads = LeadColumns.from_dump(args.source, args.table)
+    loaded = time.perf_counter()
+    scores = score_columns(leads)
+    scored = time.perf_counter()
+
+    rows = range(len(scores)) if args.all else changed_rows(leads, scores)
+    per_minute = len(leads) / (scored - loaded) * 60 if scored > loaded else 0
+    print(f"✅ Scored {len(leads)} leads in {scored - loaded:.3f}s ({per_minute / 1e6:.1f}M leads/min), "
+          f"loaded in {loaded - started:.3f}s")
+    counts = {}
+    for score in range(MAX_SCORE + 1):
+        counts[badge(score)] = counts.get(badge(score), 0) + scores.count(score)
+    print("   " + ', '.join(f"{color}: {counts.get(color, 0)}" for _, color in BADGES))
+    print(f"📝 {len(rows)} scores {'to write' if args.all else 'changed'}")
+    if args.output:
+        statements = write_updates(args.output, leads, scores, rows, args.table)
+        print(f"📦 {statements} UPDATE statements → {args.output}")
@@ -0,0 +1,244 @@
+"""
+Per-route locale bundle splitter for lazy i18next loading.
+
+Reads the routes in client/src/App.tsx, follows each page's imports to find
+every file it renders, and uses the translation usage index to split the
+locale trees into:
+
+  core       keys used by the app shell or by many routes
+  <Page>     keys used only by one page component (one chunk per language)
+  rest       keys no file references statically or dynamically
+
+Chunks keep the original nested key paths, so a lazy backend can merge them
+into the single `translation` namespace with addResourceBundle(lng,
+'translation', chunk, true, true). The manifest maps each route to the
+chunks it needs; file names carry a content hash for long-term caching.
+
+    python locale_bundles.py [--out client/public/locales] [--shared-threshold 4]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+
+from locale_index import LANGUAGES, flatten
+from locale_store import LocaleStore
+from translation_usage import UsageIndex
+
+SRC_DIR = 'client/src'
+APP_FILE = 'client/src/App.tsx'
+SHELL_ENTRY = 'client/src/main.tsx'
+DEFAULT_OUT_DIR = 'client/public/locales'
+
+CORE_NAMESPACE = 'core'
+REST_NAMESPACE = 'rest'
+
+IMPORT = re.compile(r"""(?:import|export)\s+(?:[^'";]*?\s+from\s+)?['"]([^'"]+)['"]""")
+DYNAMIC_IMPORT = re.compile(r"""import\(\s*['"]([^'"]+)['"]\s*\)""")
+DEFAULT_IMPORT = re.compile(r"""import\s+(\w+)\s+from\s+['"]([^'"]+)['"]""")
+NAMED_IMPORT = re.compile(r"""import\s+\{([^}]*)\}\s+from\s+['"]([^'"]+)['"]""")
+ROUTE = re.compile(r"""<Route\s+(?:path=\{?["']([^"']+)["']\}?\s+)?component=\{(\w+)\}""")
+
+EXTENSIONS = ['.tsx', '.ts', '/index.tsx', '/index.ts']
+
+
+def resolve_import(spec, from_file):
+    """Resolve a relative or `@/` import to a file under client/src, or None"""
+    if spec.startswith('@/'):
+        base = os.path.join(SRC_DIR, spec[2:])
+    elif spec.startswith('.'):
+        base = os.path.join(os.path.dirname(from_file), spec)
+    else:
+        return None
+    base = os.path.normpath(base)
+    if os.path.isfile(base):
+        return base
+    for ext in EXTENSIONS:
+        if os.path.isfile(base + ext):
+            return os.path.normpath(base + ext)
+    return None
+
+
+class ImportGraph:
+    """Lazily parsed file -> imported files map"""
+
+    def __init__(self):
+        self.edges = {}
+
+    def imports(self, file_path):
+        if file_path not in self.edges:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            specs = IMPORT.findall(content) + DYNAMIC_IMPORT.findall(content)
+            resolved = (resolve_import(spec, file_path) for spec in specs)
+            self.edges[file_path] = sorted({path for path in resolved if path})
+        return self.edges[file_path]
+
+    def closure(self, roots, stop=()):
+        """Every file reachable from `roots` without entering `stop`"""
+        seen = set()
+        stack = [root for root in roots if root not in stop]
+        while stack:
+            file_path = stack.pop()
+            if file_path in seen:
+                continue
+            seen.add(file_path)
+            stack.extend(p for p in self.imports(file_path) if p not in seen and p not in stop)
+        return seen
+
+
+def parse_routes(app_file=APP_FILE):
+    """Return ([(path, component)], {component: file}) from App.tsx"""
+    with open(app_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    components = {}
+    for name, spec in DEFAULT_IMPORT.findall(content):
+        components[name] = resolve_import(spec, app_file)
+    for names, spec in NAMED_IMPORT.findall(content):
+        for name in names.split(','):
+            name = name.split(' as ')[-1].strip()
+            if name:
+                components[name] = resolve_import(spec, app_file)
+
+    routes = [(path or '*', component) for path, component in ROUTE.findall(content)]
+    return routes, components
+
+
+def unflatten(items):
+    tree = {}
+    for key, value in items:
+        node = tree
+        *sections, leaf = key.split('.')
+        for section in sections:
+            node = node.setdefault(section, {})
+        node[leaf] = value
+    return tree
+
+
+def keys_used_by(files, index, defined):
+    """Defined keys referenced by any of `files`, including dynamic patterns"""
+    keys = set()
+    patterns = []
+    for file_path in files:
+        entry = index.files.get(file_path)
+        if not entry:
+            continue
+        keys.update(key for key, _ in entry['static'])
+        patterns.extend(pattern for pattern, _ in entry['dynamic'])
+    if patterns:
+        dynamic = re.compile('|'.join(f'(?:{p})' for p in patterns))
+        keys.update(key for key in defined if dynamic.fullmatch(key))
+    # A static key may name a whole section
+    sections = {key for key in keys if key not in defined}
+    if sections:
+        keys.update(key for key in defined if any(key.startswith(s + '.') for s in sections))
+    return keys & defined
+
+
+def plan_bundles(shared_threshold=4):
+    """Assign every defined key to core, one or more page chunks, or rest"""
+    index = UsageIndex()
+    index.update()
+    trees = LocaleStore().trees
+    defined = set()
+    for lang in LANGUAGES:
+        defined.update(key for key, _ in flatten(trees[lang]))
+
+    routes, components = parse_routes()
+    page_files = {name: path for name, path in components.items()
+                  if path and any(component == name for _, component in routes)}
+
+    graph = ImportGraph()
+    shell_files = graph.closure([SHELL_ENTRY, APP_FILE], stop=set(page_files.values()))
+    shell_keys = keys_used_by(shell_files, index, defined)
+
+    page_keys = {}
+    for name, path in page_files.items():
+        files = graph.closure([path]) - shell_files
+        page_keys[name] = keys_used_by(files, index, defined) - shell_keys
+
+    users = {}
+    for name, keys in page_keys.items():
+        for key in keys:
+            users.setdefault(key, set()).add(name)
+
+    core = set(shell_keys)
+    core.update(key for key, pages in users.items() if len(pages) >= shared_threshold)
+    chunks = {name: keys - core for name, keys in page_keys.items()}
+    chunks = {name: keys for name, keys in chunks.items() if keys}
+    used = core.union(*chunks.values())
+    rest = defined - used
+
+    return {
+        'routes': [(path, [CORE_NAMESPACE] + ([component] if component in chunks else []))
+                   for path, component in routes],
+        'trees': trees,
+        'namespaces': {CORE_NAMESPACE: core, **chunks, REST_NAMESPACE: rest},
+    }
+
+
+def write_bundles(plan, out_dir=DEFAULT_OUT_DIR):
+    """Write per-language chunk files and manifest.json; returns the manifest"""
+    manifest = {
+        'version': 1,
+        'languages': list(LANGUAGES),
+        'namespace': 'translation',
+        'core': CORE_NAMESPACE,
+        'fallback': REST_NAMESPACE,
+        'routes': [{'path': path, 'chunks': names} for path, names in plan['routes']],
+        'chunks': {},
+    }
+
+    # Drop chunks from earlier runs; their hashed names are no longer referenced
+    for lang in LANGUAGES:
+        lang_dir = os.path.join(out_dir, lang)
+        if os.path.isdir(lang_dir):
+            for name in os.listdir(lang_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(lang_dir, name))
+
+    values = {lang: dict(flatten(plan['trees'][lang])) for lang in LANGUAGES}
+    for name, keys in plan['namespaces'].items():
+        entry = {'keys': len(keys), 'files': {}, 'bytes': {}}
+        for lang in LANGUAGES:
+            tree = unflatten((key, values[lang][key]) for key in sorted(keys) if key in values[lang])
+            data = json.dumps(tree, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()[:8]
+            rel_path = f"{lang}/{name}.{digest}.json"
+            os.makedirs(os.path.join(out_dir, lang), exist_ok=True)
+            with open(os.path.join(out_dir, rel_path), 'wb') as f:
+                f.write(data)
+            entry['files'][lang] = rel_path
+            entry['bytes'][lang] = len(data)
+        manifest['chunks'][name] = entry
+
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    return manifest
+
+
+def first_load_bytes(manifest, path, lang='en'):
+    """Bytes a visitor downloads for the first route matching `path`"""
+    route = next(route for route in manifest['routes'] if route['path'] == path)
+    return sum(manifest['chunks'][name]['bytes'][lang] for name in route['chunks'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Split locale files into per-route chunks")
+    parser.add_argument('--out', default=DEFAULT_OUT_DIR, help='output directory')
+    parser.add_argument('--shared-threshold', type=int, default=4,
+                        help='move keys used by at least this many pages into core')
+    args = parser.parse_args()
+
+    plan = plan_bundles(args.shared_threshold)
+    manifest = write_bundles(plan, args.out)
+
+    full = sum(entry['bytes']['en'] for entry in manifest['chunks'].values())
+    print(f"✅ Wrote {len(manifest['chunks'])} chunks x {len(LANGUAGES)} languages to {args.out}")
+    print(f"   core: {manifest['chunks'][CORE_NAMESPACE]['keys']} keys, "
+          f"rest: {manifest['chunks'][REST_NAMESPACE]['keys']} keys")
+    for path in ('/', '/quiz/:slug', '/crm'):
+        print(f"   {path}: {first_load_bytes(manifest, path)} bytes (en) vs {full} for all keys")
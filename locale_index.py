@@ -0,0 +1,52 @@
+"""
+Flattened (uk, ru, en) -> key index over the nested locale trees.
+
+Built once per run from the uk/ru/en trees, so resolving a legacy
+`t('uk', 'ru', 'en')` call to an existing dotted key is a dict lookup
+instead of a scan, and nested sections (`crm.*`, `editLead.*`, ...) are
+searched as well as top-level strings.
+"""
+
+LANGUAGES = ('uk', 'ru', 'en')
+
+
+def flatten(tree, prefix=''):
+    """Yield (dotted_key, value) for every string leaf of a locale tree"""
+    for key, value in tree.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from flatten(value, path)
+        elif isinstance(value, str):
+            yield path, value
+
+
+class LocaleIndex:
+    """Hash map from (uk, ru, en) triples to keys"""
+
+    def __init__(self, trees):
+        # trees: {'uk': {...}, 'ru': {...}, 'en': {...}}
+        self.values = {lang: dict(flatten(trees.get(lang, {}))) for lang in LANGUAGES}
+        self.by_triple = {}
+
+        for key in self.values['en']:
+            triple = tuple(self.values[lang].get(key) for lang in LANGUAGES)
+            if None not in triple:
+                # First key in document order wins, like the old linear scan
+                self.by_triple.setdefault(triple, key)
+
+    def __contains__(self, key):
+        return any(key in self.values[lang] for lang in LANGUAGES)
+
+    def find(self, uk_text, ru_text, en_text):
+        """Existing key whose uk, ru and en values all match, or None
+
+        A key that only shares the English text is not returned: reusing it
+        would replace the requested uk/ru translations with its own.
+        """
+        return self.by_triple.get((uk_text, ru_text, en_text))
+
+    def add(self, key, uk_text, ru_text, en_text):
+        """Register a newly created key so later lookups in this run reuse it"""
+        for lang, value in zip(LANGUAGES, (uk_text, ru_text, en_text)):
+            self.values[lang][key] = value
+        self.by_triple.setdefault((uk_text, ru_text, en_text), key)
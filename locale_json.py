@@ -0,0 +1,190 @@
+"""
+Duplicate-key-aware JSON loader for client/src/locales.
+
+`json.load` silently keeps only the last of two identical keys, so any
+script that round-trips a locale file loses the earlier section. This
+parser records every duplicate at any depth with its source positions and
+by default deep-merges duplicate sections instead of dropping one.
+
+    python locale_json.py          # report duplicates in all locale files
+    python locale_json.py --fix    # rewrite the files with duplicates merged
+"""
+import bisect
+import json
+import re
+import sys
+from collections import namedtuple
+from json.decoder import scanstring
+
+# (line, column), both 1-based
+Position = namedtuple('Position', 'line column')
+
+# values: (earlier, later) for a nested key whose values differ between
+# duplicate sections that were merged; None for a plain duplicate key
+DuplicateKey = namedtuple('DuplicateKey', 'path positions values', defaults=(None,))
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?')
+LITERALS = {'true': True, 'false': False, 'null': None}
+
+
+def merge_values(first, second, path='', conflicts=None):
+    """Deep-merge two values of the same key; the later one wins for scalars
+
+    Differing scalars are appended to `conflicts` as (path, first, second).
+    """
+    if not (isinstance(first, dict) and isinstance(second, dict)):
+        if conflicts is not None and first != second:
+            conflicts.append((path, first, second))
+        return second
+    merged = dict(first)
+    for key, value in second.items():
+        if key in merged:
+            merged[key] = merge_values(merged[key], value, f"{path}.{key}" if path else key, conflicts)
+        else:
+            merged[key] = value
+    return merged
+
+
+class LocaleJSONParser:
+    """Recursive-descent JSON parser that tracks key positions"""
+
+    def __init__(self, text, merge=True):
+        self.text = text
+        self.merge = merge
+        self.duplicates = []
+        self._line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+
+    def position(self, offset):
+        line = bisect.bisect_right(self._line_starts, offset)
+        return Position(line, offset - self._line_starts[line - 1] + 1)
+
+    def error(self, message, offset):
+        raise json.JSONDecodeError(message, self.text, offset)
+
+    def skip(self, i):
+        return WHITESPACE.match(self.text, i).end()
+
+    def parse(self):
+        i = self.skip(0)
+        value, i = self.parse_value(i, '')
+        i = self.skip(i)
+        if i != len(self.text):
+            self.error("Extra data", i)
+        return value
+
+    def parse_value(self, i, path):
+        text = self.text
+        if i >= len(text):
+            self.error("Unexpected end of data", i)
+        ch = text[i]
+        if ch == '{':
+            return self.parse_object(i + 1, path)
+        if ch == '[':
+            return self.parse_array(i + 1, path)
+        if ch == '"':
+            return scanstring(text, i + 1)
+        for literal, value in LITERALS.items():
+            if text.startswith(literal, i):
+                return value, i + len(literal)
+        m = NUMBER.match(text, i)
+        if m:
+            number = m.group()
+            return (float(number) if m.group(1) or m.group(2) else int(number)), m.end()
+        self.error("Expecting value", i)
+
+    def parse_object(self, i, path):
+        obj = {}
+        seen = {}
+        i = self.skip(i)
+        if self.text.startswith('}', i):
+            return obj, i + 1
+        while True:
+            if not self.text.startswith('"', i):
+                self.error("Expecting property name enclosed in double quotes", i)
+            key_start = i
+            key, i = scanstring(self.text, i + 1)
+            i = self.skip(i)
+            if not self.text.startswith(':', i):
+                self.error("Expecting ':' delimiter", i)
+            key_path = f"{path}.{key}" if path else key
+            value, i = self.parse_value(self.skip(i + 1), key_path)
+
+            if key in obj:
+                seen[key].append(self.position(key_start))
+                if self.merge:
+                    conflicts = []
+                    obj[key] = merge_values(obj[key], value, key_path, conflicts)
+                    # The key itself is reported as a duplicate below; nested
+                    # collisions only surface here
+                    self.duplicates.extend(DuplicateKey(conflict_path, list(seen[key]), (earlier, later))
+                                           for conflict_path, earlier, later in conflicts
+                                           if conflict_path != key_path)
+                else:
+                    obj[key] = value
+            else:
+                seen[key] = [self.position(key_start)]
+                obj[key] = value
+
+            i = self.skip(i)
+            if self.text.startswith('}', i):
+                break
+            if not self.text.startswith(',', i):
+                self.error("Expecting ',' delimiter", i)
+            i = self.skip(i + 1)
+
+        for key, positions in seen.items():
+            if len(positions) > 1:
+                key_path = f"{path}.{key}" if path else key
+                self.duplicates.append(DuplicateKey(key_path, positions))
+        return obj, i + 1
+
+    def parse_array(self, i, path):
+        items = []
+        i = self.skip(i)
+        if self.text.startswith(']', i):
+            return items, i + 1
+        while True:
+            value, i = self.parse_value(i, f"{path}[{len(items)}]")
+            items.append(value)
+            i = self.skip(i)
+            if self.text.startswith(']', i):
+                return items, i + 1
+            if not self.text.startswith(',', i):
+                self.error("Expecting ',' delimiter", i)
+            i = self.skip(i + 1)
+
+
+def loads(text, merge=True):
+    """Parse JSON text; returns (value, [DuplicateKey, ...])"""
+    parser = LocaleJSONParser(text, merge=merge)
+    return parser.parse(), parser.duplicates
+
+
+def load(file_path, merge=True):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return loads(f.read(), merge=merge)
+
+
+def report_duplicates(file_path, duplicates):
+    for dup in duplicates:
+        lines = ', '.join(str(p.line) for p in dup.positions)
+        if dup.values is None:
+            print(f"⚠️  {file_path}: duplicate key '{dup.path}' at lines {lines}", file=sys.stderr)
+        else:
+            earlier, later = (json.dumps(value, ensure_ascii=False) for value in dup.values)
+            print(f"⚠️  {file_path}: conflicting values for '{dup.path}' in sections at lines {lines}: "
+                  f"{earlier} replaced by {later}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    from locale_store import LocaleStore
+
+    store = LocaleStore()
+    total = sum(len(dups) for dups in store.duplicates.values())
+    if '--fix' in sys.argv[1:]:
+        store.dirty.update(lang for lang, dups in store.duplicates.items() if dups)
+        store.save()
+    conflicts = sum(dup.values is not None for dups in store.duplicates.values() for dup in dups)
+    print(f"\n{'✅' if not total else '⚠️ '} {total - conflicts} duplicate keys found, "
+          f"{conflicts} conflicting values in merged sections")
@@ -0,0 +1,102 @@
+"""
+In-memory store for the client locale files.
+
+Loads uk/ru/en once, deep-merges any number of translation patches into
+them, records conflicts, and writes each modified file exactly once at the
+end. The store owns the language -> file mapping so scripts never open a
+locale file by hand.
+"""
+import copy
+import json
+import os
+from collections import namedtuple
+
+import locale_json
+
+LOCALES_DIR = 'client/src/locales'
+
+LOCALE_FILES = {
+    'uk': 'uk.json',
+    'ru': 'ru.json',
+    'en': 'en.json',
+}
+
+Conflict = namedtuple('Conflict', 'lang key old new source')
+
+
+class LocaleStore:
+    """All locale trees, patched in memory and saved once"""
+
+    def __init__(self, locales_dir=LOCALES_DIR):
+        self.locales_dir = locales_dir
+        self.trees = {}
+        self.conflicts = []
+        self.duplicates = {}
+        self.dirty = set()
+        for lang in LOCALE_FILES:
+            # Duplicate sections are merged rather than silently dropped
+            self.trees[lang], self.duplicates[lang] = locale_json.load(self.path(lang))
+            locale_json.report_duplicates(self.path(lang), self.duplicates[lang])
+
+    def path(self, lang):
+        return os.path.join(self.locales_dir, LOCALE_FILES[lang])
+
+    def __getitem__(self, lang):
+        return self.trees[lang]
+
+    def merge(self, patch, source=None, overwrite=True):
+        """Deep-merge a {lang: tree} patch into every language it covers
+
+        Existing keys that the patch doesn't mention are kept. A key whose
+        value differs is recorded in `self.conflicts`; the patch value wins
+        unless `overwrite` is False or one side is a section and the other
+        a string, in which case the existing value is kept.
+        """
+        for lang, tree in patch.items():
+            if lang not in LOCALE_FILES:
+                raise KeyError(f"Unknown locale '{lang}' in patch {source or ''}".rstrip())
+            self._merge_tree(lang, self.trees[lang], tree, '', source, overwrite)
+
+    def _merge_tree(self, lang, target, patch, prefix, source, overwrite):
+        for key, value in patch.items():
+            path = f"{prefix}.{key}" if prefix else key
+            if key not in target:
+                target[key] = copy.deepcopy(value)
+                self.dirty.add(lang)
+                continue
+
+            current = target[key]
+            if isinstance(current, dict) and isinstance(value, dict):
+                self._merge_tree(lang, current, value, path, source, overwrite)
+            elif current != value:
+                self.conflicts.append(Conflict(lang, path, current, value, source))
+                # Never replace a whole section with a string or vice versa
+                structural = isinstance(current, dict) or isinstance(value, dict)
+                if overwrite and not structural:
+                    target[key] = copy.deepcopy(value)
+                    self.dirty.add(lang)
+
+    def set(self, lang, key, value, source=None, overwrite=True):
+        """Set a single dotted key, creating intermediate sections"""
+        *sections, leaf = key.split('.')
+        patch = {leaf: value}
+        for section in reversed(sections):
+            patch = {section: patch}
+        self.merge({lang: patch}, source=source, overwrite=overwrite)
+
+    def report_conflicts(self):
+        for c in self.conflicts:
+            origin = f" ({c.source})" if c.source else ""
+            print(f"⚠️  {c.lang}: {c.key}: {c.old!r} -> {c.new!r}{origin}")
+
+    def save(self):
+        """Write each modified locale file once; existing key order is kept,
+        new keys follow in the order they were merged"""
+        for lang in LOCALE_FILES:
+            if lang not in self.dirty:
+                continue
+            with open(self.path(lang), 'w', encoding='utf-8') as f:
+                json.dump(self.trees[lang], f, ensure_ascii=False, indent=2)
+                f.write('\n')
+            print(f"✅ Updated {self.path(lang)}")
+        self.dirty.clear()
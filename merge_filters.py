@@ -1,13 +1,8 @@
-import re
+from tsx_anchors import edit_file
 
 file_path = "client/src/pages/CRM.tsx"
 
-with open(file_path, 'r', encoding='utf-8') as f:
-    content = f.read()
-
-# Find the end of Date Range Filter section (before closing </div></div>)
-# and insert UTM filters there
-
+# Insert UTM filters after the Date Range Filter section of the filters popover
 utm_filters_code = '''
                 
                 {/* UTM Campaign Filter */}
@@ -80,33 +75,21 @@ utm_filters_code = '''
                 )}
 '''
 
-# Find where to insert (after Date Range Filter closing </div>)
-pattern = r'(</div>\s*</div>\s*{/\* Date Range Filter \*/})'
-replacement = utm_filters_code + r'\n\1'
+def merge(batch):
+    # Insert UTM filters right after the Date Range Filter section
+    if not batch.index.has('section:Date Range Filter'):
+        print("❌ Could not find insertion point")
+        return
+    batch.insert_after('section:Date Range Filter', utm_filters_code,
+                       guard='{/* UTM Campaign Filter */}')
+
+    # Remove the old standalone UTM Filters Card section
+    batch.delete('section:UTM Filters')
+
 
-# This won't work with regex, let me try a different approach
-# Find the line number where Date Range Filter ends
-lines = content.split('\n')
-insert_line = None
-for i, line in enumerate(lines):
-    if '</Popover>' in line and i > 300 and i < 350:  # Around line 342
-        # Check if next few lines close the date range section
-        if i + 3 < len(lines) and '</div>' in lines[i+3]:
-            insert_line = i + 4
-            break
+batch = edit_file(file_path, merge)
 
-if insert_line:
-    lines.insert(insert_line, utm_filters_code)
-    content = '\n'.join(lines)
-    
-    # Now remove the old UTM Filters Card section (lines 355-510 approximately)
-    # Find and remove everything from "/* UTM Filters */" Card to its closing
-    pattern = r'\s*{/\* UTM Filters \*/}.*?</Card>\s*\)\s*}\s*'
-    content = re.sub(pattern, '', content, flags=re.DOTALL)
-    
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    
+if batch.edits:
     print("✅ Merged UTM filters into main popover")
 else:
-    print("❌ Could not find insertion point")
+    print("⏭️  UTM filters already merged")
@@ -0,0 +1,535 @@
+"""
+Cardinality and exposition cost of the Prometheus metrics endpoint.
+
+Scrapes /api/trpc/prometheus.metrics (the pikaleads job in prometheus.yml)
+several times, or reads saved snapshots, and reports:
+
+  - per scrape: latency, payload bytes, series and sample counts;
+  - per metric family: series, payload share, label cardinality, and
+    counters that decrease between scrapes (gauges declared as counters);
+  - every PromQL expression in grafana-dashboard.json and alerts.yml, with
+    the series it selects, samples read per evaluation, and findings:
+    unknown series, counters read without rate(), rate() over gauges,
+    missing or too-short range windows, regex matchers that scan everything,
+    and selectors without a metric name;
+  - scraped families no dashboard or alert uses.
+
+    python metrics_cost.py                                   # 5 scrapes of the prometheus.yml target
+    python metrics_cost.py --url http://localhost:3000/api/trpc/prometheus.metrics -n 20 --every 2
+    python metrics_cost.py scrapes/                          # saved snapshots, no latency
+    python metrics_cost.py --baseline metrics_cost.base.json --max-growth 10
+
+Results go to metrics_cost.json. With --baseline, series, payload and p95
+latency are compared against an earlier result. --max-series, --max-bytes
+and --max-growth make the run exit 1 when exceeded, to keep scrape cost flat
+as per-quiz or per-manager metrics are added.
+"""
+import argparse
+import datetime
+import json
+import os
+import re
+import sys
+import time
+import urllib.request
+from collections import defaultdict, namedtuple
+
+from alert_backtest import (DEFAULT_CONFIG, DEFAULT_JOB, DEFAULT_RULES, MATCHER, BacktestError, format_duration,
+                            label_matches, load_yaml, parse_duration, parse_exposition, parse_series, unwrap_trpc)
+
+DEFAULT_DASHBOARD = 'grafana-dashboard.json'
+DEFAULT_OUTPUT = 'metrics_cost.json'
+DEFAULT_SCRAPE_INTERVAL = 60.0     # Prometheus global scrape_interval default
+MAX_LABEL_VALUES = 50
+MAX_QUERY_SAMPLES = 50000
+MIN_RATE_SCRAPES = 4               # a rate window should span at least this many scrapes
+# Series Prometheus adds to every target
+SYNTHETIC = ('up', 'scrape_duration_seconds', 'scrape_samples_scraped', 'scrape_samples_post_metric_relabeling',
+             'scrape_series_added')
+RATE_FUNCTIONS = {'rate', 'irate', 'increase', 'resets'}
+RANGE_FUNCTIONS = RATE_FUNCTIONS | {'delta', 'idelta', 'deriv', 'predict_linear', 'changes', 'holt_winters',
+                                    'avg_over_time', 'sum_over_time', 'min_over_time', 'max_over_time',
+                                    'count_over_time', 'quantile_over_time', 'stddev_over_time',
+                                    'stdvar_over_time', 'last_over_time', 'present_over_time', 'absent_over_time'}
+KEYWORDS = {'by', 'without', 'on', 'ignoring', 'group_left', 'group_right', 'bool', 'and', 'or', 'unless',
+            'offset', 'inf', 'nan'}
+GROUPING = {'by', 'without', 'on', 'ignoring', 'group_left', 'group_right'}
+
+PROMQL_TOKEN = re.compile(r'''\s*(?:
+    (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<range>\[[^\]]*\])
+  | (?P<matchers>\{[^}]*\})
+  | (?P<variable>\$\{[^}]*\}|\$\w+)
+  | (?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)
+  | (?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?[smhdwy]*)
+  | (?P<other>\S)
+)''', re.VERBOSE)
+OFFSET = re.compile(r'\boffset\s+-?[\w$]+|@\s*[\w.()]+')
+
+Scrape = namedtuple('Scrape', ['time', 'seconds', 'bytes', 'families', 'series'])
+Selector = namedtuple('Selector', ['name', 'matchers', 'range', 'function', 'rated'])
+
+
+def scrape_target(path=DEFAULT_CONFIG, job=DEFAULT_JOB):
+    """(metrics URL, scrape interval, target labels) of `job` in prometheus.yml"""
+    labels = {'job': job}
+    if not os.path.exists(path):
+        return None, DEFAULT_SCRAPE_INTERVAL, labels
+    config = load_yaml(path)
+    interval = parse_duration((config.get('global') or {}).get('scrape_interval', DEFAULT_SCRAPE_INTERVAL))
+    for scrape in config.get('scrape_configs') or []:
+        if scrape.get('job_name') != job:
+            continue
+        interval = parse_duration(scrape.get('scrape_interval', interval))
+        for static in scrape.get('static_configs') or []:
+            targets = static.get('targets') or []
+            if not targets:
+                continue
+            labels['instance'] = targets[0]
+            labels.update({k: str(v) for k, v in (static.get('labels') or {}).items()})
+            url = f"{scrape.get('scheme', 'http')}://{targets[0]}{scrape.get('metrics_path', '/metrics')}"
+            return url, interval, labels
+    return None, interval, labels
+
+
+# Exposition
+
+def parse_scrape(text, seconds=None, at=None):
+    """Scrape with families {name: {'type', 'bytes', 'series': {label tuple: value}}}"""
+    stripped = text.lstrip()
+    if stripped.startswith(('{', '[')):
+        try:
+            text = unwrap_trpc(json.loads(text)) or ''
+        except ValueError:
+            pass
+    families = {}
+    types = {}
+
+    def family(name):
+        if name not in families:
+            families[name] = {'type': None, 'bytes': 0, 'series': {}, 'duplicates': 0}
+        return families[name]
+
+    for line in text.splitlines():
+        if line.startswith('#'):
+            parts = line.split(None, 3)
+            if len(parts) >= 3 and parts[1] in ('HELP', 'TYPE'):
+                if parts[1] == 'TYPE' and len(parts) == 4:
+                    types[parts[2]] = parts[3].strip()
+                family(parts[2])['bytes'] += len(line.encode('utf-8')) + 1
+            continue
+        for head, value, _ in parse_exposition(line):
+            name, labels = parse_series(head)
+            base = _family_name(name, types)
+            entry = family(base)
+            key = (name, tuple(sorted(labels.items())))
+            if key in entry['series']:
+                entry['duplicates'] += 1
+            entry['series'][key] = value
+            entry['bytes'] += len(line.encode('utf-8')) + 1
+    for name, kind in types.items():
+        family(name)['type'] = kind
+    series = sum(len(entry['series']) for entry in families.values())
+    return Scrape(at if at is not None else time.time(), seconds, len(text.encode('utf-8')), families, series)
+
+
+def _family_name(name, types):
+    """Family a sample belongs to (histogram/summary suffixes folded into their family)"""
+    if name in types:
+        return name
+    for suffix in ('_bucket', '_sum', '_count', '_total', '_created'):
+        if name.endswith(suffix) and name[:-len(suffix)] in types:
+            return name[:-len(suffix)]
+    return name
+
+
+def scrape_url(url, timeout=30.0):
+    started = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        body = response.read()
+    seconds = time.perf_counter() - started
+    return parse_scrape(body.decode('utf-8', errors='replace'), seconds)
+
+
+def read_snapshots(sources):
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(os.path.join(root, name) for root, _, names in os.walk(source) for name in sorted(names))
+        else:
+            paths.append(source)
+    scrapes = []
+    for path in sorted(paths):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            scrapes.append(parse_scrape(f.read(), None, os.path.getmtime(path)))
+    return scrapes
+
+
+# Analysis
+
+def percentile(values, fraction):
+    values = sorted(values)
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def analyze_families(scrapes, max_label_values=MAX_LABEL_VALUES):
+    """Per-family series, payload and label cardinality over all scrapes"""
+    last = scrapes[-1]
+    names = sorted({name for scrape in scrapes for name in scrape.families})
+    out = {}
+    for name in names:
+        entries = [scrape.families[name] for scrape in scrapes if name in scrape.families]
+        seen = set()
+        values = defaultdict(set)
+        for entry in entries:
+            for key in entry['series']:
+                seen.add(key)
+                for label, value in key[1]:
+                    values[label].add(value)
+        current = last.families.get(name) or entries[-1]
+        kind = current['type']
+        findings = []
+        if kind is None:
+            findings.append("no # TYPE line (untyped)")
+        if any(entry['duplicates'] for entry in entries):
+            findings.append("duplicate series in one scrape (Prometheus rejects the scrape)")
+        decreasing = _decreasing(entries)
+        if kind == 'counter' and decreasing:
+            findings.append(f"declared counter but decreased in {decreasing} of {len(entries) - 1} "
+                            "scrape pairs: it is a gauge, and rate()/increase() over it are wrong")
+        for label, label_values in values.items():
+            if len(label_values) > max_label_values:
+                findings.append(f"label {label} has {len(label_values)} values (> {max_label_values})")
+        out[name] = {
+            'type': kind,
+            'series': len(current['series']),
+            'seriesSeen': len(seen),
+            'bytes': current['bytes'],
+            'decreasing': decreasing,
+            'share': current['bytes'] / last.bytes if last.bytes else 0.0,
+            'labels': {label: len(label_values) for label, label_values in sorted(values.items())},
+            'findings': findings,
+        }
+    return out
+
+
+def _decreasing(entries):
+    count = 0
+    for before, after in zip(entries, entries[1:]):
+        if any(value < before['series'].get(key, value) for key, value in after['series'].items()):
+            count += 1
+    return count
+
+
+def promql_selectors(expr):
+    """Selectors in a PromQL expression with the function they sit in and their range"""
+    expr = OFFSET.sub(' ', expr.strip())
+    m = re.match(r'label_values\s*\((.*)\)\s*$', expr, re.S)
+    if m:
+        # Grafana template query: label_values([selector,] label)
+        args = m.group(1).rsplit(',', 1)
+        expr = args[0] if len(args) == 2 else ''
+    tokens = [(m.lastgroup, m.group(m.lastgroup)) for m in PROMQL_TOKEN.finditer(expr)]
+    stack = []
+    found = []
+
+    def skip_grouping(i):
+        """Index after a `by (...)`-style clause starting at tokens[i]"""
+        i += 1
+        if i < len(tokens) and tokens[i] == ('other', '('):
+            while i < len(tokens) and tokens[i] != ('other', ')'):
+                i += 1
+            i += 1
+        return i
+
+    i = 0
+    while i < len(tokens):
+        kind, text = tokens[i]
+        following = tokens[i + 1] if i + 1 < len(tokens) else (None, None)
+        if kind == 'name' and text.lower() in KEYWORDS:
+            i = skip_grouping(i) if text in GROUPING else i + 1
+            continue
+        if kind == 'name' and following[0] == 'name' and following[1] in ('by', 'without'):
+            # Aggregation with a leading clause: sum by (quiz) (...)
+            i = skip_grouping(i + 1)
+            if i < len(tokens) and tokens[i] == ('other', '('):
+                stack.append(text)
+                i += 1
+            continue
+        if kind == 'name' and following == ('other', '('):
+            stack.append(text)
+            i += 2
+            continue
+        if kind in ('name', 'matchers'):
+            name = text if kind == 'name' else ''
+            matchers = []
+            j = i + 1
+            body = text if kind == 'matchers' else (tokens[j][1] if j < len(tokens) and tokens[j][0] == 'matchers'
+                                                    else None)
+            if kind == 'name' and body is not None:
+                j += 1
+            if body is not None:
+                for m in MATCHER.finditer(body[1:-1]):
+                    if m.group(1) == '__name__' and m.group(2) == '=':
+                        name = m.group(3)
+                    else:
+                        matchers.append((m.group(1), m.group(2), m.group(3)))
+            window = None
+            if j < len(tokens) and tokens[j][0] == 'range':
+                window = tokens[j][1][1:-1].split(':')[0].strip()
+                j += 1
+            functions = [function for function in stack if function]
+            found.append(Selector(name, tuple(matchers), window, functions[-1] if functions else None,
+                                  any(function in RATE_FUNCTIONS for function in functions)))
+            i = j
+            continue
+        if text == '(':
+            stack.append(None)
+        elif text == ')' and stack:
+            stack.pop()
+        i += 1
+    return found
+
+
+def collect_expressions(dashboard_path=DEFAULT_DASHBOARD, rules_path=DEFAULT_RULES, default_interval=60.0):
+    """[(source, expr, evaluations per hour)] from the dashboard panels and alert rules"""
+    found = []
+    if dashboard_path and os.path.exists(dashboard_path):
+        with open(dashboard_path, 'r', encoding='utf-8') as f:
+            dashboard = json.load(f)
+        dashboard = dashboard.get('dashboard', dashboard)
+        refresh = dashboard.get('refresh')
+        per_hour = 3600 / parse_duration(refresh) if refresh else 1.0
+        for panel in _panels(dashboard.get('panels') or []):
+            for target in panel.get('targets') or []:
+                if target.get('expr'):
+                    found.append((f"dashboard: {panel.get('title') or panel.get('id')}", target['expr'], per_hour))
+        for variable in (dashboard.get('templating') or {}).get('list') or []:
+            query = variable.get('query')
+            if isinstance(query, dict):
+                query = query.get('query')
+            if variable.get('type') == 'query' and isinstance(query, str) and query:
+                found.append((f"variable: {variable.get('name')}", query, per_hour))
+    if rules_path and os.path.exists(rules_path):
+        for group in load_yaml(rules_path).get('groups') or []:
+            interval = parse_duration(group['interval']) if group.get('interval') else default_interval
+            for rule in group.get('rules') or []:
+                name = rule.get('alert') or rule.get('record')
+                found.append((f"alert: {name}" if 'alert' in rule else f"record: {name}",
+                              str(rule['expr']).strip(), 3600 / interval))
+    return found
+
+
+def _panels(panels):
+    for panel in panels:
+        yield panel
+        yield from _panels(panel.get('panels') or [])
+
+
+def analyze_expressions(expressions, scrape, families, target_labels, scrape_interval,
+                        max_samples=MAX_QUERY_SAMPLES):
+    series = []
+    for name, entry in scrape.families.items():
+        for (sample_name, labels) in entry['series']:
+            series.append((sample_name, {**target_labels, **dict(labels)}))
+    series.extend((name, dict(target_labels)) for name in SYNTHETIC)
+    types = {name: family['type'] for name, family in families.items()}
+    decreasing = {name for name, family in families.items() if family['decreasing']}
+    used = set()
+    out = []
+    for source, expr, per_hour in expressions:
+        findings = []
+        samples = 0
+        matched_total = 0
+        for selector in promql_selectors(expr):
+            matched = [s for s in series if (not selector.name or s[0] == selector.name)
+                       and all(label_matches(s[1].get(label, ''), op, value)
+                               for label, op, value in selector.matchers)]
+            matched_total += len(matched)
+            used.update(s[0] for s in matched)
+            findings.extend(_selector_findings(selector, matched, types, decreasing, scrape_interval))
+            window = _seconds(selector.range)
+            samples += len(matched) * (max(1, int(window // scrape_interval)) if window else 1)
+        if samples > max_samples:
+            findings.append(f"reads {samples} samples per evaluation (> {max_samples})")
+        out.append({
+            'source': source,
+            'expr': expr,
+            'series': matched_total,
+            'samplesPerEvaluation': samples,
+            'samplesPerHour': int(samples * per_hour),
+            'findings': findings,
+        })
+    return out, used
+
+
+def _seconds(window):
+    if not window or window.startswith('$'):
+        return None
+    try:
+        return parse_duration(window)
+    except BacktestError:
+        return None
+
+
+def _selector_findings(selector, matched, types, decreasing, scrape_interval):
+    findings = []
+    label = selector.name or '{' + ','.join(f'{l}{op}"{v}"' for l, op, v in selector.matchers) + '}'
+    if not selector.name:
+        findings.append(f"{label}: no metric name, every series is scanned")
+    for name, op, value in selector.matchers:
+        if op in ('=~', '!~') and (value in ('.*', '.+', '') or value.startswith(('.*', '.+'))):
+            findings.append(f"{label}: unbounded regex {name}{op}\"{value}\"")
+    if not matched:
+        findings.append(f"{label}: matches no scraped series")
+        return findings
+    family = _family_name(selector.name, types) if selector.name else None
+    kind = types.get(family)
+    if selector.function in RANGE_FUNCTIONS and selector.range is None:
+        findings.append(f"{label}: {selector.function}() without a range window")
+    window = _seconds(selector.range)
+    if selector.function in RATE_FUNCTIONS and window and window < MIN_RATE_SCRAPES * scrape_interval:
+        findings.append(f"{label}: {selector.function}() window {selector.range} is under "
+                        f"{MIN_RATE_SCRAPES} scrape intervals ({format_duration(scrape_interval)})")
+    if kind == 'counter' and not selector.rated and selector.range is None:
+        findings.append(f"{label}: counter read without rate()/increase()")
+    if family in decreasing and selector.function in RATE_FUNCTIONS:
+        findings.append(f"{label}: {selector.function}() over a series that decreases between scrapes "
+                        "(every drop counts as a counter reset)")
+    elif kind == 'gauge' and selector.function in RATE_FUNCTIONS:
+        findings.append(f"{label}: {selector.function}() over a gauge (use deriv() or delta())")
+    return findings
+
+
+def compare(result, baseline):
+    """Growth against an earlier result: [(what, before, after, percent)]"""
+    rows = []
+    for what, key in (('series', 'series'), ('payload bytes', 'bytes'), ('p95 latency ms', 'p95Ms')):
+        before = (baseline.get('scrape') or {}).get(key)
+        after = result['scrape'].get(key)
+        if before and after is not None:
+            rows.append((what, before, after, (after - before) * 100 / before))
+    for name, family in result['families'].items():
+        before = (baseline.get('families') or {}).get(name, {}).get('series', 0)
+        if family['series'] != before:
+            rows.append((f"{name} series", before, family['series'],
+                         (family['series'] - before) * 100 / before if before else None))
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Cardinality and exposition cost of the metrics endpoint")
+    parser.add_argument('snapshots', nargs='*', help='saved exposition snapshots instead of scraping')
+    parser.add_argument('--url', help='metrics URL (default: the --job target in prometheus.yml)')
+    parser.add_argument('-n', '--scrapes', type=int, default=5)
+    parser.add_argument('--every', type=float, default=1.0, help='seconds between scrapes')
+    parser.add_argument('--config', default=DEFAULT_CONFIG)
+    parser.add_argument('--job', default=DEFAULT_JOB)
+    parser.add_argument('--dashboard', default=DEFAULT_DASHBOARD)
+    parser.add_argument('--rules', default=DEFAULT_RULES)
+    parser.add_argument('--max-label-values', type=int, default=MAX_LABEL_VALUES)
+    parser.add_argument('--max-query-samples', type=int, default=MAX_QUERY_SAMPLES)
+    parser.add_argument('--max-series', type=int, help='exit 1 above this many series')
+    parser.add_argument('--max-bytes', type=int, help='exit 1 above this payload size')
+    parser.add_argument('--baseline', help='earlier metrics_cost.json to compare against')
+    parser.add_argument('--max-growth', type=float, help='exit 1 if series or payload grew more (percent)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    try:
+        url, scrape_interval, target_labels = scrape_target(args.config, args.job)
+        if args.snapshots:
+            scrapes = read_snapshots(args.snapshots)
+        else:
+            url = args.url or url
+            if not url:
+                raise BacktestError(f"no --url and no {args.job} target in {args.config}")
+            scrapes = []
+            for i in range(args.scrapes):
+                if i:
+                    time.sleep(args.every)
+                scrapes.append(scrape_url(url))
+        if not scrapes:
+            raise BacktestError("no scrapes")
+        expressions = collect_expressions(args.dashboard, args.rules)
+    except (BacktestError, OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    last = scrapes[-1]
+    families = analyze_families(scrapes, args.max_label_values)
+    queries, used = analyze_expressions(expressions, last, families, target_labels, scrape_interval,
+                                        args.max_query_samples)
+    unused = sorted(name for name, entry in last.families.items()
+                    if not any(sample_name in used for sample_name, _ in entry['series']))
+    latencies = [scrape.seconds * 1000 for scrape in scrapes if scrape.seconds is not None]
+    result = {
+        'generated': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'source': ', '.join(args.snapshots) if args.snapshots else url,
+        'scrapes': len(scrapes),
+        'scrapeInterval': scrape_interval,
+        'scrape': {
+            'series': last.series,
+            'families': len(last.families),
+            'bytes': last.bytes,
+            'minMs': min(latencies) if latencies else None,
+            'p50Ms': percentile(latencies, 0.5),
+            'p95Ms': percentile(latencies, 0.95),
+            'maxMs': max(latencies) if latencies else None,
+            'bytesPerDay': int(last.bytes * 86400 / scrape_interval),
+        },
+        'families': families,
+        'queries': queries,
+        'unused': unused,
+    }
+
+    scrape = result['scrape']
+    print(f"📦 {len(scrapes)} scrapes of {result['source']}: {scrape['series']} series in "
+          f"{len(last.families)} families, {scrape['bytes']} bytes"
+          + (f", latency p50 {scrape['p50Ms']:.1f} ms / p95 {scrape['p95Ms']:.1f} ms / max {scrape['maxMs']:.1f} ms"
+             if latencies else ''))
+    print(f"   every {format_duration(scrape_interval)}: {scrape['bytesPerDay'] / 1e6:.1f} MB/day of exposition")
+    print("\n📊 Families (largest first)")
+    for name, family in sorted(families.items(), key=lambda item: (-item[1]['series'], -item[1]['bytes'])):
+        labels = ', '.join(f"{label}={count}" for label, count in family['labels'].items())
+        print(f"   {name:<40} {family['type'] or 'untyped':<9} {family['series']:>5} series "
+              f"{family['bytes']:>7} B ({family['share'] * 100:4.1f}%)" + (f"  [{labels}]" if labels else ''))
+        for finding in family['findings']:
+            print(f"      ⚠️  {finding}")
+
+    print(f"\n📊 Queries ({len(queries)})")
+    for query in queries:
+        mark = '⚠️ ' if query['findings'] else '✅'
+        print(f"{mark} {query['source']}: {query['expr']}  ({query['series']} series, "
+              f"{query['samplesPerEvaluation']} samples/eval, {query['samplesPerHour']}/h)")
+        for finding in query['findings']:
+            print(f"      {finding}")
+    if unused:
+        print(f"\n📝 {len(unused)} families not used by any dashboard panel or alert: {', '.join(unused)}")
+
+    failed = []
+    if args.max_series is not None and last.series > args.max_series:
+        failed.append(f"{last.series} series > {args.max_series}")
+    if args.max_bytes is not None and last.bytes > args.max_bytes:
+        failed.append(f"{last.bytes} bytes > {args.max_bytes}")
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            rows = compare(result, json.load(f))
+        result['baseline'] = [{'what': what, 'before': before, 'after': after, 'percent': percent}
+                              for what, before, after, percent in rows]
+        print(f"\n📊 Against {args.baseline}")
+        for what, before, after, percent in rows:
+            print(f"   {what}: {before:g} → {after:g}" + (f" ({percent:+.1f}%)" if percent is not None else ' (new)'))
+            if (args.max_growth is not None and what in ('series', 'payload bytes')
+                    and percent is not None and percent > args.max_growth):
+                failed.append(f"{what} grew {percent:.1f}% (> {args.max_growth:g}%)")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    print(f"\n📝 Report in {args.output}")
+    for message in failed:
+        print(f"❌ {message}")
+    sys.exit(1 if failed else 0)
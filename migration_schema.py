@@ -0,0 +1,615 @@
+"""
+Schema model replayed from the drizzle/*.sql migrations.
+
+Applies CREATE TABLE / ALTER TABLE / CREATE INDEX / DROP / RENAME
+statements in migration order to an in-memory model of tables, columns,
+indexes and foreign keys:
+
+    from migration_schema import compile_migrations
+
+    model = compile_migrations()
+    leads = model.tables['leads']
+    leads.columns['statusId'].type          # 'int'
+    leads.indexes                           # {'leads_id': Index(..., primary=True)}
+
+Like InnoDB, adding a foreign key also adds an index on its columns unless
+an existing index already starts with them.
+
+The model after each migration is cached in .schema-cache/, keyed by a hash
+of that migration and every one before it, so adding a migration replays
+only the new file. The command line compiles the model and diffs it
+against the CREATE TABLE statements of a dump:
+
+    python migration_schema.py                          # summary
+    python migration_schema.py --json > schema.json     # the model
+    python migration_schema.py --diff database_COMPLETE_WITH_ALL_DATA.sql
+"""
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+
+from restore_planner import MIGRATION_GLOBS, split_statements
+
+MODEL_VERSION = 1
+DEFAULT_CACHE_DIR = '.schema-cache'
+# Bookkeeping tables a dump may contain that no migration creates
+IGNORED_TABLES = {'__drizzle_migrations', '__seed_state'}
+
+ColumnDef = namedtuple('ColumnDef', 'name type nullable default autoincrement')
+Index = namedtuple('Index', 'name columns unique primary')
+ForeignKey = namedtuple('ForeignKey', 'name columns ref_table ref_columns on_delete')
+
+IDENT = r'(?:`[^`]+`|[A-Za-z_][\w$]*)'
+COMMENT = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+CREATE_TABLE = re.compile(rf'CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?({IDENT})\s*\(', re.IGNORECASE)
+CREATE_INDEX = re.compile(rf'CREATE\s+(UNIQUE\s+)?INDEX\s+({IDENT})\s+ON\s+({IDENT})\s*\(', re.IGNORECASE)
+DROP_TABLE = re.compile(rf'DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?({IDENT})', re.IGNORECASE)
+DROP_INDEX = re.compile(rf'DROP\s+INDEX\s+({IDENT})\s+ON\s+({IDENT})', re.IGNORECASE)
+RENAME_TABLE = re.compile(rf'RENAME\s+TABLE\s+({IDENT})\s+TO\s+({IDENT})', re.IGNORECASE)
+ALTER_TABLE = re.compile(rf'ALTER\s+TABLE\s+({IDENT})\s+(.*)', re.IGNORECASE | re.DOTALL)
+COLUMN_TYPE = re.compile(r'(\w+)\s*(\([^)]*\))?(\s+unsigned)?', re.IGNORECASE)
+DEFAULT = re.compile(r"\bDEFAULT\s+('(?:[^'\\]|\\.|'')*'|\((?:[^()]|\([^()]*\))*\)|[^\s,]+)", re.IGNORECASE)
+REFERENCES = re.compile(
+    rf'REFERENCES\s+({IDENT})\s*\(([^)]*)\)(?:\s+ON\s+DELETE\s+(cascade|set\s+null|restrict|no\s+action|set\s+default))?',
+    re.IGNORECASE,
+)
+
+
+def unquote(name):
+    name = name.strip()
+    return name[1:-1] if name.startswith('`') else name
+
+
+def _identifiers(text):
+    """Column names of an index/key list, without prefix lengths or ASC/DESC"""
+    names = []
+    for part in split_top_level(text):
+        m = re.match(IDENT, part.strip())
+        if m:
+            names.append(unquote(m.group()))
+    return names
+
+
+def split_top_level(text, sep=','):
+    """Split on `sep` outside of parentheses and quotes"""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '\'"`':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _closing(text, start):
+    """Offset of the `)` matching the `(` just before `start`"""
+    depth = 1
+    quote = None
+    for i in range(start, len(text)):
+        ch = text[i]
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '\'"`':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(text)
+
+
+def parse_column_def(text):
+    """ColumnDef from `name type [NOT NULL] [DEFAULT ...] ...`, or None"""
+    m = re.match(rf'({IDENT})\s+', text)
+    if not m:
+        return None
+    rest = text[m.end():]
+    t = COLUMN_TYPE.match(rest)
+    if not t:
+        return None
+    column_type = t.group(1).lower() + (t.group(2) or '') + (' unsigned' if t.group(3) else '')
+    options = rest[t.end():]
+    default = DEFAULT.search(options)
+    return ColumnDef(
+        name=unquote(m.group(1)),
+        type=column_type,
+        nullable=not re.search(r'\bNOT\s+NULL\b', options, re.IGNORECASE),
+        default=default.group(1) if default else None,
+        autoincrement=bool(re.search(r'\bAUTO_INCREMENT\b', options, re.IGNORECASE)),
+    )
+
+
+class TableModel:
+    """Columns, indexes and foreign keys of one table"""
+
+    def __init__(self, name):
+        self.name = name
+        self.columns = {}        # name -> ColumnDef, in table order
+        self.indexes = {}        # name -> Index
+        self.foreign_keys = {}   # name -> ForeignKey
+
+    def column(self, name):
+        """Canonical column name (MySQL column names are case-insensitive), or None"""
+        if name in self.columns:
+            return name
+        lower = name.lower()
+        return next((column for column in self.columns if column.lower() == lower), None)
+
+    @property
+    def primary_key(self):
+        return next((index.columns for index in self.indexes.values() if index.primary), ())
+
+    def add_index(self, name, columns, unique=False, primary=False):
+        columns = tuple(self.column(c) or c for c in columns)
+        if primary:
+            name = next((n for n, index in self.indexes.items() if index.primary), name or 'PRIMARY')
+        elif not name:
+            name = columns[0]
+            suffix = 2
+            while name in self.indexes:
+                name = f"{columns[0]}_{suffix}"
+                suffix += 1
+        self.indexes[name] = Index(name, columns, unique or primary, primary)
+
+    def add_foreign_key(self, name, columns, ref_table, ref_columns, on_delete=None):
+        columns = tuple(self.column(c) or c for c in columns)
+        name = name or f"{self.name}_ibfk_{len(self.foreign_keys) + 1}"
+        self.foreign_keys[name] = ForeignKey(name, columns, ref_table, tuple(ref_columns),
+                                             on_delete.lower() if on_delete else None)
+        if not any(index.columns[:len(columns)] == columns for index in self.indexes.values()):
+            self.add_index(name, columns)
+
+    def drop_column(self, name):
+        name = self.column(name) or name
+        self.columns.pop(name, None)
+        for index_name, index in list(self.indexes.items()):
+            if name in index.columns:
+                columns = tuple(c for c in index.columns if c != name)
+                if columns:
+                    self.indexes[index_name] = index._replace(columns=columns)
+                else:
+                    del self.indexes[index_name]
+
+    def rename_column(self, old, new, definition=None):
+        old = self.column(old) or old
+        self.columns = {(new if name == old else name): (definition or column._replace(name=new)
+                                                          if name == old else column)
+                        for name, column in self.columns.items()}
+        for index_name, index in self.indexes.items():
+            self.indexes[index_name] = index._replace(
+                columns=tuple(new if c == old else c for c in index.columns))
+        for fk_name, fk in self.foreign_keys.items():
+            self.foreign_keys[fk_name] = fk._replace(
+                columns=tuple(new if c == old else c for c in fk.columns))
+
+    def __repr__(self):
+        return f"TableModel({self.name!r}, {len(self.columns)} columns, {len(self.indexes)} indexes)"
+
+
+class SchemaModel:
+    """Tables by name, built by applying migration statements in order"""
+
+    def __init__(self):
+        self.tables = {}
+        self.skipped = []        # statements that changed nothing the model tracks
+
+    def table(self, name):
+        """TableModel by name; falls back to a case-insensitive match"""
+        if name in self.tables:
+            return self.tables[name]
+        lower = name.lower()
+        return next((table for key, table in self.tables.items() if key.lower() == lower), None)
+
+    def apply(self, statement):
+        """Apply one SQL statement"""
+        statement = COMMENT.sub('', statement).strip().rstrip(';').strip()
+        if not statement:
+            return
+        m = CREATE_TABLE.match(statement)
+        if m:
+            name = unquote(m.group(2))
+            if m.group(1) and name in self.tables:
+                return
+            body = statement[m.end():_closing(statement, m.end())]
+            self.tables[name] = self._create_table(name, body)
+            return
+        m = CREATE_INDEX.match(statement)
+        if m:
+            table = self.table(unquote(m.group(3)))
+            if table:
+                columns = _identifiers(statement[m.end():_closing(statement, m.end())])
+                table.add_index(unquote(m.group(2)), columns, unique=bool(m.group(1)))
+            return
+        m = DROP_TABLE.match(statement)
+        if m:
+            self.tables.pop(unquote(m.group(1)), None)
+            return
+        m = DROP_INDEX.match(statement)
+        if m:
+            table = self.table(unquote(m.group(2)))
+            if table:
+                table.indexes.pop(unquote(m.group(1)), None)
+            return
+        m = RENAME_TABLE.match(statement)
+        if m:
+            self._rename_table(unquote(m.group(1)), unquote(m.group(2)))
+            return
+        m = ALTER_TABLE.match(statement)
+        if m:
+            table = self.table(unquote(m.group(1)))
+            if table:
+                for action in split_top_level(m.group(2)):
+                    self._alter(table, action)
+            return
+        self.skipped.append(statement)
+
+    def apply_sql(self, sql):
+        """Apply every statement of a migration file's text"""
+        for statement in split_statements(sql):
+            self.apply(statement)
+        return self
+
+    def apply_file(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return self.apply_sql(f.read())
+
+    def to_dict(self):
+        return {name: {
+            'columns': [list(column) for column in table.columns.values()],
+            'indexes': [[index.name, list(index.columns), index.unique, index.primary]
+                        for index in table.indexes.values()],
+            'foreign_keys': [[fk.name, list(fk.columns), fk.ref_table, list(fk.ref_columns), fk.on_delete]
+                             for fk in table.foreign_keys.values()],
+        } for name, table in self.tables.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        model = cls()
+        for name, entry in data.items():
+            table = model.tables[name] = TableModel(name)
+            for column in entry['columns']:
+                table.columns[column[0]] = ColumnDef(*column)
+            for name_, columns, unique, primary in entry['indexes']:
+                table.indexes[name_] = Index(name_, tuple(columns), unique, primary)
+            for name_, columns, ref_table, ref_columns, on_delete in entry['foreign_keys']:
+                table.foreign_keys[name_] = ForeignKey(name_, tuple(columns), ref_table,
+                                                       tuple(ref_columns), on_delete)
+        return model
+
+    def _create_table(self, name, body):
+        table = TableModel(name)
+        foreign_keys = []
+        for item in split_top_level(body):
+            if not self._constraint(table, item, foreign_keys):
+                column = parse_column_def(item)
+                if column is None:
+                    continue
+                table.columns[column.name] = column
+                if re.search(r'\bPRIMARY\s+KEY\b', item, re.IGNORECASE):
+                    table.add_index(None, [column.name], primary=True)
+                elif re.search(r'\bUNIQUE\b', item, re.IGNORECASE):
+                    table.add_index(None, [column.name], unique=True)
+                ref = REFERENCES.search(item)
+                if ref:
+                    foreign_keys.append((None, [column.name], ref))
+        # Foreign keys last, so their implicit indexes see every declared index
+        for fk_name, columns, ref in foreign_keys:
+            table.add_foreign_key(fk_name, columns, unquote(ref.group(1)),
+                                  _identifiers(ref.group(2)), ref.group(3))
+        return table
+
+    def _constraint(self, table, item, foreign_keys):
+        """Handle a key/constraint clause; False if `item` is a column definition"""
+        m = re.match(rf'(?:CONSTRAINT\s+({IDENT})\s+)?(PRIMARY\s+KEY|UNIQUE(?:\s+(?:KEY|INDEX))?|KEY|INDEX'
+                     rf'|FULLTEXT(?:\s+(?:KEY|INDEX))?|FOREIGN\s+KEY)\s*({IDENT})?\s*\(', item, re.IGNORECASE)
+        if not m:
+            return False
+        constraint, kind, index_name = m.groups()
+        name = unquote(constraint or index_name or '') or None
+        columns = _identifiers(item[m.end():_closing(item, m.end())])
+        kind = kind.upper()
+        if kind.startswith('FOREIGN'):
+            ref = REFERENCES.search(item)
+            if ref:
+                foreign_keys.append((name, columns, ref))
+        elif kind.startswith('PRIMARY'):
+            table.add_index(name, columns, primary=True)
+        else:
+            table.add_index(name, columns, unique=kind.startswith('UNIQUE'))
+        return True
+
+    def _alter(self, table, action):
+        words = action.split(None, 2)
+        verb = words[0].upper() if words else ''
+        if verb == 'ADD':
+            rest = action[3:].strip()
+            foreign_keys = []
+            if self._constraint(table, rest, foreign_keys):
+                for name, columns, ref in foreign_keys:
+                    table.add_foreign_key(name, columns, unquote(ref.group(1)),
+                                          _identifiers(ref.group(2)), ref.group(3))
+                return
+            rest = re.sub(r'^COLUMN\s+(IF\s+NOT\s+EXISTS\s+)?', '', rest, flags=re.IGNORECASE)
+            column = parse_column_def(rest)
+            if column and table.column(column.name) is None:
+                table.columns[column.name] = column
+        elif verb == 'DROP':
+            rest = action[4:].strip()
+            m = re.match(rf'(?:COLUMN\s+)?(?:IF\s+EXISTS\s+)?({IDENT})$', rest, re.IGNORECASE)
+            if re.match(r'PRIMARY\s+KEY', rest, re.IGNORECASE):
+                for name, index in list(table.indexes.items()):
+                    if index.primary:
+                        del table.indexes[name]
+            elif re.match(r'(?:INDEX|KEY)\s', rest, re.IGNORECASE):
+                table.indexes.pop(unquote(rest.split(None, 1)[1]), None)
+            elif re.match(r'(?:FOREIGN\s+KEY|CONSTRAINT)\s', rest, re.IGNORECASE):
+                name = unquote(rest.split()[-1])
+                table.foreign_keys.pop(name, None)
+                if rest.upper().startswith('CONSTRAINT'):
+                    table.indexes.pop(name, None)
+            elif m:
+                table.drop_column(unquote(m.group(1)))
+        elif verb == 'MODIFY':
+            rest = re.sub(r'^MODIFY\s+(COLUMN\s+)?', '', action, flags=re.IGNORECASE)
+            column = parse_column_def(rest)
+            if column:
+                name = table.column(column.name) or column.name
+                table.columns[name] = column._replace(name=name)
+        elif verb == 'CHANGE':
+            rest = re.sub(r'^CHANGE\s+(COLUMN\s+)?', '', action, flags=re.IGNORECASE)
+            m = re.match(rf'({IDENT})\s+', rest)
+            column = parse_column_def(rest[m.end():]) if m else None
+            if column:
+                table.rename_column(unquote(m.group(1)), column.name, column)
+        elif verb == 'RENAME':
+            m = re.match(rf'RENAME\s+COLUMN\s+({IDENT})\s+TO\s+({IDENT})', action, re.IGNORECASE)
+            if m:
+                table.rename_column(unquote(m.group(1)), unquote(m.group(2)))
+                return
+            m = re.match(rf'RENAME\s+(?:INDEX|KEY)\s+({IDENT})\s+TO\s+({IDENT})', action, re.IGNORECASE)
+            if m:
+                old, new = unquote(m.group(1)), unquote(m.group(2))
+                if old in table.indexes:
+                    table.indexes[new] = table.indexes.pop(old)._replace(name=new)
+                return
+            m = re.match(rf'RENAME\s+(?:TO\s+|AS\s+)?({IDENT})$', action, re.IGNORECASE)
+            if m:
+                self._rename_table(table.name, unquote(m.group(1)))
+
+    def _rename_table(self, old, new):
+        table = self.tables.pop(old, None)
+        if table is None:
+            return
+        table.name = new
+        self.tables[new] = table
+        for other in self.tables.values():
+            for name, fk in other.foreign_keys.items():
+                if fk.ref_table == old:
+                    other.foreign_keys[name] = fk._replace(ref_table=new)
+
+
+def migration_files(patterns=MIGRATION_GLOBS):
+    """Migration files in apply order (by file name: 0000_*.sql, 0001_*.sql, ...)"""
+    return sorted({path for pattern in patterns for path in glob.glob(pattern)},
+                  key=os.path.basename)
+
+
+def compile_migrations(patterns=MIGRATION_GLOBS, cache_dir=DEFAULT_CACHE_DIR, stats=None):
+    """SchemaModel after applying every migration file
+
+    With a `cache_dir`, the model after each migration is stored as
+    <key>.json, where the key chains the hashes of all migrations so far.
+    Replay resumes from the longest cached prefix. `stats`, if given, is
+    updated with the number of files 'cached' and 'replayed'.
+    """
+    files = migration_files(patterns)
+    keys = []
+    contents = []
+    key = f"v{MODEL_VERSION}"
+    for path in files:
+        with open(path, 'rb') as f:
+            data = f.read()
+        key = hashlib.sha256(key.encode() + b'\0' + data).hexdigest()
+        keys.append(key)
+        contents.append(data)
+
+    model = SchemaModel()
+    start = 0
+    if cache_dir:
+        for i in range(len(keys) - 1, -1, -1):
+            cached = _read_cached(cache_dir, keys[i])
+            if cached is not None:
+                model = SchemaModel.from_dict(cached)
+                start = i + 1
+                break
+
+    for i in range(start, len(files)):
+        model.apply_sql(contents[i].decode('utf-8'))
+        if cache_dir:
+            _write_cached(cache_dir, keys[i], model)
+    if stats is not None:
+        stats['cached'] = start
+        stats['replayed'] = len(files) - start
+    return model
+
+
+def _read_cached(cache_dir, key):
+    try:
+        with open(os.path.join(cache_dir, key + '.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached(cache_dir, key, model):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, key + '.json')
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(model.to_dict(), f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+# Drift against a dump
+
+DUMP_CREATE_TABLE = re.compile(rb'^CREATE TABLE .*?\n\)[^;\n]*;', re.MULTILINE | re.DOTALL)
+INTEGER_WIDTH = re.compile(r'^(tinyint|smallint|mediumint|int|integer|bigint)\(\d+\)')
+TYPE_ALIASES = {'integer': 'int', 'boolean': 'tinyint(1)', 'bool': 'tinyint(1)',
+                'serial': 'bigint unsigned', 'decimal': 'decimal(10,0)'}
+
+
+def dump_schema(dump_path):
+    """SchemaModel from the CREATE TABLE statements of a mysqldump (rows are not parsed)"""
+    model = SchemaModel()
+    with open(dump_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return model
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for m in DUMP_CREATE_TABLE.finditer(mm):
+                model.apply(m.group().decode('utf-8', 'replace'))
+    return model
+
+
+def normalize_type(column_type):
+    """Comparable column type: no integer display widths, aliases resolved"""
+    column_type = column_type.lower().strip()
+    if column_type.startswith('tinyint(1)'):
+        return column_type
+    column_type = INTEGER_WIDTH.sub(r'\1', column_type)
+    base, _, unsigned = column_type.partition(' ')
+    base = TYPE_ALIASES.get(base, base)
+    return f"{base} {unsigned}".strip()
+
+
+def normalize_default(default):
+    if default is None or default.upper() == 'NULL':
+        return None
+    value = default.strip()
+    while value.startswith('(') and value.endswith(')'):
+        value = value[1:-1].strip()
+    value = value.lower()
+    if value in ('now()', 'current_timestamp', 'current_timestamp()'):
+        return 'current_timestamp'
+    if value in ('true', 'false'):
+        return '1' if value == 'true' else '0'
+    if value.startswith("'") and value.endswith("'") and re.fullmatch(r"'-?\d+(\.\d+)?'", value):
+        return value[1:-1]
+    return value
+
+
+def diff_models(expected, actual, tables=None):
+    """Drift of `actual` (e.g. a dump) against `expected` (the migrations)
+
+    Returns [(table, kind, detail)]. Only `tables` are compared (default: the
+    tables `actual` defines); indexes are matched by columns, not by name.
+    """
+    names = sorted(tables if tables is not None else actual.tables)
+    drift = []
+    for name in names:
+        if name in IGNORED_TABLES:
+            continue
+        want = expected.table(name)
+        have = actual.table(name)
+        if want is None:
+            drift.append((name, 'extra_table', 'not created by any migration'))
+            continue
+        if have is None:
+            drift.append((name, 'missing_table', 'not in the dump'))
+            continue
+        for column in want.columns.values():
+            other = have.column(column.name)
+            if other is None:
+                drift.append((name, 'missing_column', column.name))
+                continue
+            other = have.columns[other]
+            if normalize_type(column.type) != normalize_type(other.type):
+                drift.append((name, 'type', f"{column.name}: {column.type} != {other.type}"))
+            if column.nullable != other.nullable:
+                drift.append((name, 'nullable', f"{column.name}: "
+                              f"{'NULL' if column.nullable else 'NOT NULL'} != "
+                              f"{'NULL' if other.nullable else 'NOT NULL'}"))
+            if normalize_default(column.default) != normalize_default(other.default):
+                drift.append((name, 'default', f"{column.name}: {column.default} != {other.default}"))
+        for column in have.columns:
+            if want.column(column) is None:
+                drift.append((name, 'extra_column', column))
+
+        want_indexes = {(index.columns, index.unique) for index in want.indexes.values()}
+        have_indexes = {(tuple(want.column(c) or c for c in index.columns), index.unique)
+                        for index in have.indexes.values()}
+        for columns, unique in sorted(want_indexes - have_indexes):
+            drift.append((name, 'missing_index', f"{'unique ' if unique else ''}({', '.join(columns)})"))
+        for columns, unique in sorted(have_indexes - want_indexes):
+            drift.append((name, 'extra_index', f"{'unique ' if unique else ''}({', '.join(columns)})"))
+
+        want_fks = {(fk.columns, fk.ref_table, fk.ref_columns) for fk in want.foreign_keys.values()}
+        have_fks = {(tuple(want.column(c) or c for c in fk.columns), fk.ref_table, fk.ref_columns)
+                    for fk in have.foreign_keys.values()}
+        for columns, ref_table, ref_columns in sorted(want_fks - have_fks):
+            drift.append((name, 'missing_foreign_key',
+                          f"({', '.join(columns)}) -> {ref_table}({', '.join(ref_columns)})"))
+        for columns, ref_table, ref_columns in sorted(have_fks - want_fks):
+            drift.append((name, 'extra_foreign_key',
+                          f"({', '.join(columns)}) -> {ref_table}({', '.join(ref_columns)})"))
+    return drift
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compile the schema from drizzle migrations")
+    parser.add_argument('--diff', metavar='DUMP', help='report drift against the CREATE TABLEs of a dump')
+    parser.add_argument('--all-tables', action='store_true',
+                        help='with --diff, also report migration tables the dump does not create')
+    parser.add_argument('--json', action='store_true', help='print the compiled model')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    stats = {}
+    model = compile_migrations(cache_dir=None if args.no_cache else args.cache_dir, stats=stats)
+    compiled = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(model.to_dict(), ensure_ascii=False, indent=2))
+        sys.exit(0)
+
+    print(f"✅ {len(model.tables)} tables, {sum(len(t.columns) for t in model.tables.values())} columns, "
+          f"{sum(len(t.indexes) for t in model.tables.values())} indexes from "
+          f"{stats['cached'] + stats['replayed']} migrations "
+          f"({stats['replayed']} replayed, {stats['cached']} cached) in {compiled * 1000:.1f}ms")
+
+    if args.diff:
+        started = time.perf_counter()
+        actual = dump_schema(args.diff)
+        tables = set(actual.tables) | set(model.tables) if args.all_tables else None
+        drift = diff_models(model, actual, tables)
+        elapsed = time.perf_counter() - started
+        print(f"📦 {len(actual.tables)} CREATE TABLE in {args.diff} ({elapsed * 1000:.1f}ms)")
+        for table, kind, detail in drift:
+            print(f"   ⚠️  {table}: {kind} {detail}")
+        if drift:
+            print(f"❌ {len(drift)} differences")
+            sys.exit(1)
+        print("✅ No drift")
@@ -0,0 +1,295 @@
+"""
+Fingerprint and latency report over the .manus/db query logs.
+
+Every db-query-*.json record holds one query run against the database:
+`query`, `rows`, `stderr`, `execution_time_ms` for completed runs, or
+`returncode` and `logs` for runs the client rejected. Queries are normalized
+into fingerprints (literals replaced by ?, IN-lists and multi-row VALUES
+collapsed) and grouped by fingerprint and by touched table:
+
+    python query_log.py                      # top fingerprints by p95
+    python query_log.py --by table --sort total
+    python query_log.py --json > report.json
+
+Records are read one file at a time and latencies go into fixed-size
+log-scale histograms, so memory depends on the number of distinct
+fingerprints, not on the number of records.
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+
+DEFAULT_LOG_DIR = '.manus/db'
+
+TOKEN = re.compile(r"""
+    (?P<comment>--[^\n]*|\#[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*")
+  | (?P<ident>`[^`]*`)
+  | (?P<number>(?<![\w.])-?(?:0x[0-9a-fA-F]+|\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)(?![\w.]))
+  | (?P<word>[A-Za-z_][\w$]*)
+  | (?P<space>\s+)
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+IN_LIST = re.compile(r'\bin \(\?(?:, \?)*\)')
+# A row of placeholders and argument-less calls such as now()
+ROW = r'\((?:[^()]|\(\))*\)'
+VALUES_LIST = re.compile(rf'\bvalues ({ROW})(?:, {ROW})*')
+TABLE_REF = re.compile(
+    r'(?:(?<!key )\b(?:from|join|into|update|table(?: if (?:not )?exists)?)|^\s*(?:describe|desc))\s+`?([A-Za-z_][\w$]*)`?(?:\s*\.\s*`?([A-Za-z_][\w$]*)`?)?',
+    re.IGNORECASE | re.MULTILINE,
+)
+NOT_TABLES = {'select', 'set', 'where', 'values', 'dual', 'information_schema'}
+
+
+def normalize(query):
+    """Lower-cased query with literals replaced by `?` and whitespace collapsed"""
+    parts = []
+    for m in TOKEN.finditer(query):
+        kind = m.lastgroup
+        if kind in ('comment', 'space'):
+            if parts and parts[-1] != ' ':
+                parts.append(' ')
+        elif kind in ('string', 'number'):
+            parts.append('?')
+        elif kind == 'ident':
+            parts.append(m.group()[1:-1].lower())
+        elif kind == 'word':
+            parts.append(m.group().lower())
+        else:
+            ch = m.group()
+            # No space before , ) ; and none after (
+            if ch in ',);' and parts and parts[-1] == ' ':
+                parts.pop()
+            parts.append(ch)
+            if ch == ',':
+                parts.append(' ')
+    text = ''.join(parts).strip()
+    return re.sub(r'\( ', '(', re.sub(r' +', ' ', text)).rstrip(';').strip()
+
+
+def fingerprint(query):
+    """Normalized query with IN-lists and multi-row VALUES collapsed"""
+    text = normalize(query)
+    text = IN_LIST.sub('in (?+)', text)
+    return VALUES_LIST.sub(lambda m: 'values ' + m.group(1), text)
+
+
+def tables(query):
+    """Table names a query reads or writes, in order of first mention"""
+    found = []
+    for m in TABLE_REF.finditer(TOKEN.sub(_strip_literals, query)):
+        name = (m.group(2) or m.group(1))
+        if name.lower() not in NOT_TABLES and name not in found:
+            found.append(name)
+    return found
+
+
+def _strip_literals(m):
+    if m.lastgroup in ('string', 'comment'):
+        return "''"
+    if m.lastgroup == 'ident':
+        return m.group()[1:-1]
+    return m.group()
+
+
+class LatencyHistogram:
+    """Log-scale histogram: ~2% relative error on quantiles, constant memory"""
+
+    GROWTH = 1.04
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def add(self, value):
+        value = max(float(value), 0.0)
+        bucket = -1 if value < 1 else int(math.log(value, self.GROWTH))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen > rank:
+                if bucket < 0:
+                    return self.min
+                # Bucket midpoint, clamped to the exact extremes
+                return min(max(self.GROWTH ** (bucket + 0.5), self.min), self.max)
+        return self.max
+
+
+class QueryStats:
+    """Counters for one group of records"""
+
+    def __init__(self, example=None):
+        self.example = example
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.latency = LatencyHistogram()
+
+    def add(self, record):
+        self.count += 1
+        if record.error:
+            self.errors += 1
+        if record.rows:
+            self.rows += record.rows
+        if record.elapsed_ms is not None:
+            self.latency.add(record.elapsed_ms)
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'error_rate': round(self.errors / self.count, 4) if self.count else 0.0,
+            'rows': self.rows,
+            'timed': self.latency.count,
+            'total_ms': round(self.latency.total, 1),
+            'p50_ms': _round(self.latency.quantile(0.5)),
+            'p95_ms': _round(self.latency.quantile(0.95)),
+            'max_ms': _round(self.latency.max if self.latency.count else None),
+        }
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+class QueryRecord:
+    """One db-query-*.json log entry"""
+
+    __slots__ = ('path', 'query', 'elapsed_ms', 'rows', 'error')
+
+    def __init__(self, path, data):
+        self.path = path
+        self.query = data.get('query') or ''
+        elapsed = data.get('execution_time_ms')
+        try:
+            self.elapsed_ms = float(elapsed) if elapsed not in (None, '') else None
+        except ValueError:
+            self.elapsed_ms = None
+        self.rows = _row_count(data.get('rows'))
+        self.error = _error_text(data)
+
+
+def _row_count(rows):
+    if isinstance(rows, str):
+        try:
+            rows = json.loads(rows) if rows.strip() else []
+        except ValueError:
+            return 0
+    return len(rows) if isinstance(rows, list) else 0
+
+
+def _error_text(data):
+    """The error a record reports, or None"""
+    if (data.get('stderr') or '').strip():
+        return data['stderr'].strip()
+    returncode = data.get('returncode')
+    if returncode not in (None, '', 0, '0'):
+        logs = data.get('logs') or []
+        if isinstance(logs, str):
+            try:
+                logs = json.loads(logs)
+            except ValueError:
+                logs = [logs]
+        return ' '.join(str(line) for line in logs).strip() or f"exit code {returncode}"
+    return None
+
+
+def iter_records(log_dir=DEFAULT_LOG_DIR, pattern=re.compile(r'db-query-.*\.json$')):
+    """Yield a QueryRecord per log file, reading one file at a time"""
+    for entry in os.scandir(log_dir):
+        if not (entry.is_file() and pattern.match(entry.name)):
+            continue
+        path = entry.path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Skipping {path}: {e}", file=sys.stderr)
+            continue
+        if isinstance(data, dict) and data.get('query'):
+            yield QueryRecord(path, data)
+
+
+def analyze(records):
+    """Group records by fingerprint and by table; returns ({fp: stats}, {table: stats})"""
+    by_fingerprint = {}
+    by_table = {}
+    for record in records:
+        fp = fingerprint(record.query)
+        if fp not in by_fingerprint:
+            by_fingerprint[fp] = QueryStats(example=record.path)
+        by_fingerprint[fp].add(record)
+        for table in tables(record.query) or ['(none)']:
+            if table not in by_table:
+                by_table[table] = QueryStats()
+            by_table[table].add(record)
+    return by_fingerprint, by_table
+
+
+SORT_KEYS = {
+    'p95': lambda s: (s['p95_ms'] or 0, s['max_ms'] or 0),
+    'max': lambda s: s['max_ms'] or 0,
+    'total': lambda s: s['total_ms'],
+    'count': lambda s: s['count'],
+    'errors': lambda s: (s['errors'], s['count']),
+}
+
+
+def build_report(groups, sort='p95', top=None):
+    rows = [dict(key=key, **stats.summary(), example=stats.example) for key, stats in groups.items()]
+    rows.sort(key=lambda row: SORT_KEYS[sort](row), reverse=True)
+    return rows[:top] if top else rows
+
+
+def print_report(rows, width=90):
+    print(f"{'count':>6} {'err%':>6} {'rows':>7} {'p50':>8} {'p95':>8} {'max':>8}  query")
+    for row in rows:
+        key = row['key'] if len(row['key']) <= width else row['key'][:width - 1] + '…'
+        p50 = '-' if row['p50_ms'] is None else f"{row['p50_ms']:.0f}"
+        p95 = '-' if row['p95_ms'] is None else f"{row['p95_ms']:.0f}"
+        top = '-' if row['max_ms'] is None else f"{row['max_ms']:.0f}"
+        print(f"{row['count']:>6} {row['error_rate'] * 100:>5.1f}% {row['rows']:>7} "
+              f"{p50:>8} {p95:>8} {top:>8}  {key}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Fingerprint and latency report for query logs")
+    parser.add_argument('log_dir', nargs='?', default=DEFAULT_LOG_DIR, help='directory of db-query-*.json')
+    parser.add_argument('--by', choices=['fingerprint', 'table'], default='fingerprint')
+    parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='p95')
+    parser.add_argument('--top', type=int, default=20, help='rows to show (0 for all)')
+    parser.add_argument('--json', action='store_true', help='print both groupings as JSON')
+    args = parser.parse_args()
+
+    by_fingerprint, by_table = analyze(iter_records(args.log_dir))
+
+    if args.json:
+        print(json.dumps({
+            'fingerprints': build_report(by_fingerprint, args.sort, args.top),
+            'tables': build_report(by_table, args.sort, args.top),
+        }, ensure_ascii=False, indent=2))
+        sys.exit(0)
+
+    groups = by_fingerprint if args.by == 'fingerprint' else by_table
+    total = sum(stats.count for stats in by_fingerprint.values())
+    errors = sum(stats.errors for stats in by_fingerprint.values())
+    print(f"📊 {total} queries, {len(by_fingerprint)} fingerprints, {len(by_table)} tables, "
+          f"{errors} failed\n")
+    print_report(build_report(groups, args.sort, args.top))
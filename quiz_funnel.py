@@ -0,0 +1,289 @@
+"""
+Funnel and drop-off metrics for every quiz and time window in one pass.
+
+calculatePerformanceMetrics(quizId, hours) in server/performanceMonitoring.ts
+queries quiz_sessions and quiz_question_events per quiz and per window.
+This computes the same numbers for all quizzes and several windows at once
+from a dump or a columnar snapshot:
+
+    python quiz_funnel.py snapshot/                     # columnar_snapshot directory
+    python quiz_funnel.py database_COMPLETE_WITH_ALL_DATA.sql --window 24 --window 168
+    python quiz_funnel.py snapshot/ --alerts --min-completion 30 --max-drop-off 50
+
+Rows are held as integer-coded arrays (quiz id, question id, event type
+code, epoch seconds). Each row's window bucket is found with one bisect
+against the sorted window cutoffs. Counts are then a group-by over packed
+integer keys (quiz, question, event type, bucket) with Counter. A row
+falls in every window whose cutoff is at or before its time, so per-window
+totals are suffix sums over the buckets.
+
+Output (quiz_funnel.json) is one row per quiz and window, the shape
+checkPerformanceAlerts() works with:
+
+    quizId, quizName, hours, totalSessions, completedSessions, completionRate,
+    dropOffPoints: [{questionId, views, answers, skips, dropOffRate, avgTimeSpent}]
+
+Rates are percentages. dropOffPoints lists the questions with views, worst
+first, as in the TS code. avgTimeSpent averages timeSpent over the
+`answered` events.
+"""
+import argparse
+import array
+import datetime
+import json
+import os
+from bisect import bisect_right
+from collections import Counter
+from itertools import compress, repeat
+from operator import add, mul
+
+from columnar_snapshot import NAT, Snapshot
+from sql_dump import DumpReader
+
+DEFAULT_WINDOWS = [1, 24, 168, 720]
+DEFAULT_OUTPUT = 'quiz_funnel.json'
+EVENT_TYPES = ['viewed', 'answered', 'skipped']
+VIEWED, ANSWERED, SKIPPED = range(3)
+QUESTION_RADIX = 1 << 32
+
+
+def _epoch(value):
+    """Epoch seconds (UTC) of a dump timestamp string/datetime, or None"""
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        moment = value
+    else:
+        text = value.decode() if isinstance(value, bytes) else str(value)
+        if text.startswith('0000-00-00'):
+            return None
+        moment = datetime.datetime.fromisoformat(text)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return int(moment.timestamp())
+
+
+class FunnelData:
+    """quiz_sessions and quiz_question_events as parallel integer arrays"""
+
+    def __init__(self):
+        self.session_quiz = array.array('q')
+        self.session_started = array.array('q')
+        self.session_completed = array.array('b')
+        self.event_quiz = array.array('q')
+        self.event_question = array.array('q')
+        self.event_type = array.array('b')
+        self.event_time_spent = array.array('q')
+        self.event_timestamp = array.array('q')
+        self.quiz_names = {}
+
+    @classmethod
+    def from_dump(cls, path):
+        data = cls()
+        reader = DumpReader(path, tables=['quiz_sessions', 'quiz_question_events', 'quizzes'], typed=False)
+        event_codes = {name: code for code, name in enumerate(EVENT_TYPES)}
+        positions = {}
+        for table, row in reader:
+            if table not in positions:
+                names = reader.columns[table]
+                positions[table] = {name: names.index(name) for name in names}
+            pos = positions[table]
+            if table == 'quiz_sessions':
+                started = _epoch(row[pos['startedAt']])
+                if started is None:
+                    continue
+                data.session_quiz.append(int(row[pos['quizId']]))
+                data.session_started.append(started)
+                data.session_completed.append(_epoch(row[pos['completedAt']]) is not None)
+            elif table == 'quiz_question_events':
+                code = event_codes.get(row[pos['eventType']])
+                timestamp = _epoch(row[pos['timestamp']])
+                if code is None or timestamp is None:
+                    continue
+                data.event_quiz.append(int(row[pos['quizId']]))
+                data.event_question.append(int(row[pos['questionId']]))
+                data.event_type.append(code)
+                data.event_time_spent.append(int(row[pos['timeSpent']] or 0)
+                                             if 'timeSpent' in pos else 0)
+                data.event_timestamp.append(timestamp)
+            else:
+                data.quiz_names[int(row[pos['id']])] = row[pos['name']]
+        return data
+
+    @classmethod
+    def from_snapshot(cls, path):
+        data = cls()
+        snapshot = Snapshot(path)
+        tables = snapshot.tables()
+        if 'quiz_sessions' in tables:
+            started = snapshot.column('quiz_sessions', 'startedAt')
+            completed = snapshot.column('quiz_sessions', 'completedAt')
+            keep = [value != NAT for value in started]
+            data.session_quiz = array.array('q', compress(snapshot.column('quiz_sessions', 'quizId'), keep))
+            data.session_started = array.array('q', compress(started, keep))
+            data.session_completed = array.array('b', compress((value != NAT for value in completed), keep))
+        if 'quiz_question_events' in tables:
+            # Dictionary codes of the snapshot -> EVENT_TYPES codes (-1: NULL or unknown)
+            words = snapshot.dictionary('quiz_question_events', 'eventType')
+            translate = [EVENT_TYPES.index(word) if word in EVENT_TYPES else -1 for word in words] + [-1]
+            types = [translate[code] for code in snapshot.column('quiz_question_events', 'eventType')]
+            keep = [code >= 0 for code in types]
+            time_spent = snapshot.column('quiz_question_events', 'timeSpent')
+            valid = snapshot.valid('quiz_question_events', 'timeSpent')
+            if valid is not None:
+                time_spent = [value if ok else 0 for value, ok in zip(time_spent, valid)]
+            data.event_quiz = array.array('q', compress(snapshot.column('quiz_question_events', 'quizId'), keep))
+            data.event_question = array.array(
+                'q', compress(snapshot.column('quiz_question_events', 'questionId'), keep))
+            data.event_type = array.array('b', compress(types, keep))
+            data.event_time_spent = array.array('q', compress(time_spent, keep))
+            data.event_timestamp = array.array(
+                'q', compress(snapshot.column('quiz_question_events', 'timestamp'), keep))
+        if 'quizzes' in tables:
+            data.quiz_names = dict(zip(snapshot.values('quizzes', 'id'), snapshot.values('quizzes', 'name')))
+        snapshot.close()
+        return data
+
+
+def _bucket_keys(prefix_keys, times, cutoffs):
+    """prefix * (len(cutoffs) + 1) + number of cutoffs <= time, per row"""
+    radix = len(cutoffs) + 1
+    return array.array('q', map(add, map(mul, prefix_keys, repeat(radix)),
+                                map(bisect_right, repeat(cutoffs), times)))
+
+
+def compute_funnels(data, windows=DEFAULT_WINDOWS, now=None):
+    """Result rows for every quiz seen and every window (hours)"""
+    now = int(now if now is not None else datetime.datetime.now(datetime.timezone.utc).timestamp())
+    hours = sorted(set(windows), reverse=True)
+    cutoffs = [now - h * 3600 for h in hours]           # ascending
+    radix = len(cutoffs) + 1
+
+    # Sessions: group by (quiz, bucket)
+    session_keys = _bucket_keys(data.session_quiz, data.session_started, cutoffs)
+    sessions = Counter(session_keys)
+    completed = Counter(compress(session_keys, data.session_completed))
+
+    # Events: group by (quiz, question, type, bucket); time spent summed for answered events
+    event_prefix = map(add, map(mul, map(add, map(mul, data.event_quiz, repeat(QUESTION_RADIX)),
+                                         data.event_question), repeat(len(EVENT_TYPES))),
+                       data.event_type)
+    event_keys = _bucket_keys(event_prefix, data.event_timestamp, cutoffs)
+    events = Counter(event_keys)
+    time_spent = {}
+    answered = [code == ANSWERED for code in data.event_type]
+    for key, spent in zip(compress(event_keys, answered), compress(data.event_time_spent, answered)):
+        time_spent[key] = time_spent.get(key, 0) + spent
+
+    # Unpack into per quiz / question / bucket tables
+    session_totals = {}
+    for key, count in sessions.items():
+        quiz, bucket = divmod(key, radix)
+        entry = session_totals.setdefault(quiz, [[0] * radix, [0] * radix])
+        entry[0][bucket] += count
+        entry[1][bucket] += completed.get(key, 0)
+    questions = {}
+    for key, count in events.items():
+        rest, bucket = divmod(key, radix)
+        rest, event_type = divmod(rest, len(EVENT_TYPES))
+        quiz, question = divmod(rest, QUESTION_RADIX)
+        entry = questions.setdefault(quiz, {}).setdefault(
+            question, [[0] * radix for _ in range(len(EVENT_TYPES) + 1)])
+        entry[event_type][bucket] += count
+        if event_type == ANSWERED:
+            entry[-1][bucket] += time_spent.get(key, 0)
+
+    rows = []
+    for quiz in sorted(set(session_totals) | set(questions)):
+        totals = session_totals.get(quiz, [[0] * radix, [0] * radix])
+        for j, window in enumerate(hours):
+            # Rows with bucket > j are inside window j
+            total = sum(totals[0][j + 1:])
+            done = sum(totals[1][j + 1:])
+            drop_offs = []
+            for question, counts in questions.get(quiz, {}).items():
+                views, answers, skips, spent = (sum(series[j + 1:]) for series in counts)
+                if not views:
+                    continue
+                drop_offs.append({
+                    'questionId': question,
+                    'views': views,
+                    'answers': answers,
+                    'skips': skips,
+                    'dropOffRate': round((views - answers) / views * 100, 2),
+                    'avgTimeSpent': round(spent / answers, 1) if answers else None,
+                })
+            drop_offs.sort(key=lambda point: (-point['dropOffRate'], point['questionId']))
+            rows.append({
+                'quizId': quiz,
+                'quizName': data.quiz_names.get(quiz),
+                'hours': window,
+                'totalSessions': total,
+                'completedSessions': done,
+                'completionRate': round(done / total * 100, 2) if total else 0,
+                'dropOffPoints': drop_offs,
+            })
+    return rows
+
+
+def alerts(rows, min_completion, max_drop_off, hours=24):
+    """(row, messages) for rows that checkPerformanceAlerts() would alert on"""
+    found = []
+    for row in rows:
+        if row['hours'] != hours:
+            continue
+        messages = []
+        if row['completionRate'] < min_completion:
+            messages.append(f"completion {row['completionRate']:.1f}% < {min_completion}%")
+        high = [point for point in row['dropOffPoints'] if point['dropOffRate'] > max_drop_off]
+        if high:
+            messages.append(f"drop-off > {max_drop_off}% on {len(high)} questions: " + ', '.join(
+                f"#{point['questionId']} {point['dropOffRate']:.1f}%" for point in high[:3]))
+        if messages:
+            found.append((row, messages))
+    return found
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Funnel and drop-off metrics for all quizzes")
+    parser.add_argument('source', help='mysqldump file or columnar snapshot directory')
+    parser.add_argument('--window', type=int, action='append', metavar='HOURS',
+                        help=f"time window in hours (repeatable, default {DEFAULT_WINDOWS})")
+    parser.add_argument('--now', help='end of the windows, ISO time (default: now, UTC)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--alerts', action='store_true', help='list quizzes over the alert thresholds')
+    parser.add_argument('--alert-window', type=int, default=24, help='window the alerts look at')
+    parser.add_argument('--min-completion', type=float, default=30.0)
+    parser.add_argument('--max-drop-off', type=float, default=50.0)
+    args = parser.parse_args()
+
+    windows = args.window or DEFAULT_WINDOWS
+    if args.alerts and args.alert_window not in windows:
+        windows = windows + [args.alert_window]
+    now = _epoch(args.now) if args.now else None
+
+    data = FunnelData.from_snapshot(args.source) if os.path.isdir(args.source) else FunnelData.from_dump(args.source)
+    rows = compute_funnels(data, windows, now)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'now': datetime.datetime.fromtimestamp(
+                now if now is not None else datetime.datetime.now(datetime.timezone.utc).timestamp(),
+                datetime.timezone.utc).isoformat(timespec='seconds'),
+            'windows': sorted(set(windows)),
+            'rows': rows,
+        }, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+    quizzes = len({row['quizId'] for row in rows})
+    print(f"✅ {len(data.session_quiz)} sessions, {len(data.event_quiz)} question events → "
+          f"{quizzes} quizzes x {len(set(windows))} windows in {args.output}")
+
+    if args.alerts:
+        found = alerts(rows, args.min_completion, args.max_drop_off, args.alert_window)
+        for row, messages in found:
+            print(f"⚠️  quiz {row['quizId']} ({row['quizName'] or '?'}), {row['totalSessions']} sessions: "
+                  + '; '.join(messages))
+        if not found:
+            print(f"✅ No quiz over the thresholds in the last {args.alert_window}h")
@@ -1,29 +1,27 @@
+from tsx_anchors import AnchorIndex, EditBatch
+
 # Read CRM.tsx
 with open('client/src/pages/CRM.tsx', 'r', encoding='utf-8') as f:
     content = f.read()
 
-# Find and remove the FIRST occurrence of bulk handlers (the one we just added incorrectly)
-# Keep only the SECOND occurrence
-import re
-
-# Pattern to match the bulk handlers block
-pattern = r'  // Bulk operations mutations\n  const bulkAssignMutation.*?  };\n\n'
+# Find declarations that appear more than once (e.g. bulk handlers inserted twice)
+# and keep only the LAST occurrence of each
+index = AnchorIndex(content, 'client/src/pages/CRM.tsx')
+batch = EditBatch(index)
 
-# Find all matches
-matches = list(re.finditer(pattern, content, re.DOTALL))
+removed = set()
+for name in index.duplicates('decl'):
+    for occurrence, anchor in enumerate(index.find(name)[:-1]):
+        if anchor.start not in removed:
+            removed.add(anchor.start)
+            batch.delete(name, occurrence)
+            print(f"✅ Removed duplicate {name} at line {anchor.line}")
 
-if len(matches) >= 2:
-    # Remove the first match (keep the second one)
-    first_match = matches[0]
-    content = content[:first_match.start()] + content[first_match.end():]
-    print(f"✅ Removed first duplicate at position {first_match.start()}")
-elif len(matches) == 1:
-    print("⚠️  Only one occurrence found")
-else:
-    print("❌ No bulk handlers found")
+if not removed:
+    print("⏭️  No duplicate declarations found")
 
 # Write back
 with open('client/src/pages/CRM.tsx', 'w', encoding='utf-8') as f:
-    f.write(content)
+    f.write(batch.apply())
 
 print("✅ Cleaned up duplicates")
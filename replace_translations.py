@@ -1,13 +1,15 @@
 import re
-import json
+
+import locale_index
+from codemod_manifest import Manifest, file_digest, rules_hash
+from locale_index import LANGUAGES, LocaleIndex
+from locale_store import LocaleStore
 
 # Read translation files
-with open('client/src/locales/ua.json', 'r', encoding='utf-8') as f:
-    ua_trans = json.load(f)
-with open('client/src/locales/ru.json', 'r', encoding='utf-8') as f:
-    ru_trans = json.load(f)
-with open('client/src/locales/en.json', 'r', encoding='utf-8') as f:
-    en_trans = json.load(f)
+store = LocaleStore()
+
+# Flattened value -> key index, built once for the whole run
+index = LocaleIndex(store.trees)
 
 # Files to process
 files = [
@@ -20,21 +22,41 @@ pattern = re.compile(r"t\(['\"]([^'\"]+)['\"],\s*['\"]([^'\"]+)['\"],\s*['\"]([^
 
 def find_or_create_key(uk_text, ru_text, en_text):
     """Find existing key or create new one"""
-    # Check if translation already exists
-    for key, value in en_trans.items():
-        if isinstance(value, str) and value == en_text:
-            return key
+    # Check if translation already exists (at any nesting depth)
+    key = index.find(uk_text, ru_text, en_text)
+    if key:
+        return key
     
     # Create new key based on English text
     # Convert to camelCase key
     key = en_text.lower().replace(' ', '_').replace('-', '_')
     key = re.sub(r'[^a-z0-9_]', '', key)
     
-    return f"common.{key}"
+    # Same English text with other uk/ru translations: don't reuse that key
+    candidate = f"common.{key}"
+    suffix = 2
+    while candidate in index:
+        candidate = f"common.{key}_{suffix}"
+        suffix += 1
+    return candidate
+
+# Skip files this rule set already processed in an earlier run
+manifest = Manifest()
+
+def current_rules():
+    """Rule set hash, including the key lookup and the locale files it reads"""
+    return rules_hash(pattern, find_or_create_key, locale_index, [file_digest(store.path(lang)) for lang in LANGUAGES])
+
+rules = current_rules()
+processed = []
 
 for file_path in files:
     print(f"\n📝 Processing {file_path}...")
     
+    if manifest.is_fresh(file_path, rules):
+        print(f"   ⏭️  Unchanged since last run")
+        continue
+    
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
@@ -42,6 +64,8 @@ for file_path in files:
     
     if not matches:
         print(f"   No old-style translations found")
+        manifest.record(file_path, rules)
+        processed.append(file_path)
         continue
     
     print(f"   Found {len(matches)} old-style translations")
@@ -57,22 +81,12 @@ for file_path in files:
         new_call = f"t('{key}')"
         
         # Add to translation files if doesn't exist
-        if key not in en_trans:
+        if key not in index:
             # Add to nested structure
-            parts = key.split('.')
-            if len(parts) == 2:
-                section, subkey = parts
-                if section not in ua_trans:
-                    ua_trans[section] = {}
-                if section not in ru_trans:
-                    ru_trans[section] = {}
-                if section not in en_trans:
-                    en_trans[section] = {}
-                
-                ua_trans[section][subkey] = uk_text
-                ru_trans[section][subkey] = ru_text
-                en_trans[section][subkey] = en_text
-                print(f"   ✅ Added key: {key}")
+            for lang, text in (('uk', uk_text), ('ru', ru_text), ('en', en_text)):
+                store.set(lang, key, text, source=file_path)
+            index.add(key, uk_text, ru_text, en_text)
+            print(f"   ✅ Added key: {key}")
         
         # Replace in content
         new_content = new_content.replace(old_call, new_call)
@@ -82,14 +96,21 @@ for file_path in files:
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(new_content)
     
+    manifest.record(file_path, rules)
+    processed.append(file_path)
     print(f"   ✅ Updated {file_path}")
 
 # Write updated translation files
-with open('client/src/locales/ua.json', 'w', encoding='utf-8') as f:
-    json.dump(ua_trans, f, ensure_ascii=False, indent=2)
-with open('client/src/locales/ru.json', 'w', encoding='utf-8') as f:
-    json.dump(ru_trans, f, ensure_ascii=False, indent=2)
-with open('client/src/locales/en.json', 'w', encoding='utf-8') as f:
-    json.dump(en_trans, f, ensure_ascii=False, indent=2)
+store.report_conflicts()
+store.save()
+
+# Keys added above changed the locale files: the processed files are
+# up to date with the new contents, so the next run can skip them
+new_rules = current_rules()
+if new_rules != rules:
+    for file_path in processed:
+        manifest.record(file_path, new_rules)
+
+manifest.save()
 
 print("\n✅ All files processed and translation files updated!")
@@ -0,0 +1,602 @@
+"""
+Parallel, dependency-ordered restore of a mysqldump.
+
+Instead of piping the whole dump serially into `mysql`, split it into
+per-table schema files and bounded-size data chunks, order the tables by
+their foreign keys, and load each level of independent tables over N
+connections:
+
+    python restore_planner.py split database_COMPLETE_WITH_ALL_DATA.sql restore/
+    python restore_planner.py run restore/ --jobs 8 --sqlite /tmp/restore.db
+    python restore_planner.py run restore/ --jobs 8 --mysql -- -u root -p pikaleads
+
+`split` writes restore/plan.json:
+
+    levels      [[table, ...], ...] - every FK parent is in an earlier level
+    tables      schema file, data chunk files, rows and bytes per table
+    cycles      tables whose foreign keys form a cycle (loaded last)
+
+An existing output directory is only replaced when it holds an earlier
+plan; any other non-empty directory needs --force.
+
+Foreign keys come from CREATE TABLE statements in the dump, from the
+ALTER TABLE / CREATE TABLE statements of the drizzle/*.sql migrations and
+from the .references() of drizzle/schema.ts.
+Tables the dump has no CREATE TABLE for get one generated from
+drizzle/schema.ts. Chunk files are plain SQL (`SET ...; INSERT ...;`) that
+`mysql` accepts directly. A plan may also list `.tsv` chunks (a header
+line of column names, then LOAD DATA rows), as synthetic_data.py writes;
+those are loaded with LOAD DATA LOCAL INFILE.
+
+`run` executes the plan. The SQLite target is a local stand-in: it creates
+each table from its column list and re-reads the chunks with sql_dump, so
+the plan and the per-table throughput report can be checked without a
+MySQL server.
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from drizzle_schema import load_schema, sql_type
+from sql_dump import CREATE_TABLE, DumpReader, parse_create_table
+
+PLAN_VERSION = 1
+MIGRATION_GLOBS = ['drizzle/*.sql', 'drizzle/migrations/*.sql']
+CHUNK_BYTES = 64 << 20
+STATEMENT_BYTES = 1 << 20
+
+CHUNK_HEADER = ("/*!40101 SET NAMES utf8mb4 */;\n"
+                "SET FOREIGN_KEY_CHECKS=0;\n"
+                "SET UNIQUE_CHECKS=0;\n")
+
+FOREIGN_KEY = re.compile(
+    r'(?:CONSTRAINT\s+`?(\w+)`?\s+)?FOREIGN\s+KEY\s*\(([^)]*)\)\s*REFERENCES\s+`?(\w+)`?\s*\(([^)]*)\)',
+    re.IGNORECASE,
+)
+ALTER_TABLE = re.compile(r'ALTER\s+TABLE\s+`?(\w+)`?(.*)', re.IGNORECASE | re.DOTALL)
+DROP_FOREIGN_KEY = re.compile(r'DROP\s+FOREIGN\s+KEY\s+`?(\w+)`?', re.IGNORECASE)
+DROP_TABLE = re.compile(r'DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?`?(\w+)`?', re.IGNORECASE)
+RENAME_TABLE = re.compile(r'RENAME\s+TABLE\s+`?(\w+)`?\s+TO\s+`?(\w+)`?', re.IGNORECASE)
+
+
+# SQL literals
+
+def sql_literal(value):
+    """MySQL literal for a value decoded by DumpReader(typed=False)"""
+    if value is None:
+        return 'NULL'
+    if value is True or value is False:
+        return '1' if value else '0'
+    if isinstance(value, (int, Decimal)):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + value.hex() if value else "''"
+    text = (str(value).replace('\\', '\\\\').replace("'", "\\'").replace('\0', '\\0')
+            .replace('\n', '\\n').replace('\r', '\\r').replace('\x1a', '\\Z'))
+    return "'" + text + "'"
+
+
+def quote_identifier(name):
+    return '`' + name.replace('`', '``') + '`'
+
+
+# LOAD DATA TSV chunks: a header line of column names, then one row per line
+# in MySQL's default format (tab-separated, backslash escapes, \N for NULL)
+
+TSV_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+TSV_UNESCAPE = re.compile(r'\\(.)')
+TSV_UNESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', '0': '\0'}
+
+
+def tsv_field(value):
+    """One LOAD DATA field for a value decoded by DumpReader(typed=False)"""
+    if value is None:
+        return '\\N'
+    if value is True or value is False:
+        return '1' if value else '0'
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode('utf-8', 'surrogateescape')
+    return str(value).translate(TSV_ESCAPES)
+
+
+def read_tsv(path):
+    """(column names, row iterator) of a TSV chunk; values are str or None"""
+    f = open(path, 'r', encoding='utf-8', newline='\n')
+    columns = f.readline().rstrip('\n').split('\t')
+
+    def rows():
+        with f:
+            for line in f:
+                yield tuple(None if field == '\\N' else
+                            TSV_UNESCAPE.sub(lambda m: TSV_UNESCAPES.get(m.group(1), m.group(1)), field)
+                            if '\\' in field else field
+                            for field in line.rstrip('\n').split('\t'))
+
+    return columns, rows()
+
+
+def load_data_sql(path, table, columns):
+    """LOAD DATA statement for a TSV chunk"""
+    return (f"LOAD DATA LOCAL INFILE {sql_literal(os.path.abspath(path))} INTO TABLE {quote_identifier(table)} "
+            f"CHARACTER SET utf8mb4 IGNORE 1 LINES ({', '.join(quote_identifier(c) for c in columns)})")
+
+
+# Foreign keys
+
+def split_statements(sql):
+    """Statements of a migration file (drizzle breakpoints or plain `;`)"""
+    parts = sql.split('--> statement-breakpoint') if 'statement-breakpoint' in sql else sql.split(';\n')
+    return [part.strip().rstrip(';') for part in parts if part.strip()]
+
+
+def _columns(text):
+    return [name.strip().strip('`') for name in text.split(',')]
+
+
+class ForeignKeyGraph:
+    """child table -> {constraint: (columns, parent, parent_columns)}"""
+
+    def __init__(self):
+        self.constraints = {}
+
+    def add(self, table, name, columns, parent, parent_columns):
+        name = name or f"{table}_{'_'.join(columns)}_{parent}_fk"
+        self.constraints.setdefault(table, {})[name] = (columns, parent, parent_columns)
+
+    def add_create_table(self, statement):
+        m = CREATE_TABLE.search(statement)
+        if not m:
+            return
+        table = m.group(1)
+        self.constraints.pop(table, None)
+        for fk in FOREIGN_KEY.finditer(statement[m.end():]):
+            self.add(table, fk.group(1), _columns(fk.group(2)), fk.group(3), _columns(fk.group(4)))
+
+    def apply(self, statement):
+        """Track one migration statement"""
+        if CREATE_TABLE.search(statement):
+            self.add_create_table(statement)
+            return
+        m = DROP_TABLE.match(statement)
+        if m:
+            self.constraints.pop(m.group(1), None)
+            return
+        m = RENAME_TABLE.match(statement)
+        if m:
+            old, new = m.groups()
+            if old in self.constraints:
+                self.constraints[new] = self.constraints.pop(old)
+            for constraints in self.constraints.values():
+                for name, (columns, parent, parent_columns) in list(constraints.items()):
+                    if parent == old:
+                        constraints[name] = (columns, new, parent_columns)
+            return
+        m = ALTER_TABLE.match(statement)
+        if m:
+            table, rest = m.groups()
+            for drop in DROP_FOREIGN_KEY.finditer(rest):
+                self.constraints.get(table, {}).pop(drop.group(1), None)
+            for fk in FOREIGN_KEY.finditer(rest):
+                self.add(table, fk.group(1), _columns(fk.group(2)), fk.group(3), _columns(fk.group(4)))
+
+    def load_migrations(self, patterns=MIGRATION_GLOBS):
+        files = sorted({path for pattern in patterns for path in glob.glob(pattern)},
+                       key=os.path.basename)
+        for path in files:
+            with open(path, 'r', encoding='utf-8') as f:
+                for statement in split_statements(f.read()):
+                    self.apply(statement)
+        return self
+
+    def parents(self, table):
+        return {parent for _, parent, _ in self.constraints.get(table, {}).values() if parent != table}
+
+    def edges(self):
+        return sorted((table, parent) for table in self.constraints for parent in self.parents(table))
+
+
+def restore_levels(tables, graph):
+    """Kahn levels over `tables`; returns (levels, cycle) where cycle lists unorderable tables"""
+    tables = set(tables)
+    parents = {table: graph.parents(table) & tables for table in tables}
+    levels = []
+    done = set()
+    while len(done) < len(tables):
+        level = sorted(table for table in tables - done if parents[table] <= done)
+        if not level:
+            break
+        levels.append(level)
+        done.update(level)
+    cycle = sorted(tables - done)
+    if cycle:
+        levels.append(cycle)
+    return levels, cycle
+
+
+# Splitting
+
+class ChunkWriter:
+    """Bounded-size INSERT chunk files for one table"""
+
+    def __init__(self, out_dir, table, chunk_bytes, statement_bytes):
+        self.out_dir = out_dir
+        self.table = table
+        self.chunk_bytes = chunk_bytes
+        self.statement_bytes = statement_bytes
+        self.chunks = []              # {'file', 'rows', 'bytes'} per chunk file
+        self.rows = 0
+        self.bytes = 0
+        self._file = None
+        self._file_size = 0
+        self._statement_size = 0
+        self._prefix = None
+
+    def _open_chunk(self):
+        name = f"data/{self.table}.{len(self.chunks):04d}.sql"
+        self.chunks.append({'file': name, 'rows': 0, 'bytes': 0})
+        self._file = open(os.path.join(self.out_dir, name), 'w', encoding='utf-8')
+        self._file.write(CHUNK_HEADER)
+        self._file_size = len(CHUNK_HEADER)
+
+    def write(self, columns, row):
+        values = '(' + ','.join(sql_literal(value) for value in row) + ')'
+        prefix = (f"INSERT INTO {quote_identifier(self.table)} "
+                  f"({', '.join(quote_identifier(c) for c in columns)}) VALUES ")
+        size = len(values.encode('utf-8'))
+
+        if self._file is not None and self._statement_size and (
+                prefix != self._prefix or self._statement_size + size > self.statement_bytes):
+            self._end_statement()
+        if self._file is not None and not self._statement_size and self._file_size >= self.chunk_bytes:
+            self.close()
+        if self._file is None:
+            self._open_chunk()
+        if not self._statement_size:
+            self._file.write(prefix)
+            self._file_size += len(prefix)
+            self._statement_size = len(prefix)
+            self._prefix = prefix
+        else:
+            self._file.write(',')
+            size += 1
+        self._file.write(values)
+        self._file_size += size
+        self._statement_size += size
+        self.rows += 1
+        self.bytes += size
+        self.chunks[-1]['rows'] += 1
+        self.chunks[-1]['bytes'] += size
+
+    def _end_statement(self):
+        self._file.write(';\n')
+        self._file_size += 2
+        self._statement_size = 0
+
+    def close(self):
+        """Close the current chunk; the next row opens a new one"""
+        if self._file is not None:
+            if self._statement_size:
+                self._end_statement()
+            self._file.close()
+            self._file = None
+
+
+def mysql_create_table(table):
+    """CREATE TABLE for a drizzle_schema.Table (for dumps without schema statements)"""
+    lines = []
+    for column in table.columns:
+        parts = [quote_identifier(column.name), sql_type(column)]
+        if column.autoincrement:
+            parts.append('AUTO_INCREMENT')
+        if column.not_null:
+            parts.append('NOT NULL')
+        if column.default_now:
+            parts.append('DEFAULT (now())')
+        elif column.default is not None and column.kind not in ('text', 'json'):
+            parts.append('DEFAULT ' + sql_literal(column.default))
+        if column.on_update_now:
+            parts.append('ON UPDATE CURRENT_TIMESTAMP')
+        lines.append('  ' + ' '.join(parts))
+    if table.primary_key:
+        lines.append(f"  PRIMARY KEY ({', '.join(quote_identifier(c) for c in table.primary_key)})")
+    return (f"CREATE TABLE {quote_identifier(table.name)} (\n" + ',\n'.join(lines)
+            + "\n) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;\n")
+
+
+def prepare_plan_dir(out_dir, force=False):
+    """Create an empty plan directory with schema/ and data/
+
+    A directory holding an earlier plan (plan.json, or only the schema/ and
+    data/ of an interrupted one) is replaced; any other non-empty directory
+    raises FileExistsError unless `force` is set.
+    """
+    entries = set(os.listdir(out_dir)) if os.path.isdir(out_dir) else set()
+    if entries:
+        if not (force or 'plan.json' in entries or entries <= {'schema', 'data'}):
+            raise FileExistsError(f"{out_dir} is not empty and holds no plan.json; use --force to replace it")
+        shutil.rmtree(out_dir)
+    os.makedirs(os.path.join(out_dir, 'schema'), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, 'data'), exist_ok=True)
+
+
+def split_dump(dump_path, out_dir, chunk_bytes=CHUNK_BYTES, statement_bytes=STATEMENT_BYTES,
+               schema=None, graph=None, force=False):
+    """Write schema/, data/ and plan.json under `out_dir`; returns the plan"""
+    schema = schema or load_schema()
+    if graph is None:
+        graph = ForeignKeyGraph().load_migrations()
+        for table, column, parent, parent_column, _ in schema.foreign_keys():
+            graph.add(table, None, [column], parent, [parent_column])
+    prepare_plan_dir(out_dir, force)
+
+    reader = DumpReader(dump_path, typed=False)
+    writers = {}
+    current = None
+    for table, row in reader:
+        if table != current:
+            if current in writers:
+                writers[current].close()
+            current = table
+        writer = writers.get(table)
+        if writer is None:
+            writer = writers[table] = ChunkWriter(out_dir, table, chunk_bytes, statement_bytes)
+        writer.write(reader.columns[table], row)
+    if current in writers:
+        writers[current].close()
+
+    # CREATE TABLE from the dump where present, else from schema.ts
+    tables = {}
+    for name in sorted(set(writers) | set(reader.schemas)):
+        dump_schema = reader.schemas.get(name)
+        if dump_schema is not None:
+            ddl = dump_schema.statement + ';\n'
+            graph.add_create_table(dump_schema.statement)
+        elif name in schema.tables:
+            ddl = mysql_create_table(schema.tables[name])
+        else:
+            ddl = None
+        schema_file = None
+        if ddl:
+            schema_file = f"schema/{name}.sql"
+            with open(os.path.join(out_dir, schema_file), 'w', encoding='utf-8') as f:
+                f.write(CHUNK_HEADER + f"DROP TABLE IF EXISTS {quote_identifier(name)};\n" + ddl)
+        writer = writers.get(name)
+        tables[name] = {
+            'schema': schema_file,
+            'columns': reader.columns.get(name) or (dump_schema.column_names if dump_schema else []),
+            'chunks': writer.chunks if writer else [],
+            'rows': writer.rows if writer else 0,
+            'bytes': writer.bytes if writer else 0,
+        }
+
+    levels, cycle = restore_levels(tables, graph)
+    plan = {
+        'version': PLAN_VERSION,
+        'source': os.path.basename(dump_path),
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'levels': levels,
+        'cycles': cycle,
+        'foreign_keys': [[table, parent] for table, parent in graph.edges()
+                         if table in tables and parent in tables],
+        'tables': tables,
+    }
+    with open(os.path.join(out_dir, 'plan.json'), 'w', encoding='utf-8') as f:
+        json.dump(plan, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    return plan
+
+
+# Running
+
+SQLITE_AFFINITY = [
+    (re.compile(r'int|bool|year|bit', re.I), 'INTEGER'),
+    (re.compile(r'dec|numeric|float|double|real', re.I), 'NUMERIC'),
+    (re.compile(r'blob|binary', re.I), 'BLOB'),
+]
+
+
+def sqlite_value(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class SQLiteTarget:
+    """Local stand-in for MySQL: one SQLite connection per worker thread"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with sqlite3.connect(path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=300, check_same_thread=False)
+            conn.execute('PRAGMA synchronous=OFF')
+        return conn
+
+    def create_table(self, plan_dir, table, entry):
+        columns = entry['columns']
+        types = {}
+        if entry['schema']:
+            with open(os.path.join(plan_dir, entry['schema']), 'r', encoding='utf-8') as f:
+                parsed = parse_create_table(f.read())
+            if parsed:
+                types = {column.name: column.type for column in parsed.columns}
+                columns = columns or parsed.column_names
+        definitions = []
+        for name in columns:
+            affinity = next((aff for pattern, aff in SQLITE_AFFINITY
+                             if pattern.search(types.get(name, ''))), 'TEXT')
+            definitions.append(f'"{name}" {affinity}')
+        conn = self.connection()
+        conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        conn.execute(f'CREATE TABLE "{table}" ({", ".join(definitions)})')
+        conn.commit()
+
+    def load_chunk(self, plan_dir, table, chunk):
+        """Load one chunk file (INSERT statements or TSV); returns rows loaded"""
+        conn = self.connection()
+        path = os.path.join(plan_dir, chunk)
+        if chunk.endswith('.tsv'):
+            columns, source = read_tsv(path)
+        else:
+            reader = DumpReader(path, typed=False)
+            columns = None
+            source = (row for _, row in reader)
+        rows = 0
+        batch = []
+        statement = None
+        for row in source:
+            if statement is None:
+                names = ', '.join(f'"{name}"' for name in columns or reader.columns[table])
+                placeholders = ', '.join('?' * len(row))
+                statement = f'INSERT INTO "{table}" ({names}) VALUES ({placeholders})'
+            batch.append(tuple(sqlite_value(value) for value in row))
+            if len(batch) >= 5000:
+                conn.executemany(statement, batch)
+                rows += len(batch)
+                batch = []
+        if batch:
+            conn.executemany(statement, batch)
+            rows += len(batch)
+        conn.commit()
+        return rows
+
+
+class MySQLTarget:
+    """Pipes schema and chunk files into the `mysql` client, one process per file
+
+    load_chunk returns None: the row counts come from the plan.
+    """
+
+    def __init__(self, args):
+        self.args = ['mysql'] + list(args)
+
+    def _pipe(self, path):
+        with open(path, 'rb') as f:
+            result = subprocess.run(self.args, stdin=f, stderr=subprocess.PIPE)
+        if result.returncode:
+            raise RuntimeError(f"mysql failed on {path}: {result.stderr.decode('utf-8', 'replace').strip()}")
+
+    def create_table(self, plan_dir, table, entry):
+        if entry['schema']:
+            self._pipe(os.path.join(plan_dir, entry['schema']))
+
+    def load_chunk(self, plan_dir, table, chunk):
+        path = os.path.join(plan_dir, chunk)
+        if chunk.endswith('.tsv'):
+            with open(path, 'r', encoding='utf-8') as f:
+                columns = f.readline().rstrip('\n').split('\t')
+            args = [self.args[0], '--local-infile=1'] + self.args[1:] + ['-e', load_data_sql(path, table, columns)]
+            result = subprocess.run(args, stdin=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            if result.returncode:
+                raise RuntimeError(f"mysql failed on {path}: {result.stderr.decode('utf-8', 'replace').strip()}")
+        else:
+            self._pipe(path)
+        return None
+
+
+def run_plan(plan_dir, target, jobs=4):
+    """Create every table, then load level by level over `jobs` workers; returns stats per table"""
+    with open(os.path.join(plan_dir, 'plan.json'), 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+    tables = plan['tables']
+    stats = {table: {'rows': 0, 'bytes': entry['bytes'], 'chunks': len(entry['chunks']),
+                     'start': None, 'end': None} for table, entry in tables.items()}
+    lock = threading.Lock()
+
+    def load(table, chunk):
+        start = time.perf_counter()
+        rows = target.load_chunk(plan_dir, table, chunk['file'])
+        end = time.perf_counter()
+        with lock:
+            entry = stats[table]
+            entry['rows'] += chunk['rows'] if rows is None else rows
+            entry['start'] = start if entry['start'] is None else min(entry['start'], start)
+            entry['end'] = end if entry['end'] is None else max(entry['end'], end)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for level in plan['levels']:
+            list(pool.map(lambda table: target.create_table(plan_dir, table, tables[table]), level))
+        for level in plan['levels']:
+            # Largest tables first so the level isn't held up by one late big table
+            work = [(table, chunk) for table in sorted(level, key=lambda t: -tables[t]['bytes'])
+                    for chunk in tables[table]['chunks']]
+            for future in [pool.submit(load, table, chunk) for table, chunk in work]:
+                future.result()
+    elapsed = time.perf_counter() - started
+
+    for entry in stats.values():
+        seconds = (entry['end'] - entry['start']) if entry['start'] is not None else 0.0
+        entry['seconds'] = round(seconds, 4)
+        entry['rows_per_s'] = round(entry['rows'] / seconds) if seconds else None
+        entry['mb_per_s'] = round(entry['bytes'] / 1e6 / seconds, 2) if seconds else None
+        del entry['start'], entry['end']
+    return stats, elapsed
+
+
+def print_stats(stats, elapsed):
+    print(f"{'table':<32} {'rows':>9} {'MB':>8} {'seconds':>8} {'rows/s':>9} {'MB/s':>7}")
+    for table, entry in sorted(stats.items(), key=lambda item: -item[1]['bytes']):
+        if not entry['chunks']:
+            continue
+        print(f"{table:<32} {entry['rows']:>9} {entry['bytes'] / 1e6:>8.2f} {entry['seconds']:>8.3f} "
+              f"{entry['rows_per_s'] or '-':>9} {entry['mb_per_s'] or '-':>7}")
+    total_bytes = sum(entry['bytes'] for entry in stats.values())
+    print(f"\n✅ Restored {sum(entry['rows'] for entry in stats.values())} rows "
+          f"({total_bytes / 1e6:.2f} MB) in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Split a mysqldump and restore it in dependency order")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    split = commands.add_parser('split', help='write per-table schema/data chunks and plan.json')
+    split.add_argument('dump')
+    split.add_argument('out_dir')
+    split.add_argument('--chunk-mb', type=float, default=CHUNK_BYTES / (1 << 20),
+                       help='max size of one data chunk file')
+    split.add_argument('--statement-kb', type=float, default=STATEMENT_BYTES / 1024,
+                       help='max size of one INSERT statement')
+    split.add_argument('--force', action='store_true', help='replace out_dir even if it holds no earlier plan')
+
+    run = commands.add_parser('run', help='execute a plan')
+    run.add_argument('plan_dir')
+    run.add_argument('-j', '--jobs', type=int, default=4, help='concurrent connections')
+    target = run.add_mutually_exclusive_group(required=True)
+    target.add_argument('--sqlite', metavar='DB', help='SQLite stand-in database file')
+    target.add_argument('--mysql', nargs=argparse.REMAINDER, help='arguments for the mysql client')
+    args = parser.parse_args()
+
+    if args.command == 'split':
+        try:
+            plan = split_dump(args.dump, args.out_dir, int(args.chunk_mb * (1 << 20)),
+                              int(args.statement_kb * 1024), force=args.force)
+        except FileExistsError as e:
+            parser.error(str(e))
+        chunks = sum(len(entry['chunks']) for entry in plan['tables'].values())
+        print(f"✅ {len(plan['tables'])} tables, {chunks} chunks in {len(plan['levels'])} levels")
+        for i, level in enumerate(plan['levels']):
+            print(f"   level {i}: {', '.join(level)}")
+        if plan['cycles']:
+            print(f"⚠️  Foreign-key cycle, loaded last: {', '.join(plan['cycles'])}", file=sys.stderr)
+    else:
+        runner = SQLiteTarget(args.sqlite) if args.sqlite else MySQLTarget(args.mysql)
+        print_stats(*run_plan(args.plan_dir, runner, args.jobs))
@@ -0,0 +1,133 @@
+"""
+Single-pass multi-pattern rewrite engine for the translation codemods.
+
+The replacement table is compiled into one Aho-Corasick automaton and each
+file is rewritten in a single left-to-right scan. Matches are chosen
+leftmost-longest and never overlap, so a rule can't hit text that another
+rule has already rewritten (unlike chained `content.replace()` calls).
+"""
+
+
+class RewriteEngine:
+    """Compiled set of literal `old -> new` replacements"""
+
+    def __init__(self, replacements):
+        self.replacements = dict(replacements)
+        self.patterns = [p for p in self.replacements if p]
+        self._build()
+
+    def _build(self):
+        # Trie: per-state transition dict, depth, matched pattern index
+        goto = [{}]
+        depth = [0]
+        out = [-1]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    depth.append(depth[state] + 1)
+                    out.append(-1)
+                state = nxt
+            out[state] = index
+
+        # Failure links and output links (nearest proper suffix state that
+        # is itself a full pattern), computed breadth-first
+        fail = [0] * len(goto)
+        dict_link = [-1] * len(goto)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = link = goto[f].get(ch, 0)
+                dict_link[nxt] = link if out[link] >= 0 else dict_link[link]
+
+        self._goto = goto
+        self._depth = depth
+        self._out = out
+        self._fail = fail
+        self._dict_link = dict_link
+
+    def _longest_output(self, state):
+        """Longest pattern ending at the current position, or -1"""
+        if self._out[state] >= 0:
+            return self._out[state]
+        link = self._dict_link[state]
+        return self._out[link] if link >= 0 else -1
+
+    def find_matches(self, text):
+        """Yield non-overlapping (start, end, pattern) matches, leftmost-longest"""
+        if not self.patterns:
+            return
+        goto, fail, depth = self._goto, self._fail, self._depth
+        patterns = self.patterns
+        n = len(text)
+        state = 0
+        best = None  # (start, end, pattern_index)
+        i = 0
+        while True:
+            if i < n:
+                ch = text[i]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+
+                index = self._longest_output(state)
+                if index >= 0:
+                    end = i + 1
+                    start = end - len(patterns[index])
+                    if best is None or start < best[0] or (start == best[0] and end > best[1]):
+                        best = (start, end, index)
+
+                # Settle `best` once no match still in progress can start at
+                # or before it
+                if best is None or i - depth[state] + 1 <= best[0]:
+                    i += 1
+                    continue
+            elif best is None:
+                return
+
+            # Resume right after the emitted match; the few characters past
+            # it that were already scanned are scanned again from the root
+            yield best[0], best[1], patterns[best[2]]
+            i = best[1]
+            state = 0
+            best = None
+
+    def rewrite(self, text):
+        """Return (new_text, {pattern: count}) after one scan of `text`"""
+        parts = []
+        counts = {}
+        last = 0
+        for start, end, pattern in self.find_matches(text):
+            parts.append(text[last:start])
+            parts.append(self.replacements[pattern])
+            counts[pattern] = counts.get(pattern, 0) + 1
+            last = end
+        if not counts:
+            return text, counts
+        parts.append(text[last:])
+        return ''.join(parts), counts
+
+
+def rewrite_file(file_path, engine):
+    """Rewrite a file in place; returns the per-pattern match counts"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    new_content, counts = engine.rewrite(content)
+
+    if new_content != content:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+
+    return counts
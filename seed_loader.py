@@ -0,0 +1,389 @@
+"""
+Declarative, incremental seeding.
+
+Replaces the one-statement-per-row seed-*.mjs / insert_cases.mjs scripts:
+seed data lives in seeds/<table>.json (or .yaml) and is loaded over one
+connection, in foreign-key order, with one transaction per table:
+
+    python seed_loader.py                               # seeds/* into $DATABASE_URL
+    python seed_loader.py seeds/quizzes.json --dry-run  # what would change
+    python seed_loader.py --sqlite /tmp/seed.db         # local stand-in, no MySQL needed
+    python seed_loader.py --force                       # ignore stored hashes
+
+A seed file is a list of rows, or an object:
+
+    {
+      "table": "case_studies",          (default: the file name)
+      "key": ["slug"],                   natural key (default: a unique column
+                                         from drizzle/schema.ts, or id)
+      "defaults": {"createdBy": 1},      merged under every row
+      "rows": [{"slug": "...", "tags": ["Meta Ads"], ...}]
+    }
+
+Objects and lists are stored as compact JSON text, booleans as 1/0, and
+"@now" as the load time. Every row's content hash (canonical JSON of the
+declared row) is kept in the __seed_state table. A re-run upserts only the
+rows whose hash changed or is missing, so re-seeding an environment that
+is already up to date costs one SELECT per table. Rows that match an
+existing row by key are updated in place (same id). Changed rows are
+written as multi-row INSERT ... ON DUPLICATE KEY UPDATE statements that
+stay under a byte budget (--statement-kb).
+
+MySQL access uses PyMySQL (`pip install pymysql`) with the same
+DATABASE_URL the .mjs scripts read.
+"""
+import argparse
+import datetime
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from urllib.parse import parse_qs, unquote, urlparse
+
+from drizzle_schema import load_schema
+from restore_planner import STATEMENT_BYTES, ForeignKeyGraph, restore_levels, sql_literal
+
+DEFAULT_SEED_GLOBS = ['seeds/*.json', 'seeds/*.yaml', 'seeds/*.yml']
+STATE_TABLE = '__seed_state'
+NOW = '@now'
+KEY_BATCH = 500
+
+
+class SeedError(ValueError):
+    pass
+
+
+# Seed files
+
+class SeedTable:
+    """Declared rows of one table with their natural key and content hashes"""
+
+    def __init__(self, name, rows, key, source):
+        self.name = name
+        self.rows = rows
+        self.key = key
+        self.source = source
+
+    def row_key(self, row):
+        return json.dumps([row.get(column) for column in self.key], ensure_ascii=False, separators=(',', ':'))
+
+    @staticmethod
+    def row_hash(row):
+        canonical = json.dumps(row, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise SeedError(f"{path}: PyYAML is not installed (pip install pyyaml), use JSON")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def load_seed_file(path, schema):
+    data = _read(path)
+    spec = {'rows': data} if isinstance(data, list) else dict(data or {})
+    name = spec.get('table') or os.path.splitext(os.path.basename(path))[0]
+    table = schema.tables.get(name)
+    if table is None:
+        raise SeedError(f"{path}: table {name!r} is not in drizzle/schema.ts")
+    defaults = spec.get('defaults') or {}
+    rows = [{**defaults, **row} for row in spec.get('rows') or []]
+    columns = {column.name for column in table.columns}
+    unknown = sorted({column for row in rows for column in row} - columns)
+    if unknown:
+        raise SeedError(f"{path}: unknown {name} columns: {', '.join(unknown)}")
+
+    key = spec.get('key')
+    if not key:
+        present = set.intersection(*(set(row) for row in rows)) if rows else set()
+        unique = [column.name for column in table.columns if column.unique and column.name in present]
+        key = unique[:1] or (['id'] if 'id' in present else None)
+    if not key:
+        raise SeedError(f"{path}: no natural key for {name}; add \"key\": [column, ...]")
+    for i, row in enumerate(rows):
+        if any(row.get(column) is None for column in key):
+            raise SeedError(f"{path}: row {i} has no value for key {key}")
+    return SeedTable(name, rows, list(key), path)
+
+
+def load_seeds(patterns, schema):
+    """SeedTables by table name (files for the same table are merged)"""
+    paths = sorted({path for pattern in patterns for path in (glob.glob(pattern) or
+                                                              ([pattern] if os.path.isfile(pattern) else []))})
+    tables = {}
+    for path in paths:
+        seed = load_seed_file(path, schema)
+        if seed.name in tables:
+            existing = tables[seed.name]
+            if existing.key != seed.key:
+                raise SeedError(f"{path}: key {seed.key} differs from {existing.source} ({existing.key})")
+            existing.rows.extend(seed.rows)
+        else:
+            tables[seed.name] = seed
+    for seed in tables.values():
+        keys = [seed.row_key(row) for row in seed.rows]
+        if len(set(keys)) != len(keys):
+            duplicates = sorted({k for k in keys if keys.count(k) > 1})
+            raise SeedError(f"{seed.name}: duplicate keys {', '.join(duplicates[:5])}")
+    return tables
+
+
+def seed_order(tables, schema):
+    """Table names with every foreign-key parent before its children"""
+    graph = ForeignKeyGraph()
+    for table, column, parent, parent_column, _ in schema.foreign_keys():
+        graph.add(table, None, [column], parent, [parent_column])
+    levels, _ = restore_levels(tables, graph)
+    return [name for level in levels for name in level]
+
+
+def db_value(value, now):
+    if value == NOW:
+        return now
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    if value is True or value is False:
+        return int(value)
+    return value
+
+
+# Targets
+
+class MySQLTarget:
+    """PyMySQL connection from a mysql:// URL (DATABASE_URL)"""
+
+    placeholder = '%s'
+
+    def __init__(self, url):
+        try:
+            import pymysql
+        except ImportError:
+            raise SeedError("PyMySQL is not installed (pip install pymysql); use --sqlite for a local stand-in")
+        parsed = urlparse(url)
+        query = parse_qs(parsed.query)
+        ssl = None
+        if 'ssl' in query or 'sslaccept' in query:
+            ssl = {'ssl': {}}
+        self.conn = pymysql.connect(host=parsed.hostname, port=parsed.port or 3306,
+                                    user=unquote(parsed.username or ''), password=unquote(parsed.password or ''),
+                                    database=parsed.path.lstrip('/'), charset='utf8mb4', autocommit=False,
+                                    **(ssl or {}))
+
+    def quote(self, name):
+        return '`' + name.replace('`', '``') + '`'
+
+    def ensure_state_table(self):
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {self.quote(STATE_TABLE)} ("
+                           "`table_name` varchar(64) NOT NULL, `row_key` varchar(255) NOT NULL, "
+                           "`content_hash` char(64) NOT NULL, `seeded_at` timestamp NOT NULL, "
+                           "PRIMARY KEY (`table_name`, `row_key`)) DEFAULT CHARSET=utf8mb4")
+        self.conn.commit()
+
+    def upsert_sql(self, table, columns, rows, conflict):
+        names = ', '.join(self.quote(c) for c in columns)
+        group = '(' + ', '.join([self.placeholder] * len(columns)) + ')'
+        updates = ', '.join(f"{self.quote(c)} = VALUES({self.quote(c)})" for c in columns if c not in conflict)
+        return (f"INSERT INTO {self.quote(table)} ({names}) VALUES {', '.join([group] * len(rows))}"
+                + (f" ON DUPLICATE KEY UPDATE {updates}" if updates and conflict else ''))
+
+
+class SQLiteTarget(MySQLTarget):
+    """Local stand-in: tables created from schema.ts column lists"""
+
+    placeholder = '?'
+
+    def __init__(self, path, schema):
+        self.conn = sqlite3.connect(path)
+        for table in schema.tables.values():
+            definitions = []
+            for column in table.columns:
+                if column.primary_key and column.autoincrement:
+                    definitions.append(f'"{column.name}" INTEGER PRIMARY KEY')
+                else:
+                    affinity = 'INTEGER' if column.kind in ('int', 'boolean') else 'TEXT'
+                    definitions.append(f'"{column.name}" {affinity}' + (' UNIQUE' if column.unique else '')
+                                       + (' DEFAULT CURRENT_TIMESTAMP' if column.default_now else ''))
+            self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{table.name}" ({", ".join(definitions)})')
+        self.conn.commit()
+
+    def quote(self, name):
+        return '"' + name.replace('"', '""') + '"'
+
+    def ensure_state_table(self):
+        self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{STATE_TABLE}" (table_name TEXT NOT NULL, '
+                          'row_key TEXT NOT NULL, content_hash TEXT NOT NULL, seeded_at TEXT NOT NULL, '
+                          'PRIMARY KEY (table_name, row_key))')
+        self.conn.commit()
+
+    def upsert_sql(self, table, columns, rows, conflict):
+        names = ', '.join(self.quote(c) for c in columns)
+        group = '(' + ', '.join([self.placeholder] * len(columns)) + ')'
+        updates = ', '.join(f"{self.quote(c)} = excluded.{self.quote(c)}" for c in columns if c not in conflict)
+        target = ', '.join(self.quote(c) for c in conflict)
+        return (f"INSERT INTO {self.quote(table)} ({names}) VALUES {', '.join([group] * len(rows))}"
+                + (f" ON CONFLICT ({target}) DO UPDATE SET {updates}" if updates and conflict else ''))
+
+
+# Loading
+
+def _query(target, sql, params=()):
+    cursor = target.conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def stored_hashes(target, table):
+    rows = _query(target, f"SELECT row_key, content_hash FROM {target.quote(STATE_TABLE)} "
+                          f"WHERE table_name = {target.placeholder}", (table,))
+    return dict(rows)
+
+
+def existing_ids(target, seed, rows):
+    """{row_key: id} of declared rows already in the table (matched by natural key)"""
+    if seed.key == ['id']:
+        return {}
+    found = {}
+    q = target.quote
+    if len(seed.key) == 1:
+        column = seed.key[0]
+        values = [row[column] for row in rows]
+        for i in range(0, len(values), KEY_BATCH):
+            batch = values[i:i + KEY_BATCH]
+            sql = (f"SELECT id, {q(column)} FROM {q(seed.name)} WHERE {q(column)} IN "
+                   f"({', '.join([target.placeholder] * len(batch))})")
+            for row_id, value in _query(target, sql, batch):
+                found[seed.row_key({column: value})] = row_id
+    else:
+        sql = f"SELECT id, {', '.join(q(c) for c in seed.key)} FROM {q(seed.name)}"
+        for record in _query(target, sql):
+            found[seed.row_key(dict(zip(seed.key, record[1:])))] = record[0]
+    return found
+
+
+def batches(rows, budget):
+    """Split rows (tuples of db values) into groups whose literal size stays under `budget` bytes"""
+    group = []
+    size = 0
+    for row in rows:
+        row_size = sum(len(sql_literal(value)) for value in row) + len(row) + 3
+        if group and size + row_size > budget:
+            yield group
+            group = []
+            size = 0
+        group.append(row)
+        size += row_size
+    if group:
+        yield group
+
+
+def upsert(target, table, columns, rows, conflict, budget, stats):
+    cursor = target.conn.cursor()
+    try:
+        for group in batches(rows, budget):
+            cursor.execute(target.upsert_sql(table, columns, group, conflict),
+                           [value for row in group for value in row])
+            stats['statements'] += 1
+    finally:
+        cursor.close()
+
+
+def seed_table(target, seed, budget=STATEMENT_BYTES, force=False, dry_run=False, now=None):
+    """Upsert the changed rows of one table in one transaction; returns stats"""
+    now = now or datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    started = time.perf_counter()
+    stored = {} if force else stored_hashes(target, seed.name)
+    changed = [(seed.row_key(row), seed.row_hash(row), row) for row in seed.rows
+               if force or stored.get(seed.row_key(row)) != seed.row_hash(row)]
+    stats = {'rows': len(seed.rows), 'changed': len(changed), 'inserted': 0, 'updated': 0, 'statements': 0}
+    if not changed or dry_run:
+        stats['seconds'] = time.perf_counter() - started
+        return stats
+
+    try:
+        ids = existing_ids(target, seed, [row for _, _, row in changed])
+        # Same column list per statement: group rows by their (sorted) columns
+        groups = {}
+        for key, _, row in changed:
+            row_id = ids.get(key, row.get('id'))
+            columns = tuple(sorted(row))
+            if row_id is not None and 'id' not in row:
+                columns = ('id',) + columns
+            values = tuple(db_value(row_id if column == 'id' and 'id' not in row else row[column], now)
+                           for column in columns)
+            groups.setdefault(columns, []).append(values)
+            stats['updated' if key in ids or (seed.key == ['id'] and key in stored) else 'inserted'] += 1
+        for columns, rows in groups.items():
+            # Rows without an id are new: plain INSERT, the key need not be a UNIQUE index
+            upsert(target, seed.name, list(columns), rows, ['id'] if 'id' in columns else [], budget, stats)
+        upsert(target, STATE_TABLE, ['table_name', 'row_key', 'content_hash', 'seeded_at'],
+               [(seed.name, key, content_hash, now) for key, content_hash, _ in changed],
+               ['table_name', 'row_key'], budget, stats)
+        target.conn.commit()
+    except Exception:
+        target.conn.rollback()
+        raise
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load declarative seed data with batched, incremental upserts")
+    parser.add_argument('seeds', nargs='*', help=f"seed files or globs (default: {' '.join(DEFAULT_SEED_GLOBS)})")
+    target_group = parser.add_mutually_exclusive_group()
+    target_group.add_argument('--database-url', default=os.environ.get('DATABASE_URL'),
+                              help='mysql:// URL (default: $DATABASE_URL)')
+    target_group.add_argument('--sqlite', metavar='DB', help='SQLite stand-in database file')
+    parser.add_argument('--statement-kb', type=float, default=STATEMENT_BYTES / 1024,
+                        help='byte budget of one INSERT statement')
+    parser.add_argument('--force', action='store_true', help='upsert every row, ignoring stored hashes')
+    parser.add_argument('--dry-run', action='store_true', help='report changed rows without writing')
+    args = parser.parse_args()
+
+    schema = load_schema()
+    try:
+        seeds = load_seeds(args.seeds or DEFAULT_SEED_GLOBS, schema)
+        if not seeds:
+            print("⚠️  No seed files found")
+            sys.exit(0)
+        if args.sqlite:
+            target = SQLiteTarget(args.sqlite, schema)
+        elif args.database_url:
+            target = MySQLTarget(args.database_url)
+        else:
+            raise SeedError("Set DATABASE_URL (or --database-url), or use --sqlite")
+    except SeedError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    target.ensure_state_table()
+    started = time.perf_counter()
+    totals = {'rows': 0, 'changed': 0, 'statements': 0}
+    for name in seed_order(seeds, schema):
+        try:
+            stats = seed_table(target, seeds[name], int(args.statement_kb * 1024), args.force, args.dry_run)
+        except Exception as e:
+            print(f"❌ {name}: {e} (rolled back)")
+            sys.exit(1)
+        for key in totals:
+            totals[key] += stats[key]
+        if not stats['changed']:
+            print(f"⏭️  {name}: {stats['rows']} rows unchanged")
+        elif args.dry_run:
+            print(f"📝 {name}: {stats['changed']}/{stats['rows']} rows would be upserted")
+        else:
+            print(f"✅ {name}: {stats['inserted']} inserted, {stats['updated']} updated "
+                  f"({stats['statements']} statements, {stats['seconds'] * 1000:.0f} ms)")
+    print(f"\n📊 {totals['changed']}/{totals['rows']} rows upserted in {totals['statements']} statements, "
+          f"{time.perf_counter() - started:.2f}s")
@@ -0,0 +1,31 @@
+import { describe, it, expect } from "vitest";
+import fs from "fs";
+import path from "path";
+import { calculateLeadScore } from "./leadScoring";
+
+/**
+ * Parity fixtures shared with the Python batch re-scorer (lead_rescore.py).
+ * Regenerate the expected scores after changing the rules with:
+ *   UPDATE_FIXTURES=1 npx vitest run server/leadScoring.parity.test.ts
+ * then check the Python side with: python lead_rescore.py --parity
+ */
+const FIXTURES = path.join(import.meta.dirname, "fixtures", "leadScoring.parity.json");
+
+type Fixture = { input: Parameters<typeof calculateLeadScore>[0]; score: number };
+
+const fixtures: Fixture[] = JSON.parse(fs.readFileSync(FIXTURES, "utf8"));
+
+if (process.env.UPDATE_FIXTURES) {
+  const updated = fixtures.map(({ input }) => ({ input, score: calculateLeadScore(input) }));
+  fs.writeFileSync(FIXTURES, JSON.stringify(updated, null, 2) + "\n");
+}
+
+describe("calculateLeadScore parity fixtures", () => {
+  it("has fixtures", () => {
+    expect(fixtures.length).toBeGreaterThan(0);
+  });
+
+  it.each(fixtures.map((fixture, i) => [i, fixture] as const))("case %i", (_, { input, score }) => {
+    expect(calculateLeadScore(input)).toBe(score);
+  });
+});
@@ -0,0 +1,574 @@
+"""
+Streaming reader for mysqldump output.
+
+Tokenizes a dump incrementally and yields one `(table, row)` tuple per row of
+every extended `INSERT INTO ... VALUES (...),(...);` statement:
+
+    from sql_dump import DumpReader
+
+    reader = DumpReader('database_COMPLETE_WITH_ALL_DATA.sql')
+    for table, row in reader:
+        columns = reader.columns[table]
+
+Only the current value is ever held in memory: the file is read in chunks
+(or scanned in place when given bytes or an mmap), so multi-GB dumps with
+multi-megabyte INSERT lines stream in constant memory. Lines that aren't SQL
+(`mysqldump: [Warning] ...`, `$(date)` from an unexpanded heredoc) are
+skipped.
+
+Rows are decoded into typed values using the CREATE TABLE statements in the
+dump (or `schemas` passed in for data-only dumps): ints, Decimal, float,
+bool for tinyint(1), datetime/date/timedelta, bytes for binary columns and
+str for text. Columns without a known type keep their literal type: int,
+Decimal, float, str, or bytes for `_binary '...'`, 0x... and strings that
+aren't valid UTF-8.
+
+    python sql_dump.py database_backup.sql            # rows per table
+    python sql_dump.py dump.sql --table leads --limit 5
+"""
+import argparse
+import datetime
+import mmap
+import re
+import sys
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+
+CHUNK_SIZE = 1 << 20
+
+# Statements the reader understands or skips; any other line is noise
+SQL_KEYWORDS = {
+    b'INSERT', b'REPLACE', b'CREATE', b'DROP', b'LOCK', b'UNLOCK', b'SET', b'USE',
+    b'ALTER', b'START', b'COMMIT', b'BEGIN', b'ROLLBACK', b'SAVEPOINT', b'RELEASE',
+}
+
+WHITESPACE = re.compile(rb'\s*')
+LINE = re.compile(rb'[^\n]*')
+WORD = re.compile(rb'[A-Za-z_]+')
+BLOCK_COMMENT = re.compile(rb'(?:[^*]|\*(?!/))*')
+STRING_BODY = {
+    ord("'"): re.compile(rb"[^'\\]*(?:\\[\s\S][^'\\]*)*"),
+    ord('"'): re.compile(rb'[^"\\]*(?:\\[\s\S][^"\\]*)*'),
+}
+BACKTICK_BODY = re.compile(rb'[^`]*')
+UNQUOTED = re.compile(rb"[^,)\s'\"]*")
+STATEMENT_PART = re.compile(rb"""[^;'"`]*""")
+INSERT_HEADER = re.compile(
+    rb'\s+(?:IGNORE\s+)?INTO\s+`?([^`\s(]+)`?\s*(?:\(([^)]*)\))?\s*VALUES\s*',
+    re.IGNORECASE,
+)
+ESCAPE = re.compile(rb'\\([\s\S])')
+
+# Whole-row fast path, used when a row is already complete in the buffer
+SINGLE_QUOTED = rb"'([^'\\]*(?:(?:\\[\s\S]|'')[^'\\]*)*)'"
+DOUBLE_QUOTED = rb'"([^"\\]*(?:(?:\\[\s\S]|"")[^"\\]*)*)"'
+BARE = rb"""([^,()'"\s]+)"""
+VALUE = re.compile(rb'(_binary\s*|[bBxX])?' + SINGLE_QUOTED + rb'|' + DOUBLE_QUOTED + rb'|' + BARE)
+ROW = re.compile(rb'\(\s*(?:(?:' + VALUE.pattern + rb')\s*(?:,\s*(?:' + VALUE.pattern + rb')\s*)*)?\)')
+QUOTED_ESCAPE = re.compile(rb"""\\([\s\S])|''|\"\"""")
+ESCAPES = {b'0': b'\0', b'b': b'\b', b'n': b'\n', b'r': b'\r', b't': b'\t', b'Z': b'\x1a'}
+
+CREATE_TABLE = re.compile(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?([^`\s(]+)`?\s*\(', re.IGNORECASE)
+COLUMN_DEF = re.compile(r'^\s*`([^`]+)`\s+(\w+)(?:\(([^)]*)\))?([^,\n]*)', re.MULTILINE)
+
+Column = namedtuple('Column', 'name type size unsigned nullable')
+
+
+class DumpSyntaxError(ValueError):
+    """The dump is malformed at a given byte offset"""
+
+    def __init__(self, message, offset):
+        super().__init__(f"{message} at byte {offset}")
+        self.offset = offset
+
+
+# Value decoding
+
+def _unescape(raw):
+    if b'\\' not in raw:
+        return raw
+    return ESCAPE.sub(lambda m: ESCAPES.get(m.group(1), m.group(1)), raw)
+
+
+def _unescape_quoted(raw):
+    """Unescape string contents that may also contain doubled quotes"""
+    if b'\\' not in raw and b"''" not in raw and b'""' not in raw:
+        return raw
+    return QUOTED_ESCAPE.sub(
+        lambda m: ESCAPES.get(m.group(1), m.group(1)) if m.group(1) is not None else m.group()[:1],
+        raw,
+    )
+
+
+def _text(raw):
+    """UTF-8 text, or bytes when the string isn't valid UTF-8 (binary data)"""
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return bytes(raw)
+
+
+def _number(token):
+    if b'.' not in token and b'e' not in token and b'E' not in token:
+        return int(token)
+    if b'e' in token or b'E' in token:
+        return float(token)
+    return Decimal(token.decode('ascii'))
+
+
+def _prefixed(prefix, raw):
+    """Value of _binary '...', b'0101' or X'ff'"""
+    prefix = prefix.rstrip().lower()
+    if prefix == b'x':
+        return bytes.fromhex(raw.decode('ascii'))
+    if prefix == b'b':
+        bits = raw.decode('ascii') or '0'
+        return int(bits, 2).to_bytes((len(bits) + 7) // 8, 'big')
+    return bytes(raw) if prefix == b'_binary' else _text(raw)
+
+
+def _bare(token):
+    """Value of an unquoted literal: NULL, TRUE/FALSE, 0x... or a number"""
+    if token.isdigit():
+        return int(token)
+    upper = token.upper()
+    if upper == b'NULL':
+        return None
+    if upper in (b'TRUE', b'FALSE'):
+        return upper == b'TRUE'
+    if upper.startswith(b'0X'):
+        return bytes.fromhex(token[2:].decode('ascii'))
+    try:
+        return _number(token)
+    except (ValueError, InvalidOperation):
+        return token.decode('utf-8', 'replace')
+
+
+def _to_int(value):
+    return int(value) if not isinstance(value, str) else int(value.strip() or 0)
+
+
+def _to_bool(value):
+    return bool(_to_int(value))
+
+
+def _to_decimal(value):
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return value
+
+
+def _to_float(value):
+    return float(value)
+
+
+def _to_text(value):
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', 'replace')
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_bytes(value):
+    if isinstance(value, str):
+        return value.encode('utf-8')
+    return bytes(value) if isinstance(value, (bytes, bytearray)) else str(value).encode('ascii')
+
+
+def _to_datetime(value):
+    """datetime, or the original string for zero dates such as 0000-00-00 00:00:00"""
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _to_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _to_time(value):
+    """MySQL TIME ('-838:59:59' .. '838:59:59') as timedelta"""
+    m = re.fullmatch(r'(-)?(\d+):(\d\d):(\d\d)(?:\.(\d+))?', str(value))
+    if not m:
+        return value
+    sign, hours, minutes, seconds, fraction = m.groups()
+    delta = datetime.timedelta(hours=int(hours), minutes=int(minutes), seconds=int(seconds),
+                               microseconds=int((fraction or '0').ljust(6, '0')[:6]))
+    return -delta if sign else delta
+
+
+TYPE_DECODERS = {
+    'tinyint': _to_int, 'smallint': _to_int, 'mediumint': _to_int, 'int': _to_int,
+    'integer': _to_int, 'bigint': _to_int, 'year': _to_int, 'serial': _to_int,
+    'decimal': _to_decimal, 'numeric': _to_decimal, 'dec': _to_decimal, 'fixed': _to_decimal,
+    'float': _to_float, 'double': _to_float, 'real': _to_float,
+    'bool': _to_bool, 'boolean': _to_bool,
+    'char': _to_text, 'varchar': _to_text, 'tinytext': _to_text, 'text': _to_text,
+    'mediumtext': _to_text, 'longtext': _to_text, 'enum': _to_text, 'set': _to_text,
+    'json': _to_text,
+    'binary': _to_bytes, 'varbinary': _to_bytes, 'tinyblob': _to_bytes, 'blob': _to_bytes,
+    'mediumblob': _to_bytes, 'longblob': _to_bytes, 'bit': _to_bytes,
+    'datetime': _to_datetime, 'timestamp': _to_datetime, 'date': _to_date, 'time': _to_time,
+}
+
+
+def column_decoder(column):
+    """Function turning a literal value into the column's Python type (None if unknown)"""
+    if column.type == 'tinyint' and column.size == '1':
+        return _to_bool
+    return TYPE_DECODERS.get(column.type)
+
+
+class TableSchema:
+    """Column definitions of one table, from CREATE TABLE or another source"""
+
+    def __init__(self, name, columns, statement=None):
+        self.name = name
+        self.columns = columns
+        self.statement = statement    # CREATE TABLE text, when parsed from one
+        self.by_name = {column.name: column for column in columns}
+
+    @property
+    def column_names(self):
+        return [column.name for column in self.columns]
+
+    def decoders(self, names=None):
+        """Decoders in `names` order (default: table order)"""
+        names = self.column_names if names is None else names
+        return [column_decoder(self.by_name[name]) if name in self.by_name else None
+                for name in names]
+
+    def __repr__(self):
+        return f"TableSchema({self.name!r}, {len(self.columns)} columns)"
+
+
+def parse_create_table(statement):
+    """TableSchema from a CREATE TABLE statement, or None if it isn't one"""
+    m = CREATE_TABLE.search(statement)
+    if not m:
+        return None
+    body = statement[m.end():]
+    columns = []
+    for col in COLUMN_DEF.finditer(body):
+        name, type_name, size, rest = col.groups()
+        rest_upper = rest.upper()
+        columns.append(Column(
+            name=name,
+            type=type_name.lower(),
+            size=size,
+            unsigned='UNSIGNED' in rest_upper,
+            nullable='NOT NULL' not in rest_upper,
+        ))
+    return TableSchema(m.group(1), columns, statement.strip().rstrip(';'))
+
+
+# Reader
+
+class DumpReader:
+    """Iterate `(table, row)` over a mysqldump file, bytes or mmap
+
+    `source` may be a path, a binary file object, bytes/bytearray or an mmap.
+    With `use_mmap`, a path is memory-mapped instead of read in chunks.
+    `tables` limits decoding and output to those tables (the rest are still
+    tokenized to find statement ends). `schemas` supplies column types for
+    tables the dump has no CREATE TABLE for; CREATE TABLE in the dump wins.
+    """
+
+    def __init__(self, source, tables=None, schemas=None, typed=True,
+                 chunk_size=CHUNK_SIZE, use_mmap=False):
+        self.source = source
+        self.tables = set(tables) if tables else None
+        self.schemas = dict(schemas or {})
+        self.typed = typed
+        self.chunk_size = chunk_size
+        self.use_mmap = use_mmap
+        self.columns = {}          # table -> column names of its last INSERT
+        self.row_counts = {}
+        self.skipped_lines = 0
+        self._stream = None
+        self._data = b''
+        self._pos = 0
+        self._offset = 0           # bytes discarded before _data[0]
+        self._eof = False
+
+    # Buffer management
+
+    def _open(self):
+        source = self.source
+        if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+            self._data, self._eof = source, True
+            return None
+        if isinstance(source, str):
+            f = open(source, 'rb')
+            if self.use_mmap:
+                try:
+                    self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    self._data = b''  # empty file
+                self._eof = True
+            else:
+                self._stream = f
+            return f
+        self._stream = source
+        return None
+
+    def _fill(self):
+        """Read more input, keeping unconsumed bytes; False at end of input"""
+        if self._eof:
+            return False
+        # Grow the read size with the pending token so long values stay linear
+        chunk = self._stream.read(max(self.chunk_size, len(self._data) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._offset += self._pos
+        self._data = self._data[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _ensure(self, n):
+        """Make at least `n` bytes available after the cursor if the input has them"""
+        while len(self._data) - self._pos < n and self._fill():
+            pass
+        return len(self._data) - self._pos >= n
+
+    def _scan(self, regex, start=None):
+        """Match an always-matching regex at `start`, refilling while it runs into the end
+
+        Keeps one byte of lookahead so tokens such as `\\'` or `*/` are never
+        split across chunks. Returns (match_start, match_end) as buffer offsets.
+        """
+        rel = (self._pos if start is None else start) - self._pos
+        while True:
+            begin = self._pos + rel
+            m = regex.match(self._data, begin)
+            if m.end() < len(self._data) - 1 or not self._fill():
+                return begin, m.end()
+
+    def _peek(self, n=1):
+        self._ensure(n)
+        return bytes(self._data[self._pos:self._pos + n])
+
+    def _error(self, message):
+        return DumpSyntaxError(message, self._offset + self._pos)
+
+    # Tokens
+
+    def _skip_whitespace(self):
+        self._pos = self._scan(WHITESPACE)[1]
+
+    def _skip_line(self):
+        self._pos = self._scan(LINE)[1]
+
+    def _skip_block_comment(self):
+        _, end = self._scan(BLOCK_COMMENT, self._pos + 2)
+        self._pos = end + 2
+
+    def _read_string(self):
+        """Quoted string at the cursor, unescaped, as bytes"""
+        quote = self._data[self._pos]
+        body = STRING_BODY[quote]
+        parts = []
+        start = self._pos + 1
+        while True:
+            begin, end = self._scan(body, start)
+            parts.append(self._data[begin:end])
+            if end >= len(self._data):
+                raise self._error("Unterminated string")
+            # A doubled quote is an escaped quote; _scan left the next byte in the buffer
+            if end + 1 < len(self._data) and self._data[end + 1] == quote:
+                parts.append(bytes([quote]))
+                start = end + 2
+                continue
+            self._pos = end + 1
+            return _unescape(b''.join(parts))
+
+    def _read_value(self):
+        ch = self._peek()
+        if ch in (b"'", b'"'):
+            return _text(self._read_string())
+        begin, end = self._scan(UNQUOTED)
+        token = bytes(self._data[begin:end])
+        self._pos = end
+        if self._peek() == b"'":
+            # _binary'...', b'0101', X'ff'
+            return _prefixed(token, self._read_string())
+        if token == b'_binary':
+            self._skip_whitespace()
+            return self._read_value() if self._peek() != b"'" else bytes(self._read_string())
+        if not token:
+            raise self._error("Expected a value")
+        return _bare(token)
+
+    def _read_row(self):
+        """Values of the row whose `(` is at the cursor"""
+        m = ROW.match(self._data, self._pos)
+        if m and (m.end() < len(self._data) or self._eof):
+            self._pos = m.end()
+            row = []
+            for prefix, single, double, bare in VALUE.findall(self._data[m.start() + 1:m.end() - 1]):
+                if bare:
+                    row.append(_bare(bare))
+                elif double:
+                    row.append(_text(_unescape_quoted(double)))
+                else:
+                    raw = _unescape_quoted(single)
+                    row.append(_prefixed(prefix, raw) if prefix else _text(raw))
+            return row
+
+        # The row runs past the buffer (or is malformed): token by token with refills
+        self._pos += 1
+        row = []
+        while True:
+            self._skip_whitespace()
+            if self._peek() == b')' and not row:
+                break
+            row.append(self._read_value())
+            self._skip_whitespace()
+            ch = self._peek()
+            if ch == b',':
+                self._pos += 1
+                continue
+            if ch == b')':
+                break
+            raise self._error("Expected ',' or ')' in row")
+        self._pos += 1
+        return row
+
+    def _read_statement(self):
+        """Text of the statement at the cursor up to and including `;`"""
+        parts = []
+        while True:
+            begin, end = self._scan(STATEMENT_PART)
+            parts.append(self._data[begin:end])
+            self._pos = end
+            ch = self._peek()
+            if not ch:
+                break
+            if ch == b';':
+                self._pos += 1
+                break
+            if ch == b'`':
+                begin, end = self._scan(BACKTICK_BODY, self._pos + 1)
+                parts.append(self._data[begin - 1:end + 1])
+                self._pos = end + 1
+            else:
+                raw = self._read_string()
+                parts.append(ch + raw.replace(ch, ch + ch) + ch)
+        return b''.join(bytes(part) for part in parts).decode('utf-8', 'replace')
+
+    # Statements
+
+    def _insert_rows(self):
+        """Yield rows of the INSERT whose keyword was just consumed"""
+        self._ensure(1 << 16)
+        m = INSERT_HEADER.match(self._data, self._pos)
+        if not m:
+            raise self._error("Malformed INSERT")
+        table = m.group(1).decode('utf-8')
+        if m.group(2) is not None:
+            names = [name.strip().strip('`') for name in m.group(2).decode('utf-8').split(',')]
+        elif table in self.schemas:
+            names = self.schemas[table].column_names
+        else:
+            names = self.columns.get(table, [])
+        self._pos = m.end()
+        self.columns[table] = names
+
+        wanted = self.tables is None or table in self.tables
+        decoders = None
+        if wanted and self.typed and table in self.schemas:
+            decoders = self.schemas[table].decoders(names)
+            if not any(decoders):
+                decoders = None
+
+        count = 0
+        while True:
+            self._skip_whitespace()
+            if self._peek() != b'(':
+                raise self._error("Expected '(' starting a row")
+            row = self._read_row()
+
+            if wanted:
+                if decoders:
+                    row = [value if value is None or decode is None else decode(value)
+                           for value, decode in zip(row, decoders)]
+                count += 1
+                yield table, tuple(row)
+
+            self._skip_whitespace()
+            ch = self._peek()
+            if ch == b',':
+                self._pos += 1
+            elif ch == b';' or not ch:
+                self._pos += len(ch)
+                break
+            else:
+                raise self._error("Expected ',' or ';' after a row")
+        if wanted:
+            self.row_counts[table] = self.row_counts.get(table, 0) + count
+
+    def __iter__(self):
+        handle = self._open()
+        try:
+            while True:
+                self._skip_whitespace()
+                head = self._peek(2)
+                if not head:
+                    return
+                if head == b'--' or head[:1] == b'#':
+                    self._skip_line()
+                elif head == b'/*':
+                    self._skip_block_comment()
+                elif head[:1] == b';':
+                    self._pos += 1
+                else:
+                    self._ensure(64)
+                    m = WORD.match(self._data, self._pos)
+                    keyword = m.group().upper() if m else b''
+                    if keyword not in SQL_KEYWORDS:
+                        self.skipped_lines += 1
+                        self._skip_line()
+                    elif keyword in (b'INSERT', b'REPLACE'):
+                        self._pos = m.end()
+                        yield from self._insert_rows()
+                    else:
+                        statement = self._read_statement()
+                        schema = parse_create_table(statement) if keyword == b'CREATE' else None
+                        if schema:
+                            self.schemas[schema.name] = schema
+        finally:
+            if handle is not None:
+                if isinstance(self._data, mmap.mmap):
+                    self._data.close()
+                handle.close()
+
+
+def iter_rows(source, tables=None, schemas=None, typed=True):
+    """Shortcut for iterating a DumpReader"""
+    return iter(DumpReader(source, tables=tables, schemas=schemas, typed=typed))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Stream rows out of a mysqldump file")
+    parser.add_argument('dump', help='mysqldump .sql file')
+    parser.add_argument('--table', action='append', help='only these tables (repeatable)')
+    parser.add_argument('--limit', type=int, default=0, help='print up to N rows per table')
+    parser.add_argument('--mmap', action='store_true', help='memory-map the file instead of reading chunks')
+    args = parser.parse_args()
+
+    reader = DumpReader(args.dump, tables=args.table, use_mmap=args.mmap)
+    printed = {}
+    for table, row in reader:
+        if printed.get(table, 0) < args.limit:
+            printed[table] = printed.get(table, 0) + 1
+            print(f"{table}: {dict(zip(reader.columns[table], row))}")
+
+    for table, count in sorted(reader.row_counts.items()):
+        print(f"📦 {table}: {count} rows", file=sys.stderr)
+    print(f"✅ {sum(reader.row_counts.values())} rows in {len(reader.row_counts)} tables "
+          f"({reader.skipped_lines} non-SQL lines skipped)", file=sys.stderr)
@@ -0,0 +1,774 @@
+"""
+Scale-realistic synthetic data for the drizzle schema.
+
+Generates coherent rows for the CRM, analytics and funnel tables and
+writes them as a restore_planner plan directory (per-table schema files,
+bulk-load chunks, plan.json), so they load in parallel and in
+foreign-key order:
+
+    python synthetic_data.py synthetic/ --scale 100 --jobs 8
+    python synthetic_data.py synthetic/ --scale 10 --format tsv        # LOAD DATA files
+    python synthetic_data.py synthetic/ --rows calendar_events=50000   # any other table too
+    python synthetic_data.py synthetic/ --from-migrations              # columns from drizzle/*.sql
+    python restore_planner.py run synthetic/ --jobs 8 --mysql -- -u root -p pikaleads_bench
+    python restore_planner.py run synthetic/ --sqlite /tmp/synthetic.db
+
+Column lists and types come from drizzle/schema.ts (or the migrations).
+Tables with a generator in GENERATORS get domain data:
+
+    leads                 UTM source/medium/campaign mixes, quiz answers,
+                          statuses, managers, Ukrainian names and phones
+    quiz_sessions         per-question drop-off: each session views
+      + quiz_question_events  questions in order, answers or skips them and
+                          abandons with a per-question probability
+    events_log            tracking events per platform with failures
+    lead_history, messages  changes and conversations after the lead arrived
+    users, lead_statuses, quizzes, quiz_questions
+
+Any other table gets values from its column types and names. Volumes at
+--scale 1 are in VOLUMES; leads, sessions and events scale linearly.
+
+Rows are a function of (seed, table, row id), so workers generate chunks
+independently and the output is the same for any --jobs. Related rows
+agree without shared state. Row ids map to times linearly, so a
+child row can be placed after its lead. Quiz popularity is a fixed table
+indexed by `lead id % 1000`, so sessions find leads of their own quiz.
+Foreign keys that schema.ts doesn't declare (leadId, quizId, statusId,
+...) are taken from IMPLIED_REFERENCES. quiz_question_events ids are
+`(session id - 1) * 32 + n`, so they have gaps.
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import time
+from bisect import bisect
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from itertools import accumulate
+
+from drizzle_schema import load_schema, sql_type
+from migration_schema import ColumnDef, compile_migrations
+from restore_planner import (CHUNK_HEADER, PLAN_VERSION, STATEMENT_BYTES, ForeignKeyGraph, prepare_plan_dir,
+                             quote_identifier, restore_levels, sql_literal, tsv_field)
+
+DEFAULT_OUTPUT = 'synthetic'
+CHUNK_ROWS = 50000
+EVENT_STRIDE = 32
+POPULARITY_SLOTS = 1000
+
+# Rows at --scale 1; SCALED tables grow linearly with --scale
+VOLUMES = {
+    'users': 25,
+    'lead_statuses': 6,
+    'quizzes': 40,
+    'leads': 10000,
+    'quiz_sessions': 45000,
+    'events_log': 120000,
+    'lead_history': 25000,
+    'messages': 40000,
+}
+SCALED = {'leads', 'quiz_sessions', 'events_log', 'lead_history', 'messages'}
+
+IMPLIED_REFERENCES = {
+    'leadId': 'leads', 'userId': 'users', 'createdBy': 'users', 'assignedTo': 'users',
+    'sentBy': 'users', 'authorId': 'users', 'quizId': 'quizzes', 'statusId': 'lead_statuses',
+    'questionId': 'quiz_questions',
+}
+
+Table = namedtuple('Table', 'name columns primary_key unique references')
+
+
+# Schema
+
+def tables_from_schema(schema):
+    """Table per drizzle_schema table, columns as migration_schema.ColumnDef"""
+    tables = {}
+    for table in schema.tables.values():
+        columns = [ColumnDef(c.name, sql_type(c), not c.not_null, c.default, c.autoincrement)
+                   for c in table.columns]
+        references = {c.name: c.references[0] for c in table.columns if c.references}
+        var_names = {t.var: t.name for t in schema.tables.values()}
+        references = {column: var_names.get(var, var) for column, var in references.items()}
+        unique = {c.name for c in table.columns if c.unique}
+        tables[table.name] = Table(table.name, columns, list(table.primary_key), unique, references)
+    return tables
+
+
+def tables_from_migrations(model):
+    """Table per migration_schema table model"""
+    tables = {}
+    for name, model_table in model.tables.items():
+        unique = {index.columns[0] for index in model_table.indexes.values()
+                  if index.unique and len(index.columns) == 1}
+        references = {fk.columns[0]: fk.ref_table for fk in model_table.foreign_keys.values()
+                      if len(fk.columns) == 1}
+        tables[name] = Table(name, list(model_table.columns.values()), list(model_table.primary_key),
+                             unique, references)
+    return tables
+
+
+def create_table_sql(table):
+    lines = []
+    for column in table.columns:
+        parts = [quote_identifier(column.name), column.type]
+        if column.autoincrement:
+            parts.append('AUTO_INCREMENT')
+        if not column.nullable:
+            parts.append('NOT NULL')
+        lines.append('  ' + ' '.join(parts))
+    if table.primary_key:
+        lines.append(f"  PRIMARY KEY ({', '.join(quote_identifier(c) for c in table.primary_key)})")
+    for column in sorted(table.unique - set(table.primary_key)):
+        lines.append(f"  UNIQUE KEY {quote_identifier(column)} ({quote_identifier(column)})")
+    return (f"CREATE TABLE {quote_identifier(table.name)} (\n" + ',\n'.join(lines)
+            + "\n) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;\n")
+
+
+def references(table):
+    """{column: parent table}: declared foreign keys plus IMPLIED_REFERENCES"""
+    refs = {column.name: IMPLIED_REFERENCES[column.name] for column in table.columns
+            if column.name in IMPLIED_REFERENCES and column.type.startswith('int')}
+    refs.update(table.references)
+    refs.pop('id', None)
+    return refs
+
+
+# Vocabulary
+
+FIRST_NAMES = ['Олександр', 'Андрій', 'Дмитро', 'Максим', 'Іван', 'Сергій', 'Олена', 'Марія', 'Анна',
+               'Наталія', 'Юлія', 'Тетяна', 'Ірина', 'Віктор', 'Богдан', 'Катерина', 'Оксана', 'Роман',
+               'Alex', 'Maria', 'Anna', 'Dmitry', 'Olga', 'Ivan']
+LAST_NAMES = ['Шевченко', 'Коваленко', 'Бондаренко', 'Ткаченко', 'Кравченко', 'Олійник', 'Мельник',
+              'Поліщук', 'Савченко', 'Лисенко', 'Руденко', 'Петренко', 'Мороз', 'Гончаренко',
+              'Smith', 'Novak', 'Ivanova', 'Kowalski']
+TRANSLIT = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e', 'є': 'ie', 'ж': 'zh', 'з': 'z',
+    'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p',
+    'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh',
+    'щ': 'shch', 'ь': '', 'ю': 'iu', 'я': 'ia', "'": '',
+})
+EMAIL_DOMAINS = [('gmail.com', 60), ('ukr.net', 20), ('i.ua', 5), ('outlook.com', 5), ('icloud.com', 5),
+                 ('company.com.ua', 5)]
+OPERATORS = ['50', '66', '95', '99', '67', '68', '96', '97', '98', '63', '73', '93']
+USER_AGENTS = [
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) '
+    'Version/17.2 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/120.0.0.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) '
+    'Version/17.2 Safari/605.1.15',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) '
+    'Mobile/15E148 Instagram 312.0.0.22.114',
+]
+UA_WEIGHTS = [35, 30, 20, 5, 10]
+WORDS = ('дякую потрібна консультація ціна доставка замовлення меблі ремонт кухня квартира сайт '
+         'реклама бюджет терміново зателефонуйте будь ласка коли можна зустрітися прорахунок '
+         'проект дизайн налаштування таргет google meta запуск').split()
+
+NICHES = ['furniture', 'renovation', 'ecommerce', 'services', 'realestate', 'other']
+NICHE_TITLES = {
+    'furniture': 'Меблі на замовлення', 'renovation': 'Ремонт квартир', 'ecommerce': 'Інтернет-магазин',
+    'services': 'Послуги', 'realestate': 'Нерухомість', 'other': 'Консультація',
+}
+QUIZ_PLATFORMS = [('meta_ads', 55), ('google_ads', 35), ('telegram', 10)]
+QUESTION_TYPES = [('text_options', 50), ('image_options', 20), ('emoji', 5), ('dropdown', 5),
+                  ('slider', 10), ('rating', 5), ('date', 5)]
+
+UTM_SOURCES = [  # (utmSource, utmMedium, weight)
+    ('facebook', 'paid_social', 38), ('instagram', 'paid_social', 17), ('google', 'cpc', 30),
+    ('telegram', 'referral', 5), ('tiktok', 'paid_social', 3), (None, None, 7),
+]
+LANGUAGES = [('uk', 70), ('ru', 20), ('en', 10)]
+STATUSES = [  # (name, color, weight of leads in this status)
+    ('New', '#3B82F6', 30), ('In Progress', '#F59E0B', 20), ('Contacted', '#8B5CF6', 20),
+    ('Qualified', '#10B981', 12), ('Won', '#22C55E', 8), ('Lost', '#EF4444', 10),
+]
+EVENT_TYPES = [('page_view', 45), ('quiz_start', 18), ('quiz_question_answer', 20), ('form_submit', 7),
+               ('quiz_complete', 6), ('cta_click', 4)]
+EVENT_PLATFORMS = [('clarity', 30), ('ga4', 30), ('meta_pixel', 20), ('gtm', 15), ('all', 5)]
+EVENT_ERRORS = ['Network timeout', 'Invalid pixel ID', 'Rate limit exceeded', '400 Bad Request']
+HISTORY_FIELDS = [('statusId', 55), ('assignedTo', 30), ('phone', 5), ('name', 5), ('email', 5)]
+MESSAGE_PLATFORMS = [('telegram', 45), ('whatsapp', 30), ('email', 15), ('sms', 10)]
+MESSAGE_TEMPLATES = [
+    'Добрий день, {name}! Дякуємо за заявку, коли вам зручно поговорити?',
+    'Вітаю! Надсилаю прорахунок по вашому запиту.',
+    'Нагадую про нашу зустріч завтра о {hour}:00.',
+    '{name}, чи актуальне ще питання?',
+]
+
+
+def weighted(pairs):
+    """(values, cumulative weights) for rng.choices(..., cum_weights=...)"""
+    return [value for value, _ in pairs], list(accumulate(weight for _, weight in pairs))
+
+
+def pick(rng, table):
+    values, cumulative = table
+    return values[bisect(cumulative, rng.random() * cumulative[-1])]
+
+
+W_DOMAINS = weighted(EMAIL_DOMAINS)
+W_UA = weighted(list(zip(USER_AGENTS, UA_WEIGHTS)))
+W_QUIZ_PLATFORMS = weighted(QUIZ_PLATFORMS)
+W_QUESTION_TYPES = weighted(QUESTION_TYPES)
+W_UTM = weighted([((source, medium), weight) for source, medium, weight in UTM_SOURCES])
+W_LANGUAGES = weighted(LANGUAGES)
+W_STATUSES = weighted([(i + 1, status[2]) for i, status in enumerate(STATUSES)])
+W_EVENT_TYPES = weighted(EVENT_TYPES)
+W_EVENT_PLATFORMS = weighted(EVENT_PLATFORMS)
+W_HISTORY = weighted(HISTORY_FIELDS)
+W_MESSAGE_PLATFORMS = weighted(MESSAGE_PLATFORMS)
+
+
+def timestamp(epoch):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(epoch))
+
+
+# Shared context: everything a worker needs to make rows agree across tables
+
+class Context:
+    """Volumes, time span and the quiz catalogue, derived from the seed"""
+
+    def __init__(self, rows, seed, end, days, unique=None):
+        self.rows = rows
+        self.unique = unique or {}
+        self.seed = seed
+        self.end = end
+        self.start = end - days * 86400
+        rng = random.Random(f"{seed}:context")
+        # The catalogue exists even when quizzes/users aren't generated (already loaded)
+        quizzes = rows.get('quizzes') or VOLUMES['quizzes']
+        self.question_counts = [rng.randint(5, 12) for _ in range(quizzes)]
+        self.first_question = [1] + list(accumulate(self.question_counts))[:-1]
+        # Per-quiz funnel quality: scales every question's drop-off probability
+        self.quality = [rng.uniform(0.6, 1.6) for _ in range(quizzes)]
+        self.niches = [NICHES[i % len(NICHES)] for i in range(quizzes)]
+        self.platforms = [pick(rng, W_QUIZ_PLATFORMS) for _ in range(quizzes)]
+        # Quiz popularity (Zipf), fixed per slot: quiz of lead L is popularity[L % POPULARITY_SLOTS]
+        weights = [1 / (rank + 1) ** 1.1 for rank in range(quizzes)]
+        order = rng.sample(range(1, quizzes + 1), quizzes)
+        cumulative = list(accumulate(weights))
+        self.popularity = [order[bisect(cumulative, (slot + 0.5) / POPULARITY_SLOTS * cumulative[-1])]
+                           for slot in range(POPULARITY_SLOTS)]
+        self.slots = {}
+        for slot, quiz in enumerate(self.popularity):
+            self.slots.setdefault(quiz, []).append(slot)
+        users = rows.get('users') or VOLUMES['users']
+        self.managers = list(range(2, users + 1)) or [1]
+
+    def quiz_name(self, quiz):
+        niche = self.niches[quiz - 1]
+        return f"{NICHE_TITLES[niche]} #{quiz}"
+
+    def quiz_slug(self, quiz):
+        return f"{self.niches[quiz - 1]}-{self.platforms[quiz - 1].split('_')[0]}-{quiz}"
+
+    def created(self, table, row_id, rng=None):
+        """Time of row `row_id`: ids are spread evenly over the span"""
+        count = self.rows.get(table) or 1
+        slot = (self.end - self.start) / count
+        return int(self.start + slot * (row_id - 1) + (rng.random() * slot if rng else 0))
+
+    def after(self, table, row_id):
+        """A time no earlier than row `row_id`'s created time (the end of its slot)"""
+        return self.created(table, row_id + 1)
+
+    def lead_of_quiz(self, rng, quiz, moment):
+        """A lead id of `quiz` created near `moment`, or None"""
+        count = self.rows.get('leads', 0)
+        slots = self.slots.get(quiz)
+        if not count or not slots:
+            return None
+        slot = rng.choice(slots)
+        target = (moment - self.start) / (self.end - self.start) * count
+        k = max(0, min((count - slot) // POPULARITY_SLOTS, round((target - slot) / POPULARITY_SLOTS)))
+        lead = slot + k * POPULARITY_SLOTS
+        return lead if 1 <= lead <= count else None
+
+    def random_id(self, rng, table):
+        return rng.randint(1, self.rows[table]) if self.rows.get(table) else None
+
+
+def person(rng):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return first, last
+
+
+def email_for(first, last, row_id, rng):
+    local = f"{first.lower().translate(TRANSLIT)}.{last.lower().translate(TRANSLIT)}{row_id}"
+    return f"{local}@{pick(rng, W_DOMAINS)}"
+
+
+def phone_for(rng):
+    return f"+380{rng.choice(OPERATORS)}{rng.randint(0, 9999999):07d}"
+
+
+def ip_for(rng):
+    return f"{rng.choice((31, 46, 91, 176, 178, 188, 193))}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+
+
+def sentence(rng, words=8):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+# Table generators: gen(ctx, rng, row_id) -> {column: value}; missing columns use generic values
+
+def gen_users(ctx, rng, row_id):
+    first, last = person(rng)
+    created = ctx.created('users', row_id, rng)
+    return {
+        'id': row_id, 'name': f"{first} {last}", 'email': email_for(first, last, row_id, rng),
+        'passwordHash': '$2b$10$' + ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789./')
+                                            for _ in range(53)),
+        'isActive': rng.random() < 0.9,
+        'role': 'admin' if row_id == 1 else ('manager' if rng.random() < 0.85 else 'user'),
+        'telegramChatId': str(rng.randint(10 ** 8, 10 ** 10)) if rng.random() < 0.4 else None,
+        'createdAt': timestamp(created), 'updatedAt': timestamp(created),
+        'lastSignedIn': timestamp(ctx.end - rng.randint(0, 30 * 86400)),
+    }
+
+
+def gen_lead_statuses(ctx, rng, row_id):
+    name, color, _ = STATUSES[(row_id - 1) % len(STATUSES)]
+    return {'id': row_id, 'name': name, 'color': color, 'order': row_id, 'isDefault': int(row_id == 1),
+            'createdBy': 1, 'createdAt': timestamp(ctx.start), 'updatedAt': timestamp(ctx.start)}
+
+
+def gen_quizzes(ctx, rng, row_id):
+    niche = ctx.niches[row_id - 1]
+    return {
+        'id': row_id, 'name': ctx.quiz_name(row_id), 'slug': ctx.quiz_slug(row_id),
+        'description': sentence(rng, 12), 'quizType': 'lead_generation',
+        'platform': ctx.platforms[row_id - 1], 'niche': niche, 'isActive': rng.random() < 0.85,
+        'createdBy': 1, 'createdAt': timestamp(ctx.start), 'updatedAt': timestamp(ctx.start),
+    }
+
+
+def gen_quiz_questions(ctx, rng, row_id):
+    quiz = bisect(ctx.first_question, row_id)
+    index = row_id - ctx.first_question[quiz - 1]
+    last = index == ctx.question_counts[quiz - 1] - 1
+    options = [f"Варіант {n + 1}" for n in range(rng.randint(2, 6))]
+    return {
+        'id': row_id, 'quizId': quiz, 'questionText': f"Питання {index + 1}: {sentence(rng, 5)}",
+        'questionType': 'custom_input' if last else pick(rng, W_QUESTION_TYPES),
+        'answerOptions': None if last else json.dumps(options, ensure_ascii=False),
+        'orderIndex': index, 'isRequired': not last or rng.random() < 0.5,
+        'createdAt': timestamp(ctx.start), 'updatedAt': timestamp(ctx.start),
+    }
+
+
+def gen_leads(ctx, rng, row_id):
+    quiz = ctx.popularity[row_id % POPULARITY_SLOTS]
+    first, last = person(rng)
+    source, medium = pick(rng, W_UTM)
+    niche = ctx.niches[quiz - 1]
+    answers = [{'question': n + 1, 'answer': f"Варіант {rng.randint(1, 4)}"}
+               for n in range(ctx.question_counts[quiz - 1] - 1)]
+    campaign = (f"{niche}_{source}_{min(int(rng.paretovariate(1.2)), 40)}" if source else None)
+    row = {
+        'id': row_id, 'quizName': ctx.quiz_name(quiz),
+        'answers': json.dumps(answers, ensure_ascii=False), 'name': f"{first} {last}",
+        'phone': phone_for(rng),
+        'telegram': f"@{first.lower().translate(TRANSLIT)}_{rng.randint(1, 9999)}" if rng.random() < 0.25 else None,
+        'email': email_for(first, last, row_id, rng) if rng.random() < 0.4 else None,
+        'language': pick(rng, W_LANGUAGES), 'utmSource': source, 'utmMedium': medium,
+        'utmCampaign': campaign, 'source': source or 'direct',
+        'utmContent': f"creative_{rng.randint(1, 25)}" if source else None,
+        'statusId': pick(rng, W_STATUSES),
+        'assignedTo': rng.choice(ctx.managers) if rng.random() < 0.7 else None,
+        'leadScore': max(0, min(100, int(rng.gauss(45, 20)))),
+        'spentAmount': Decimal(f"{rng.lognormvariate(4, 1.2):.2f}") if rng.random() < 0.15 else Decimal('0.00'),
+        'timeOnSite': int(rng.lognormvariate(4.5, 0.8)),
+        'clientIp': ip_for(rng), 'userAgent': pick(rng, W_UA),
+        'createdAt': timestamp(ctx.created('leads', row_id, rng)),
+    }
+    if source == 'google':
+        row.update({'utmAdGroup': f"{niche}_group_{rng.randint(1, 8)}", 'utmKeyword': f"{niche} {rng.choice(WORDS)}",
+                    'utmTerm': rng.choice(WORDS), 'ga4ClientId': f"{rng.randint(10 ** 8, 10 ** 9)}.{rng.randint(10 ** 8, 10 ** 9)}"})
+    elif source in ('facebook', 'instagram'):
+        row.update({'utmPlacement': rng.choice(['feed', 'stories', 'reels']),
+                    'fbp': f"fb.1.{rng.randint(10 ** 12, 10 ** 13)}.{rng.randint(10 ** 8, 10 ** 9)}",
+                    'eventId': f"lead_{row_id}"})
+    return row
+
+
+def question_drop_off(ctx, quiz, index):
+    """Probability a session leaves after viewing question `index` of `quiz`"""
+    count = ctx.question_counts[quiz - 1]
+    if index == count - 1:
+        base = 0.22                      # contact form
+    elif index == 0:
+        base = 0.12
+    else:
+        base = 0.03 + 0.006 * index
+    return min(0.9, base * ctx.quality[quiz - 1])
+
+
+def gen_quiz_sessions(ctx, rng, row_id, events):
+    """One session; appends its quiz_question_events rows to `events`"""
+    quiz = rng.choice(ctx.popularity)
+    count = ctx.question_counts[quiz - 1]
+    started = ctx.created('quiz_sessions', row_id, rng)
+    session_id = f"sess_{ctx.seed}_{row_id:010d}"
+    moment = started
+    answered = 0
+    completed = True
+    for index in range(count):
+        question = ctx.first_question[quiz - 1] + index
+        spent = int(rng.lognormvariate(2.9 if index == count - 1 else 1.8, 0.6)) + 1
+        events.append({'id': (row_id - 1) * EVENT_STRIDE + len(events) + 1, 'quizId': quiz,
+                       'sessionId': session_id, 'questionId': question, 'eventType': 'viewed',
+                       'timeSpent': 0, 'timestamp': timestamp(moment)})
+        if rng.random() < question_drop_off(ctx, quiz, index):
+            completed = False
+            moment += spent
+            break
+        moment += spent
+        skipped = index < count - 1 and rng.random() < 0.04
+        events.append({'id': (row_id - 1) * EVENT_STRIDE + len(events) + 1, 'quizId': quiz,
+                       'sessionId': session_id, 'questionId': question,
+                       'eventType': 'skipped' if skipped else 'answered',
+                       'answer': None if skipped else f"Варіант {rng.randint(1, 4)}",
+                       'timeSpent': spent, 'timestamp': timestamp(moment)})
+        answered += not skipped
+    if completed:
+        status = 'completed'
+    elif ctx.end - moment < 1800:
+        status = 'in_progress'
+    else:
+        status = 'abandoned'
+    return {
+        'id': row_id, 'quizId': quiz, 'sessionId': session_id,
+        'leadId': ctx.lead_of_quiz(rng, quiz, started) if completed else None,
+        'startedAt': timestamp(started), 'completedAt': timestamp(moment) if completed else None,
+        'status': status, 'totalQuestions': count, 'answeredQuestions': answered,
+        'timeSpent': moment - started, 'userAgent': pick(rng, W_UA), 'ipAddress': ip_for(rng),
+        'createdAt': timestamp(started),
+    }
+
+
+def gen_events_log(ctx, rng, row_id):
+    event_type = pick(rng, W_EVENT_TYPES)
+    failed = rng.random() < 0.03
+    quiz = rng.choice(ctx.popularity)
+    platform = pick(rng, W_EVENT_PLATFORMS)
+    data = {'quizId': ctx.quiz_slug(quiz)} if event_type != 'page_view' else {'page': '/'}
+    return {
+        'id': row_id, 'event_type': event_type, 'platform': platform,
+        'status': 'fail' if failed else 'success', 'event_data': json.dumps(data),
+        'error_message': rng.choice(EVENT_ERRORS) if failed else None,
+        'user_id': f"sess_{ctx.seed}_{rng.randint(1, max(1, ctx.rows.get('quiz_sessions', 1))):010d}",
+        'quiz_id': ctx.quiz_slug(quiz) if event_type != 'page_view' else None,
+        'timestamp': timestamp(ctx.created('events_log', row_id, rng)),
+        'response_time': int(rng.lognormvariate(5, 0.7)) if not failed else 5000,
+        'ip_address': ip_for(rng), 'user_agent': pick(rng, W_UA),
+        'clarity_user_id': f"cu{rng.getrandbits(40):x}" if platform in ('clarity', 'all') else None,
+        'clarity_session_id': f"cs{rng.getrandbits(40):x}" if platform in ('clarity', 'all') else None,
+        'clarity_project_id': 'pikaleads' if platform in ('clarity', 'all') else None,
+    }
+
+
+def gen_lead_history(ctx, rng, row_id):
+    lead = ctx.random_id(rng, 'leads') or 1
+    field = pick(rng, W_HISTORY)
+    if field == 'statusId':
+        old, new = str(rng.randint(1, 5)), str(pick(rng, W_STATUSES))
+    elif field == 'assignedTo':
+        old = str(rng.choice(ctx.managers)) if rng.random() < 0.5 else None
+        new = str(rng.choice(ctx.managers))
+    elif field == 'phone':
+        old, new = phone_for(rng), phone_for(rng)
+    else:
+        first, last = person(rng)
+        old, new = f"{first} {last}", f"{first} {rng.choice(LAST_NAMES)}"
+    return {'id': row_id, 'leadId': lead, 'userId': rng.choice(ctx.managers), 'field': field,
+            'oldValue': old, 'newValue': new,
+            'changedAt': timestamp(min(ctx.end, ctx.after('leads', lead) + int(rng.expovariate(1 / 86400))))}
+
+
+def gen_messages(ctx, rng, row_id):
+    lead = ctx.random_id(rng, 'leads') or 1
+    outbound = rng.random() < 0.55
+    platform = pick(rng, W_MESSAGE_PLATFORMS)
+    text = (rng.choice(MESSAGE_TEMPLATES).format(name=rng.choice(FIRST_NAMES), hour=rng.randint(9, 19))
+            if outbound else sentence(rng, rng.randint(3, 14)))
+    return {'id': row_id, 'leadId': lead, 'platform': platform,
+            'direction': 'outbound' if outbound else 'inbound', 'message': text,
+            'sentBy': rng.choice(ctx.managers) if outbound else None,
+            'externalId': f"{platform}_{rng.getrandbits(48):x}",
+            'createdAt': timestamp(min(ctx.end, ctx.after('leads', lead) + int(rng.expovariate(1 / 172800))))}
+
+
+GENERATORS = {
+    'users': gen_users,
+    'lead_statuses': gen_lead_statuses,
+    'quizzes': gen_quizzes,
+    'quiz_questions': gen_quiz_questions,
+    'leads': gen_leads,
+    'quiz_sessions': gen_quiz_sessions,
+    'events_log': gen_events_log,
+    'lead_history': gen_lead_history,
+    'messages': gen_messages,
+}
+
+
+# Generic values from column type and name
+
+def generic_value(ctx, rng, table, column, refs, row_id):
+    name, kind = column.name, column.type.lower()
+    if column.autoincrement or (name == 'id' and kind.startswith('int')):
+        return row_id
+    if name in refs:
+        value = ctx.random_id(rng, refs[name])
+        if value is not None or column.nullable:
+            return value
+        return 1
+    if column.nullable and rng.random() < 0.3:
+        return None
+    lower = name.lower()
+    if kind.startswith('enum('):
+        return rng.choice([value.strip().strip("'") for value in kind[5:-1].split(',')])
+    if kind in ('boolean', 'bool', 'tinyint(1)'):
+        return rng.random() < 0.8
+    if kind.startswith(('int', 'bigint', 'smallint', 'tinyint', 'mediumint')):
+        return rng.randint(0, 1000)
+    if kind.startswith(('decimal', 'numeric', 'float', 'double')):
+        return Decimal(f"{rng.uniform(0, 1000):.2f}")
+    if kind.startswith(('timestamp', 'datetime')):
+        return timestamp(ctx.created(table, row_id, rng))
+    if kind == 'date':
+        return timestamp(ctx.created(table, row_id, rng))[:10]
+    if kind == 'json':
+        return '{}'
+    length = int(kind[kind.index('(') + 1:-1]) if kind.startswith('varchar(') else 65535
+    if 'email' in lower:
+        value = email_for(*person(rng), row_id, rng)
+    elif 'phone' in lower:
+        value = phone_for(rng)
+    elif lower.endswith('url') or lower.endswith('image'):
+        value = f"https://cdn.example.com/{table}/{row_id}.webp"
+    elif 'color' in lower:
+        value = f"#{rng.getrandbits(24):06X}"
+    elif lower in ('name', 'title') or lower.endswith('name'):
+        value = f"{table.replace('_', ' ').capitalize()} {row_id}"
+    elif 'token' in lower or 'secret' in lower or 'key' in lower:
+        value = f"{rng.getrandbits(128):032x}"
+    elif 'ip' == lower or 'ipaddress' in lower:
+        value = ip_for(rng)
+    elif kind.startswith('varchar'):
+        value = f"{name}_{row_id}" if name in ctx.unique.get(table, ()) else f"{name}_{rng.randint(1, 50)}"
+    else:
+        value = sentence(rng, rng.randint(5, 30))
+    return value[:length]
+
+
+# Output
+
+class ChunkFile:
+    """One bulk-load chunk: multi-row INSERTs (sql) or LOAD DATA rows (tsv)"""
+
+    def __init__(self, out_dir, table, index, columns, fmt):
+        self.name = f"data/{table}.{index:04d}.{fmt}"
+        self.path = os.path.join(out_dir, self.name)
+        self.fmt = fmt
+        self.rows = 0
+        self._file = open(self.path, 'w', encoding='utf-8', newline='\n')
+        if fmt == 'tsv':
+            self._file.write('\t'.join(columns) + '\n')
+        else:
+            self._file.write(CHUNK_HEADER)
+            self._prefix = (f"INSERT INTO {quote_identifier(table)} "
+                            f"({', '.join(quote_identifier(c) for c in columns)}) VALUES ")
+            self._values = []
+            self._size = 0
+
+    def write(self, row):
+        self.rows += 1
+        if self.fmt == 'tsv':
+            self._file.write('\t'.join(map(tsv_field, row)) + '\n')
+            return
+        values = '(' + ','.join(map(sql_literal, row)) + ')'
+        self._values.append(values)
+        self._size += len(values) + 1
+        if self._size >= STATEMENT_BYTES:
+            self._flush()
+
+    def _flush(self):
+        if self._values:
+            self._file.write(self._prefix + ','.join(self._values) + ';\n')
+            self._values = []
+            self._size = 0
+
+    def close(self):
+        if self.fmt == 'sql':
+            self._flush()
+        self._file.close()
+        return {'file': self.name, 'rows': self.rows, 'bytes': os.path.getsize(self.path)}
+
+
+_worker = None
+
+
+def _init_worker(ctx, tables, out_dir, fmt):
+    global _worker
+    _worker = (ctx, tables, out_dir, fmt)
+
+
+def generate_chunk(table_name, index, first_id, last_id):
+    """Write rows first_id..last_id of a table (and derived rows); returns {table: chunk entry}"""
+    ctx, tables, out_dir, fmt = _worker
+    table = tables[table_name]
+    rng = random.Random(f"{ctx.seed}:{table_name}:{index}")
+    refs = references(table)
+    names = [column.name for column in table.columns]
+    generator = GENERATORS.get(table_name)
+    chunk = ChunkFile(out_dir, table_name, index, names, fmt)
+    events_table = tables.get('quiz_question_events') if table_name == 'quiz_sessions' else None
+    events_chunk = (ChunkFile(out_dir, 'quiz_question_events', index, [c.name for c in events_table.columns], fmt)
+                    if events_table else None)
+    events = []
+    for row_id in range(first_id, last_id + 1):
+        if table_name == 'quiz_sessions':
+            values = generator(ctx, rng, row_id, events)
+        else:
+            values = generator(ctx, rng, row_id) if generator else {}
+        chunk.write(tuple(values[column.name] if column.name in values else
+                          generic_value(ctx, rng, table_name, column, refs, row_id)
+                          for column in table.columns))
+        if events:
+            if events_chunk:
+                for event in events:
+                    events_chunk.write(tuple(event.get(column.name) for column in events_table.columns))
+            events = []
+    result = {table_name: chunk.close()}
+    if events_chunk:
+        result['quiz_question_events'] = events_chunk.close()
+    return result
+
+
+def volumes(tables, scale, overrides):
+    """Rows per generated table"""
+    rows = {}
+    for table, count in VOLUMES.items():
+        if table in tables:
+            rows[table] = max(1, round(count * scale)) if table in SCALED else count
+    rows.update(overrides)
+    return rows
+
+
+def generate(out_dir, tables, rows, seed=1, end=None, days=365, jobs=None, fmt='sql', chunk_rows=CHUNK_ROWS,
+             force=False):
+    """Write the plan directory; returns the plan"""
+    jobs = jobs or os.cpu_count() or 1
+    end = int(end if end is not None else time.time()) // 86400 * 86400
+    rows = dict(rows)
+    ctx = Context(rows, seed, end, days, {name: table.unique for name, table in tables.items()})
+    if 'quizzes' in rows and 'quiz_questions' in tables:
+        rows['quiz_questions'] = sum(ctx.question_counts)
+    generated = [name for name in rows if name in tables]
+
+    prepare_plan_dir(out_dir, force)
+
+    outputs = set(generated)
+    if 'quiz_sessions' in outputs and 'quiz_question_events' in tables:
+        outputs.add('quiz_question_events')
+    plan_tables = {}
+    graph = ForeignKeyGraph()
+    for name in sorted(outputs):
+        table = tables[name]
+        schema_file = f"schema/{name}.sql"
+        with open(os.path.join(out_dir, schema_file), 'w', encoding='utf-8') as f:
+            f.write(CHUNK_HEADER + f"DROP TABLE IF EXISTS {quote_identifier(name)};\n" + create_table_sql(table))
+        plan_tables[name] = {'schema': schema_file, 'columns': [c.name for c in table.columns],
+                             'chunks': [], 'rows': 0, 'bytes': 0}
+        for column, parent in references(table).items():
+            if parent in outputs and parent != name:
+                graph.add(name, None, [column], parent, ['id'])
+
+    tasks = []
+    for name in generated:
+        for index, first in enumerate(range(1, rows[name] + 1, chunk_rows)):
+            tasks.append((name, index, first, min(rows[name], first + chunk_rows - 1)))
+    # Biggest tasks first: sessions also write their events
+    tasks.sort(key=lambda task: -(task[3] - task[2]) * (8 if task[0] == 'quiz_sessions' else 1))
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(ctx, tables, out_dir, fmt)) as pool:
+        results = [pool.submit(generate_chunk, *task) for task in tasks]
+        for future in results:
+            for name, entry in future.result().items():
+                plan_tables[name]['chunks'].append(entry)
+    for entry in plan_tables.values():
+        entry['chunks'].sort(key=lambda chunk: chunk['file'])
+        entry['rows'] = sum(chunk['rows'] for chunk in entry['chunks'])
+        entry['bytes'] = sum(chunk['bytes'] for chunk in entry['chunks'])
+
+    levels, cycle = restore_levels(plan_tables, graph)
+    plan = {
+        'version': PLAN_VERSION,
+        'source': f"synthetic_data.py seed={seed}",
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'levels': levels,
+        'cycles': cycle,
+        'foreign_keys': [[table, parent] for table, parent in graph.edges()],
+        'tables': plan_tables,
+    }
+    with open(os.path.join(out_dir, 'plan.json'), 'w', encoding='utf-8') as f:
+        json.dump(plan, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    return plan
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate synthetic CRM data as bulk-load chunks")
+    parser.add_argument('out_dir', nargs='?', default=DEFAULT_OUTPUT)
+    parser.add_argument('--scale', type=float, default=1.0, help='multiplier for leads/sessions/events volumes')
+    parser.add_argument('--rows', action='append', default=[], metavar='TABLE=N',
+                        help='rows for a table (adds tables without a generator too)')
+    parser.add_argument('--only', action='append', metavar='TABLE', help='generate only these tables')
+    parser.add_argument('--format', choices=['sql', 'tsv'], default='sql',
+                        help='multi-row INSERT chunks or LOAD DATA TSV')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--days', type=int, default=365, help='time span of the data')
+    parser.add_argument('--end', help='end of the time span, YYYY-MM-DD (default: today)')
+    parser.add_argument('--from-migrations', action='store_true', help='columns from drizzle/*.sql, not schema.ts')
+    parser.add_argument('--force', action='store_true', help='replace out_dir even if it holds no earlier plan')
+    args = parser.parse_args()
+
+    tables = (tables_from_migrations(compile_migrations()) if args.from_migrations
+              else tables_from_schema(load_schema()))
+    overrides = {}
+    for spec in args.rows:
+        table, _, count = spec.partition('=')
+        if table not in tables or not count.isdigit():
+            parser.error(f"--rows {spec!r}: expected <table in the schema>=<count>")
+        overrides[table] = int(count)
+    rows = volumes(tables, args.scale, overrides)
+    if args.only:
+        rows = {table: count for table, count in rows.items() if table in args.only}
+    end = (datetime.datetime.strptime(args.end, '%Y-%m-%d').replace(tzinfo=datetime.timezone.utc).timestamp()
+           if args.end else None)
+
+    started = time.perf_counter()
+    try:
+        plan = generate(args.out_dir, tables, rows, args.seed, end, args.days, args.jobs, args.format,
+                        args.chunk_rows, args.force)
+    except FileExistsError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - started
+
+    total_rows = sum(entry['rows'] for entry in plan['tables'].values())
+    total_bytes = sum(entry['bytes'] for entry in plan['tables'].values())
+    for name, entry in sorted(plan['tables'].items(), key=lambda item: -item[1]['rows']):
+        print(f"📦 {name:<24} {entry['rows']:>10} rows {entry['bytes'] / 1e6:>9.1f} MB {len(entry['chunks']):>4} chunks")
+    print(f"✅ {total_rows} rows ({total_bytes / 1e6:.1f} MB) in {elapsed:.1f}s "
+          f"({total_rows / elapsed if elapsed else 0:,.0f} rows/s) → {args.out_dir}/plan.json")
+    print(f"   load with: python restore_planner.py run {args.out_dir} --sqlite /tmp/synthetic.db")
@@ -0,0 +1,17 @@
+import importlib
+import sys
+
+from codemod_manifest import rules_hash
+
+
+def test_rules_hash_covers_module_source(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    helper = tmp_path / 'rules_helper.py'
+    helper.write_text('def classes():\n    return "text-sm"\n')
+    module = importlib.import_module('rules_helper')
+    before = rules_hash(module, {'a': 'b'})
+
+    helper.write_text('def classes():\n    return "text-base"\n')
+    module = importlib.reload(module)
+    sys.modules.pop('rules_helper')
+    assert rules_hash(module, {'a': 'b'}) != before
@@ -0,0 +1,33 @@
+import columnar_snapshot
+from columnar_snapshot import Snapshot, convert
+
+DUMP = """\
+INSERT INTO `leads` (`id`, `name`, `phone`, `email`, `language`, `timeOnSite`) VALUES \
+(1,'Olha','+380501','a@example.com','uk',30),\
+(2,'Ivan','+380502',NULL,'uk',4294967296),\
+(3,'Olha','+380503','c@example.com','ru',NULL),\
+(4,'Petro','+380504','d@example.com','uk',-5);
+"""
+
+
+def test_near_unique_varchar_and_large_int(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar_snapshot, 'MAX_DICTIONARY', 2)
+    monkeypatch.setattr(columnar_snapshot, 'FLUSH_ROWS', 2)
+    dump = tmp_path / 'dump.sql'
+    dump.write_text(DUMP, encoding='utf-8')
+    convert(str(dump), str(tmp_path / 'snapshot'), ['leads'])
+
+    snapshot = Snapshot(str(tmp_path / 'snapshot'))
+    assert snapshot.info('leads', 'language')['encoding'] == 'dict'
+    assert snapshot.info('leads', 'email')['encoding'] == 'utf8'
+    assert snapshot.values('leads', 'email') == ['a@example.com', None, 'c@example.com', 'd@example.com']
+    assert snapshot.values('leads', 'phone') == ['+380501', '+380502', '+380503', '+380504']
+    assert snapshot.values('leads', 'name') == ['Olha', 'Ivan', 'Olha', 'Petro']
+
+    assert snapshot.info('leads', 'timeOnSite')['dtype'] == '<i8'
+    assert snapshot.info('leads', 'id')['dtype'] == '<i4'
+    assert snapshot.values('leads', 'timeOnSite') == [30, 4294967296, None, -5]
+    assert sorted(p.name for p in (tmp_path / 'snapshot' / 'leads').iterdir()
+                  if p.name.startswith(('email', 'timeOnSite'))) == [
+        'email.offsets.npy', 'email.utf8', 'email.valid.npy', 'timeOnSite.npy', 'timeOnSite.valid.npy']
+    snapshot.close()
@@ -0,0 +1,46 @@
+from jsx_lexer import JSXLexer, iter_tags
+
+
+def closing_brace(code):
+    """Offset scan_js stops at for `code` followed by the closing `}` of a block"""
+    return JSXLexer(code).scan_js(0, stop_at_brace=True)
+
+
+def test_non_null_assertion_then_division():
+    code = 'x! / y }'
+    assert closing_brace(code) == code.index('}')
+
+
+def test_non_null_assertion_on_index_then_division():
+    code = 'a[0]! / 2 }'
+    assert closing_brace(code) == code.index('}')
+
+
+def test_negated_regex_literal():
+    code = 'if (!/a}b/.test(s)) go() }'
+    assert closing_brace(code) == code.rindex('}')
+
+
+def test_negated_regex_after_return():
+    code = 'return !/a}b/.test(s) }'
+    assert closing_brace(code) == code.rindex('}')
+
+
+def test_tags_after_non_null_division():
+    content = (
+        '<a href={activity.fileUrl}>\n'
+        '  {activity.fileName} ({(activity.fileSize! / 1024).toFixed(1)} KB)\n'
+        '</a>\n'
+        '<Badge variant="outline" />\n'
+    )
+    assert [tag.name for tag in iter_tags(content)] == ['a', 'Badge']
+
+
+def test_generic_arrow_is_not_jsx():
+    content = (
+        'const update = <K extends keyof Settings>(key: K) => {\n'
+        '  set(key);\n'
+        '};\n'
+        'const view = <div className="p-4" />;\n'
+    )
+    assert [tag.name for tag in iter_tags(content)] == ['div']
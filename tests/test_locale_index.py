@@ -0,0 +1,24 @@
+from locale_index import LocaleIndex
+
+TREES = {
+    'uk': {'common': {'save': 'Зберегти'}, 'crm': {'status': 'Статус'}},
+    'ru': {'common': {'save': 'Сохранить'}, 'crm': {'status': 'Статус'}},
+    'en': {'common': {'save': 'Save'}, 'crm': {'status': 'Status'}},
+}
+
+
+def test_find_matches_every_locale():
+    index = LocaleIndex(TREES)
+    assert index.find('Зберегти', 'Сохранить', 'Save') == 'common.save'
+    assert index.find('Статус', 'Статус', 'Status') == 'crm.status'
+
+
+def test_find_does_not_reuse_key_with_other_translations():
+    index = LocaleIndex(TREES)
+    assert index.find('Записати', 'Записать', 'Save') is None
+
+
+def test_added_key_is_found():
+    index = LocaleIndex(TREES)
+    index.add('common.save_2', 'Записати', 'Записать', 'Save')
+    assert index.find('Записати', 'Записать', 'Save') == 'common.save_2'
@@ -0,0 +1,21 @@
+import locale_json
+
+TEXT = """{
+  "crm": {"title": "CRM", "table": {"status": "Status"}},
+  "crm": {"filters": "Filters", "table": {"status": "State", "name": "Name"}},
+  "save": "Save",
+  "save": "Save"
+}"""
+
+
+def test_duplicate_sections_are_deep_merged():
+    tree, _ = locale_json.loads(TEXT)
+    assert tree['crm'] == {'title': 'CRM', 'filters': 'Filters', 'table': {'status': 'State', 'name': 'Name'}}
+
+
+def test_nested_scalar_collision_is_reported_with_its_path():
+    _, duplicates = locale_json.loads(TEXT)
+    conflicts = [dup for dup in duplicates if dup.values is not None]
+    assert [(dup.path, dup.values) for dup in conflicts] == [('crm.table.status', ('Status', 'State'))]
+    assert [p.line for p in conflicts[0].positions] == [2, 3]
+    assert {dup.path for dup in duplicates if dup.values is None} == {'crm', 'save'}
@@ -0,0 +1,30 @@
+import datetime
+
+from columnar_snapshot import convert
+from quiz_funnel import FunnelData, compute_funnels
+
+NOW = int(datetime.datetime(2026, 1, 2, tzinfo=datetime.timezone.utc).timestamp())
+
+DUMP = """\
+INSERT INTO `quizzes` (`id`, `name`) VALUES (1,'Furniture');
+INSERT INTO `quiz_sessions` (`id`, `quizId`, `sessionId`, `startedAt`, `completedAt`, `totalQuestions`) VALUES \
+(1,1,'a','2026-01-01 10:00:00','2026-01-01 10:05:00',3),\
+(2,1,'b','2026-01-01 11:00:00','0000-00-00 00:00:00',3),\
+(3,1,'c','2026-01-01 12:00:00',NULL,3);
+INSERT INTO `quiz_question_events` (`id`, `quizId`, `sessionId`, `questionId`, `eventType`, `timeSpent`, `timestamp`) \
+VALUES (1,1,'a',7,'viewed',0,'2026-01-01 10:00:10'),(2,1,'a',7,'answered',12,'2026-01-01 10:00:22'),\
+(3,1,'b',7,'viewed',0,'2026-01-01 11:00:10'),(4,1,'b',7,'skipped',0,'2026-01-01 11:00:15');
+"""
+
+
+def test_zero_date_completed_at_is_not_completed_in_dump_and_snapshot(tmp_path):
+    dump = tmp_path / 'dump.sql'
+    dump.write_text(DUMP, encoding='utf-8')
+    convert(str(dump), str(tmp_path / 'snapshot'))
+
+    from_dump = compute_funnels(FunnelData.from_dump(str(dump)), [24], NOW)
+    from_snapshot = compute_funnels(FunnelData.from_snapshot(str(tmp_path / 'snapshot')), [24], NOW)
+
+    assert from_dump == from_snapshot
+    assert from_dump[0]['totalSessions'] == 3
+    assert from_dump[0]['completedSessions'] == 1
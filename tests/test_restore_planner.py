@@ -0,0 +1,25 @@
+import pytest
+
+from restore_planner import prepare_plan_dir
+
+
+def test_replaces_earlier_plan(tmp_path):
+    (tmp_path / 'plan.json').write_text('{}\n')
+    (tmp_path / 'data').mkdir()
+    (tmp_path / 'data' / 'leads.000.sql').write_text('')
+    prepare_plan_dir(str(tmp_path))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['data', 'schema']
+    assert not any((tmp_path / 'data').iterdir())
+
+
+def test_refuses_other_directory(tmp_path):
+    (tmp_path / 'package.json').write_text('{}\n')
+    with pytest.raises(FileExistsError):
+        prepare_plan_dir(str(tmp_path))
+    assert (tmp_path / 'package.json').exists()
+
+
+def test_force_replaces_other_directory(tmp_path):
+    (tmp_path / 'package.json').write_text('{}\n')
+    prepare_plan_dir(str(tmp_path), force=True)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['data', 'schema']
@@ -0,0 +1,57 @@
+import pytest
+
+from tsx_anchors import AnchorIndex
+
+TIMELINE = '''export default function LeadActivityTimeline({ activities }: Props) {
+  const sorted = [...activities].reverse();
+
+  return (
+    <div>
+      {sorted.map((activity) => (
+        <a href={activity.fileUrl}>
+          {activity.fileName} ({(activity.fileSize! / 1024).toFixed(1)} KB)
+        </a>
+      ))}
+    </div>
+  );
+}
+
+function Footer() {
+  return <p />;
+}
+'''
+
+
+def test_non_null_division_keeps_component_bounds():
+    index = AnchorIndex(TIMELINE)
+    timeline = index.get('component:LeadActivityTimeline')
+    footer = index.get('component:Footer')
+    assert TIMELINE[timeline.start:timeline.end].endswith('  );\n}\n')
+    assert timeline.end <= footer.start
+    assert index.has('tag:p')
+
+
+def test_unclosed_component_names_the_file():
+    with pytest.raises(ValueError, match=r'Broken\.tsx:1: body of component Broken'):
+        AnchorIndex('function Broken() {\n  const x = 1;\n', 'Broken.tsx')
+
+
+def test_declarations_are_keyed_by_component():
+    content = (
+        'function Header() {\n'
+        '  const { t } = useTranslation();\n'
+        '  return <h1>{t("title")}</h1>;\n'
+        '}\n'
+        '\n'
+        'export default function Page() {\n'
+        '  const { t } = useTranslation();\n'
+        '  const save = () => {};\n'
+        '  const save = () => {};\n'
+        '  return <p>{t("body")}</p>;\n'
+        '}\n'
+    )
+    index = AnchorIndex(content)
+    assert index.get('decl:Header.t').line == 2
+    assert index.get('decl:Page.t').line == 7
+    assert index.get('decl:Page.t').hook
+    assert index.duplicates('decl') == ['decl:Page.save']
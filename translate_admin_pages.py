@@ -1,4 +1,6 @@
-import re
+import rewrite_engine
+from codemod_manifest import Manifest, rules_hash
+from rewrite_engine import RewriteEngine, rewrite_file
 
 # CRMDashboard translations
 crm_dashboard_replacements = {
@@ -33,19 +35,21 @@ files_and_replacements = [
     ('client/src/pages/AdminDashboard.tsx', admin_dashboard_replacements),
 ]
 
+# Skip files whose content and replacement table are unchanged since last run
+manifest = Manifest()
+
 for filepath, replacements in files_and_replacements:
+    rules = rules_hash(rewrite_engine, replacements)
+    if manifest.is_fresh(filepath, rules):
+        print(f"⏭️  Unchanged since last run: {filepath}")
+        continue
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        for old, new in replacements.items():
-            content = content.replace(old, new)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        print(f"✅ Updated {filepath}")
+        counts = rewrite_file(filepath, RewriteEngine(replacements))
+        manifest.record(filepath, rules)
+        print(f"✅ Updated {filepath} ({sum(counts.values())} replacements)")
     except FileNotFoundError:
         print(f"❌ File not found: {filepath}")
 
+manifest.save()
+
 print("\n✅ Completed admin page translations!")
@@ -1,5 +1,7 @@
 import re
 
+from rewrite_engine import RewriteEngine
+
 file_path = "client/src/pages/CRM.tsx"
 
 with open(file_path, 'r', encoding='utf-8') as f:
@@ -57,10 +59,9 @@ replacements = {
     '"Edit"': 't("common.edit")',
 }
 
-for old, new in replacements.items():
-    content = content.replace(old, new)
+content, counts = RewriteEngine(replacements).rewrite(content)
 
 with open(file_path, 'w', encoding='utf-8') as f:
     f.write(content)
 
-print(f"✅ Translated {file_path}")
+print(f"✅ Translated {file_path} ({sum(counts.values())} replacements)")
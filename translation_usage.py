@@ -0,0 +1,202 @@
+"""
+Translation key usage index for client/src.
+
+Scans every .ts/.tsx file for `t("...")` calls once, stores key -> (file,
+line) in an on-disk index and afterwards only rescans files whose mtime or
+size changed. Reports keys missing per language, keys defined but never
+used, and keys only reachable through dynamic calls such as
+t(`quizEditor.types.${type}`) or t("leadDetail." + key).
+
+    python translation_usage.py                # full report
+    python translation_usage.py --where crm.title
+    python translation_usage.py --strict       # exit 1 if any key is missing
+"""
+import argparse
+import bisect
+import glob
+import json
+import os
+import re
+import sys
+
+from locale_index import LANGUAGES, flatten
+from locale_store import LocaleStore
+
+SOURCE_GLOBS = ['client/src/**/*.tsx', 'client/src/**/*.ts']
+DEFAULT_INDEX_PATH = '.translation-usage-index.json'
+INDEX_VERSION = 1
+
+# t("crm.title") / i18n.t('crm.title', {...}); legacy t('uk', 'ru', 'en') calls
+# (a second string argument) are not keys and are skipped
+STATIC_CALL = re.compile(r"""\bt\(\s*(['"])([\w-]+(?:\.[\w-]+)*)\1(?!\s*,\s*['"`])""")
+
+# t(`quizEditor.types.${type}`)
+TEMPLATE_CALL = re.compile(r"""\bt\(\s*`([^`]*)`""")
+
+# t("leadDetail.score." + key)
+CONCAT_CALL = re.compile(r"""\bt\(\s*(['"])([\w.-]+)\1\s*\+""")
+
+PLACEHOLDER = re.compile(r'\$\{[^}]*\}')
+
+
+def dynamic_pattern(template):
+    """Regex source matching every key a template literal can produce"""
+    parts = PLACEHOLDER.split(template)
+    return '[^.]+'.join(re.escape(part) for part in parts)
+
+
+def scan_source(content):
+    """Return (static, dynamic) lists of [key_or_pattern, line] for one file"""
+    line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+
+    def line_of(offset):
+        return bisect.bisect_right(line_starts, offset)
+
+    static = []
+    dynamic = []
+    for m in STATIC_CALL.finditer(content):
+        static.append([m.group(2), line_of(m.start())])
+    for m in TEMPLATE_CALL.finditer(content):
+        template = m.group(1)
+        if PLACEHOLDER.search(template):
+            dynamic.append([dynamic_pattern(template), line_of(m.start())])
+        else:
+            static.append([template, line_of(m.start())])
+    for m in CONCAT_CALL.finditer(content):
+        dynamic.append([re.escape(m.group(2)) + '.+', line_of(m.start())])
+    return static, dynamic
+
+
+class UsageIndex:
+    """Persistent per-file scan results plus in-memory key -> locations maps"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self.files = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == INDEX_VERSION:
+                    self.files = data['files']
+            except (OSError, ValueError):
+                self.files = {}
+        self._build_maps()
+
+    def update(self, patterns=SOURCE_GLOBS):
+        """Rescan only files that are new or whose mtime/size changed"""
+        seen = set()
+        rescanned = 0
+        for pattern in patterns:
+            for file_path in glob.glob(pattern, recursive=True):
+                file_path = os.path.normpath(file_path)
+                seen.add(file_path)
+                st = os.stat(file_path)
+                entry = self.files.get(file_path)
+                if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                    continue
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    static, dynamic = scan_source(f.read())
+                self.files[file_path] = {
+                    'mtime_ns': st.st_mtime_ns,
+                    'size': st.st_size,
+                    'static': static,
+                    'dynamic': dynamic,
+                }
+                rescanned += 1
+
+        removed = [path for path in self.files if path not in seen]
+        for path in removed:
+            del self.files[path]
+        if rescanned or removed:
+            self._build_maps()
+            self.save()
+        return rescanned
+
+    def _build_maps(self):
+        self.static = {}
+        self.dynamic = {}
+        for file_path, entry in self.files.items():
+            for key, line in entry['static']:
+                self.static.setdefault(key, []).append((file_path, line))
+            for pattern, line in entry['dynamic']:
+                self.dynamic.setdefault(pattern, []).append((file_path, line))
+        self._dynamic_re = re.compile('|'.join(f'(?:{p})' for p in self.dynamic)) if self.dynamic else None
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files}, f, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def where(self, key):
+        """All (file, line) locations that use `key`, statically or dynamically"""
+        locations = list(self.static.get(key, []))
+        for pattern, places in self.dynamic.items():
+            if re.fullmatch(pattern, key):
+                locations.extend(places)
+        return sorted(locations)
+
+    def is_dynamic(self, key):
+        return bool(self._dynamic_re and self._dynamic_re.fullmatch(key))
+
+
+def build_report(index, trees):
+    """Missing/unused/dynamic-only keys per language"""
+    defined = {lang: dict(flatten(trees[lang])) for lang in LANGUAGES}
+    # A used key may name a whole section (returnObjects), so count prefixes too
+    sections = {lang: {k.rsplit('.', i)[0] for k in defined[lang] for i in range(1, k.count('.') + 1)}
+                for lang in LANGUAGES}
+
+    report = {'missing': {}, 'unused': {}, 'dynamic_only': {}}
+    for lang in LANGUAGES:
+        report['missing'][lang] = sorted(
+            key for key in index.static
+            if key not in defined[lang] and key not in sections[lang]
+        )
+        unused = []
+        dynamic_only = []
+        for key in defined[lang]:
+            if key in index.static:
+                continue
+            (dynamic_only if index.is_dynamic(key) else unused).append(key)
+        report['unused'][lang] = unused
+        report['dynamic_only'][lang] = dynamic_only
+    return report
+
+
+def print_report(index, report):
+    for lang in LANGUAGES:
+        missing = report['missing'][lang]
+        print(f"\n🌐 {lang}: {len(missing)} missing, {len(report['unused'][lang])} unused, "
+              f"{len(report['dynamic_only'][lang])} dynamic-only")
+        for key in missing:
+            file_path, line = index.static[key][0]
+            print(f"   ❌ {key}  ({file_path}:{line})")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Translation key usage report")
+    parser.add_argument('--where', metavar='KEY', help='list every place a key is used')
+    parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+    parser.add_argument('--strict', action='store_true', help='exit 1 if any used key is missing')
+    args = parser.parse_args()
+
+    index = UsageIndex()
+    rescanned = index.update()
+
+    if args.where:
+        for file_path, line in index.where(args.where):
+            print(f"{file_path}:{line}")
+        sys.exit(0)
+
+    report = build_report(index, LocaleStore().trees)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(f"📝 {len(index.files)} files indexed ({rescanned} rescanned), "
+              f"{len(index.static)} static keys, {len(index.dynamic)} dynamic patterns")
+        print_report(index, report)
+
+    if args.strict and any(report['missing'].values()):
+        sys.exit(1)
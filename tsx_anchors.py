@@ -0,0 +1,383 @@
+"""
+Structural anchor index for TSX files.
+
+Parses a file once into named anchors instead of hardcoded line numbers:
+
+  component:CRM               function/arrow component body
+  decl:CRM.sendMessageMutation
+                              top-level declaration inside a component body
+                              (`const [x, setX] = useState()`, mutations,
+                              handlers, ...); `anchor.hook` marks use*() calls
+  comment:Bulk Actions Dialog JSX comment marker {/* Bulk Actions Dialog */}
+  section:Date Range Filter   a comment marker plus the element or {...}
+                              expression that follows it
+  tag:Popover                 a JSX element, opening tag to closing tag
+
+Every anchor except tag: covers whole lines. Edits against anchors are
+batched on an EditBatch and applied in one offset-sorted pass; inserts are
+skipped when their guard text is already present and deletes of missing
+anchors are no-ops, so scripts can be re-run safely.
+"""
+import bisect
+import re
+from collections import namedtuple
+
+from jsx_lexer import JSXLexer
+
+# start/end: line-aligned span; outer_start also covers leading // comments
+Anchor = namedtuple('Anchor', 'kind name start end outer_start line hook')
+
+COMPONENT = re.compile(
+    r'^(?:export\s+(?:default\s+)?)?(?:function\s+([A-Z]\w*)\s*(?:<[^>]*>)?\s*\('
+    r'|const\s+([A-Z]\w*)\s*(?::[^=]+)?=\s*(?:\([^)]*\)|\w+)\s*(?::[^=]+)?=>\s*\{)',
+    re.MULTILINE,
+)
+DECLARATION = re.compile(
+    r'(?:export\s+)?(const|let|var|function|async\s+function)\s+'
+    r'(\[[^\]]*\]|\{[^}]*\}|[A-Za-z_$][\w$]*)'
+)
+HOOK_CALL = re.compile(r'\s*(?::[^=]+)?=\s*(?:[\w$.]+\.)?use[A-Z]\w*\s*(?:<[^>]*>)?\s*\(')
+JSX_COMMENT = re.compile(r'\{/\*\s*(.*?)\s*\*/\}')
+IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+
+# After these tokens a newline does not end a statement
+CONTINUES_BEFORE = set('=+-*/%&|^!?:,.(<>[{')
+CONTINUES_AFTER = set('.?:+-*/%&|^,)]}=>')
+
+
+def binding_names(target):
+    """Identifiers bound by `x`, `[a, setA]` or `{ data: leads, refetch }`"""
+    if target[0] == '[':
+        return IDENTIFIER.findall(target)
+    if target[0] != '{':
+        return [target]
+    names = []
+    for entry in target[1:-1].split(','):
+        binding = entry.split('=')[0].split(':')[-1]
+        m = IDENTIFIER.search(binding)
+        if m:
+            names.append(m.group())
+    return names
+
+
+class AnchorLexer(JSXLexer):
+    """JSXLexer plus statement-end detection for declarations"""
+
+    def matching_paren(self, i):
+        """Offset just past the `)` matching the `(` at `i`"""
+        depth = 0
+        while i < self.n:
+            ch = self.content[i]
+            if ch in '"\'':
+                i = self.skip_string(i)
+                continue
+            if ch == '`':
+                i = self.skip_template(i)
+                continue
+            if ch == '(':
+                depth += 1
+            elif ch == ')':
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+            i += 1
+        return self.n
+
+    def next_token(self, i):
+        while i < self.n and self.content[i].isspace():
+            i += 1
+        return self.content[i] if i < self.n else ''
+
+    def statement_end(self, i, block=False):
+        """Offset just past the statement starting at `i`
+
+        Ends at `;` or a newline that ends the statement (ASI) at depth 0;
+        with `block`, at the `}` that closes the first top-level block.
+        """
+        content = self.content
+        depth = 0
+        while i < self.n:
+            ch = content[i]
+            if ch in '"\'':
+                i = self.skip_string(i)
+            elif ch == '`':
+                i = self.skip_template(i)
+            elif content.startswith('//', i):
+                end = content.find('\n', i)
+                i = self.n if end < 0 else end
+            elif content.startswith('/*', i):
+                end = content.find('*/', i + 2)
+                i = self.n if end < 0 else end + 2
+            elif ch == '/' and self.regex_can_start(i):
+                i = self.skip_regex(i)
+            elif ch in '([{':
+                depth += 1
+                i += 1
+            elif ch in ')]}':
+                depth -= 1
+                i += 1
+                if block and depth == 0 and ch == '}':
+                    return i
+            elif ch == ';' and depth == 0:
+                return i + 1
+            elif ch == '\n' and depth == 0:
+                if (self.previous_token(i) not in CONTINUES_BEFORE
+                        and self.next_token(i) not in CONTINUES_AFTER):
+                    return i
+                i += 1
+            elif ch == '<' and self.jsx_can_start(i):
+                i = self.parse_element(i)
+            else:
+                i += 1
+        return self.n
+
+
+class AnchorIndex:
+    """All anchors of one file, by name"""
+
+    def __init__(self, content, path=None):
+        self.content = content
+        self.path = path
+        self.anchors = {}
+        self._line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+        self._lexer = AnchorLexer(content)
+        self._parse()
+
+    # Line helpers
+
+    def line_of(self, offset):
+        return bisect.bisect_right(self._line_starts, offset)
+
+    def line_start(self, offset):
+        return self._line_starts[self.line_of(offset) - 1]
+
+    def line_end(self, offset):
+        """Offset just past the newline ending the line that contains `offset - 1`"""
+        if offset > 0 and self.content[offset - 1] == '\n':
+            return offset
+        end = self.content.find('\n', offset)
+        return len(self.content) if end < 0 else end + 1
+
+    def _add(self, kind, name, start, end, outer_start=None, hook=False):
+        anchor = Anchor(kind, name, start, end,
+                        start if outer_start is None else outer_start,
+                        self.line_of(start), hook)
+        self.anchors.setdefault(f"{kind}:{name}", []).append(anchor)
+        return anchor
+
+    def _leading_comments(self, start):
+        """Start of the `//` comment lines directly above the line at `start`"""
+        line = self.line_of(start) - 1
+        while line > 0:
+            prev_start = self._line_starts[line - 1]
+            text = self.content[prev_start:self._line_starts[line]].strip()
+            if not text.startswith('//'):
+                break
+            start = prev_start
+            line -= 1
+        return start
+
+    # Parsing
+
+    def _parse(self):
+        content = self.content
+        lexer = self._lexer
+
+        for m in COMPONENT.finditer(content):
+            name = m.group(1) or m.group(2)
+            if m.group(1):
+                params_end = lexer.matching_paren(m.end() - 1)
+                body_open = content.find('{', params_end)
+            else:
+                body_open = m.end() - 1
+            if body_open < 0:
+                continue
+            body_close = lexer.scan_js(body_open + 1, stop_at_brace=True)
+            if body_close >= len(content):
+                raise ValueError(f"{self.path or '<content>'}:{self.line_of(m.start())}: "
+                                 f"body of component {name} is never closed")
+            start = self.line_start(m.start())
+            self._add('component', name, start, self.line_end(body_close + 1),
+                      self._leading_comments(start))
+            self._parse_declarations(name, body_open + 1, body_close)
+
+        tags = lexer.lex()
+        tags_by_start = {tag.start: tag for tag in tags}
+        for tag in tags:
+            self._add('tag', tag.name, tag.start, tag.element_end)
+
+        for m in JSX_COMMENT.finditer(content):
+            start = self.line_start(m.start())
+            self._add('comment', m.group(1), start, self.line_end(m.end()))
+
+            # The element or {...} expression that the marker labels
+            i = m.end()
+            while i < len(content) and content[i].isspace():
+                i += 1
+            if i < len(content) and content[i] == '<' and i in tags_by_start:
+                end = tags_by_start[i].element_end
+            elif i < len(content) and content[i] == '{' and not content.startswith('{/*', i):
+                end = lexer.scan_js(i + 1, stop_at_brace=True) + 1
+            else:
+                continue
+            self._add('section', m.group(1), start, self.line_end(end))
+
+    def _parse_declarations(self, component, body_start, body_end):
+        """Top-level declarations of a component body (first-level indentation)"""
+        content = self.content
+        lexer = self._lexer
+        first = re.compile(r'\n([ \t]+)\S').search(content, body_start, body_end)
+        if not first:
+            return
+        indent = first.group(1)
+        pattern = re.compile(r'^' + re.escape(indent) + DECLARATION.pattern, re.MULTILINE)
+
+        i = body_start
+        while True:
+            m = pattern.search(content, i, body_end)
+            if not m:
+                break
+            target = m.group(2)
+            names = binding_names(target)
+            end = lexer.statement_end(m.end(), block=m.group(1).endswith('function'))
+            start = self.line_start(m.start())
+            hook = bool(HOOK_CALL.match(content, m.end(), end))
+            anchor_end = self.line_end(end)
+            for name in names[:1]:
+                anchor = self._add('decl', f"{component}.{name}", start, anchor_end,
+                                   self._leading_comments(start), hook)
+            for alias in names[1:]:
+                self.anchors.setdefault(f"decl:{component}.{alias}", []).append(anchor)
+            i = max(end, m.end())
+
+    # Queries
+
+    def find(self, name):
+        """All anchors with this name, in file order"""
+        return sorted(self.anchors.get(name, []), key=lambda a: a.start)
+
+    def has(self, name):
+        return name in self.anchors
+
+    def get(self, name, occurrence=0):
+        """The n-th anchor with this name; KeyError if there isn't one"""
+        found = self.find(name)
+        if len(found) <= occurrence:
+            raise KeyError(f"Anchor not found: {name}")
+        return found[occurrence]
+
+    def text(self, anchor):
+        return self.content[anchor.outer_start:anchor.end]
+
+    def duplicates(self, kind='decl'):
+        """Anchor names of `kind` declared more than once (decl: within one component)"""
+        prefix = kind + ':'
+        return [name for name, found in self.anchors.items()
+                if name.startswith(prefix) and len({a.start for a in found}) > 1]
+
+
+class EditBatch:
+    """Insert/delete/replace edits against named anchors, applied in one pass"""
+
+    def __init__(self, index):
+        self.index = index
+        self.edits = []
+        self.skipped = []
+
+    def _guarded(self, text, guard):
+        guard = text.strip() if guard is None else guard
+        return guard in self.index.content
+
+    def insert_after(self, name, text, guard=None, occurrence=0):
+        """Insert text on the line after the anchor unless `guard` is already present"""
+        if self._guarded(text, guard):
+            self.skipped.append(('insert_after', name))
+            return False
+        anchor = self.index.get(name, occurrence)
+        self.edits.append((anchor.end, anchor.end, text))
+        return True
+
+    def insert_before(self, name, text, guard=None, occurrence=0):
+        if self._guarded(text, guard):
+            self.skipped.append(('insert_before', name))
+            return False
+        anchor = self.index.get(name, occurrence)
+        self.edits.append((anchor.outer_start, anchor.outer_start, text))
+        return True
+
+    def replace(self, name, text, occurrence=0):
+        anchor = self.index.get(name, occurrence)
+        if self.index.text(anchor) == text:
+            self.skipped.append(('replace', name))
+            return False
+        self.edits.append((anchor.outer_start, anchor.end, text))
+        return True
+
+    def _delete(self, start, end):
+        """Queue deleting content[start:end] (line-aligned)
+
+        When the line before `start` is blank, the blank lines after `end` go
+        too, so removing a block that was inserted with blank lines around it
+        leaves the file as it was before the insert.
+        """
+        content = self.index.content
+        previous = content[content.rfind('\n', 0, max(start - 1, 0)) + 1:max(start - 1, 0)]
+        if start == 0 or not previous.strip():
+            while end < len(content):
+                line_end = self.index.line_end(end + 1)
+                if content[end:line_end].strip():
+                    break
+                end = line_end
+        self.edits.append((start, end, ''))
+
+    def delete(self, name, occurrence=0):
+        """Delete an anchor with its leading comments; no-op if it doesn't exist"""
+        found = self.index.find(name)
+        if len(found) <= occurrence:
+            self.skipped.append(('delete', name))
+            return False
+        anchor = found[occurrence]
+        self._delete(anchor.outer_start, anchor.end)
+        return True
+
+    def delete_between(self, first, last, occurrence=0):
+        """Delete from the start of `first` through the end of `last`"""
+        if not (self.index.has(first) and self.index.has(last)):
+            self.skipped.append(('delete_between', f"{first}..{last}"))
+            return False
+        start = self.index.get(first, occurrence).outer_start
+        end = max(a.end for a in self.index.find(last) if a.end > start)
+        self._delete(start, end)
+        return True
+
+    def apply(self):
+        """Return the edited content; overlapping edits raise ValueError"""
+        content = self.index.content
+        parts = []
+        last = 0
+        for start, end, text in sorted(self.edits, key=lambda e: (e[0], e[1])):
+            if start < last:
+                raise ValueError(f"Overlapping edits at offset {start}")
+            parts.append(content[last:start])
+            parts.append(text)
+            last = end
+        parts.append(content[last:])
+        return ''.join(parts)
+
+
+def edit_file(file_path, build):
+    """Parse `file_path`, let `build(batch)` queue edits, apply and write once
+
+    Returns the EditBatch so callers can report applied and skipped edits.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    batch = EditBatch(AnchorIndex(content, file_path))
+    build(batch)
+    new_content = batch.apply()
+
+    if new_content != content:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+    return batch